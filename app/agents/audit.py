@@ -3,13 +3,14 @@ from __future__ import annotations
 import asyncio
 import json
 from dataclasses import asdict, is_dataclass
+from functools import lru_cache
 from typing import Any
 
 from fastapi import Request
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.core.database import AsyncSessionLocal
+from app.core.database import get_session_factory
 from app.core.trace import get_trace_id
 from app.models.audit import AuditLog
 
@@ -18,7 +19,7 @@ JSONValue = dict[str, Any] | list[Any] | str | int | float | bool | None
 
 class AuditAgent:
     def __init__(self, session_factory: async_sessionmaker[AsyncSession] | None = None) -> None:
-        self._session_factory = session_factory or AsyncSessionLocal
+        self._session_factory = session_factory
 
     def configure_session_factory(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
         self._session_factory = session_factory
@@ -82,7 +83,8 @@ class AuditAgent:
         loop.create_task(self._persist_with_new_session(record))
 
     async def _persist_with_new_session(self, record: dict[str, Any]) -> None:
-        async with self._session_factory() as session:
+        session_factory = self._session_factory or get_session_factory()
+        async with session_factory() as session:
             session.add(AuditLog(**record))
             await session.commit()
 
@@ -120,8 +122,6 @@ class AuditAgent:
             return str(value)
 
 
-_audit_agent = AuditAgent()
-
-
+@lru_cache
 def get_audit_agent() -> AuditAgent:
-    return _audit_agent
+    return AuditAgent()
@@ -37,9 +37,14 @@ class AuthOrchestrator:
             redis, key=f"rl:login:{payload.username}", limit=5, window_seconds=60
         )
         user = await self.identity_agent.authenticate(db, redis, payload)
-        tokens = await self.token_agent.issue_pair(redis, user, payload.device_id)
+        sid = self.session_agent.new_sid()
+        tokens = await self.token_agent.issue_pair(redis, user, payload.device_id, sid=sid)
         session_info = await self.session_agent.create_session(
-            redis, user_id=user.id, refresh_jti=tokens.refresh_payload["jti"], device_id=payload.device_id
+            redis,
+            user_id=user.id,
+            refresh_jti=tokens.refresh_payload["jti"],
+            device_id=payload.device_id,
+            sid=sid,
         )
         principal = await self.rbac_agent.build_principal(user)
         session_snapshot = {
@@ -85,7 +90,9 @@ class AuthOrchestrator:
 
         # 3. 检查黑名单（防止重复使用）
         old_jti = refresh_claims.get("jti")
-        if old_jti and await self.token_agent.is_token_blacklisted(redis, old_jti):
+        if old_jti and await self.token_agent.is_token_blacklisted(
+            redis, old_jti, refresh_claims.get("exp")
+        ):
             raise_error("AUTH.REFRESH_INVALID", detail="Refresh token has been used")
 
         # 4. 验证 Redis 中的 refresh token 状态
@@ -93,10 +100,16 @@ class AuthOrchestrator:
         if not refresh_data:
             raise_error("AUTH.REFRESH_INVALID", detail="Refresh token not found or inactive")
 
-        # 5. 加载用户信息
         user_id = refresh_claims.get("sub")
         if not user_id:
             raise_error("AUTH.REFRESH_INVALID")
+
+        # 会话已被注销（登出、改密、锁定或超出并发上限）时拒绝刷新
+        sid = refresh_claims.get("sid")
+        if sid and not await self.session_agent.is_session_active(redis, int(user_id), sid):
+            raise_error("AUTH.REFRESH_INVALID", detail="Session has been revoked")
+
+        # 5. 加载用户信息
         user = await self.identity_agent.load_user(db, int(user_id))
 
         # 6. 将旧的 refresh_token 加入黑名单（Token 轮换）
@@ -106,12 +119,17 @@ class AuthOrchestrator:
             # 同时标记 Redis 中的 refresh token 为已撤销
             await self.token_agent.revoke_refresh_token(redis, payload.refresh_token)
 
-        # 7. 生成新的 token 对
-        tokens = await self.token_agent.issue_pair(redis, user, payload.device_id)
+        # 7. 生成新的 token 对（沿用原会话 sid）
+        sid = sid or self.session_agent.new_sid()
+        tokens = await self.token_agent.issue_pair(redis, user, payload.device_id, sid=sid)
 
         # 8. 创建/更新会话
         session_info = await self.session_agent.create_session(
-            redis, user_id=user.id, refresh_jti=tokens.refresh_payload["jti"], device_id=payload.device_id
+            redis,
+            user_id=user.id,
+            refresh_jti=tokens.refresh_payload["jti"],
+            device_id=payload.device_id,
+            sid=sid,
         )
 
         # 9. 构建用户主体信息
@@ -150,15 +168,23 @@ class AuthOrchestrator:
         redis: Redis,
         token_sub: str | None,
         request: Request | None = None,
+        sid: str | None = None,
+        access_jti: str | None = None,
+        access_exp: int | None = None,
     ) -> dict:
         operator_id = getattr(request.state, "user_id", None) if request else None
         operator_name = getattr(request.state, "username", None) if request else None
         if operator_id is None and token_sub:
             operator_id = int(token_sub)
+        if sid:
+            await self.session_agent.invalidate_session(redis, sid, user_id=operator_id)
+        if access_jti:
+            # 当前 access token 立即失效，而不是等到自然过期
+            await self.token_agent.blacklist_token(redis, access_jti, access_exp)
         await self.audit_agent.log_event(
             action=AuditAction.AUTH_LOGOUT,
             resource_type="SESSION",
-            resource_id=token_sub,
+            resource_id=sid or token_sub,
             operator_id=operator_id,
             operator_name=operator_name,
             request=request,
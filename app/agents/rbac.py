@@ -1,5 +1,9 @@
-from venv import logger
+from functools import lru_cache
+
 from app.agents.identity import AuthenticatedUser
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
 
 
 class RBACAgent:
@@ -22,7 +26,7 @@ class RBACAgent:
             return True
 
         target_namespace = namespace or ""
-        logger.info("Checking permission: %s %s %s %s", target_namespace, resource, action, user.permissions)
+        logger.debug("Checking permission: %s %s %s user=%s", target_namespace, resource, action, user.id)
         for perm in user.permissions:
             if self._matches_permission(perm, target_namespace, resource, action):
                 return True
@@ -47,3 +51,8 @@ class RBACAgent:
             )
 
         return False
+
+
+@lru_cache
+def get_rbac_agent() -> RBACAgent:
+    return RBACAgent()
@@ -1,34 +1,179 @@
+import asyncio
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from uuid import uuid4
 
 from redis.asyncio import Redis
 
+from app.core.redis import LuaScript
 from app.core.settings import get_settings
 
-settings = get_settings()
+SESSION_KEY_PREFIX = "sess:"
+
+# 会话注册表：每个用户一个有序集合 sess:{user_id}:index，成员为 sid，分值为过期时间戳；
+# 会话详情存于 sess:{user_id}:<sid>。花括号为集群哈希标签，同一用户的键落在同一槽位。
+# 脚本只访问 KEYS 中声明的键；按 sid 派生的会话哈希由脚本返回 sid 后在 Python 侧删除。
+
+# KEYS[1] session hash, KEYS[2] user index
+# ARGV[1] now, ARGV[2] expires_at (fractional, so same-second logins keep their order),
+# ARGV[3] max sessions (0 = unlimited), ARGV[4] sid, ARGV[5..] hash field/value pairs
+# Returns the evicted sids (already removed from the index).
+CREATE_SESSION_SCRIPT = LuaScript(
+    """
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])
+redis.call('HSET', KEYS[1], unpack(ARGV, 5))
+redis.call('EXPIREAT', KEYS[1], math.ceil(tonumber(ARGV[2])))
+redis.call('ZADD', KEYS[2], ARGV[2], ARGV[4])
+local evicted = {}
+local limit = tonumber(ARGV[3])
+if limit > 0 then
+  local excess = redis.call('ZCARD', KEYS[2]) - limit
+  if excess > 0 then
+    evicted = redis.call('ZRANGE', KEYS[2], 0, excess - 1)
+    redis.call('ZREMRANGEBYRANK', KEYS[2], 0, excess - 1)
+  end
+end
+local last = redis.call('ZRANGE', KEYS[2], -1, -1, 'WITHSCORES')
+if last[2] then
+  redis.call('EXPIREAT', KEYS[2], math.ceil(tonumber(last[2])))
+end
+return evicted
+"""
+)
+
+# KEYS[1] user index; ARGV[1] now
+# Returns flat pairs: sid, expires_at
+LIST_SESSIONS_SCRIPT = LuaScript(
+    """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+return redis.call('ZRANGE', KEYS[1], 0, -1, 'WITHSCORES')
+"""
+)
+
+# KEYS[1] user index, KEYS[2] session hash; ARGV[1] sid
+# The hash is only deleted when the sid belongs to this user's index.
+REVOKE_SESSION_SCRIPT = LuaScript(
+    """
+local removed = redis.call('ZREM', KEYS[1], ARGV[1])
+if removed == 1 then
+  redis.call('DEL', KEYS[2])
+end
+return removed
+"""
+)
+
+# KEYS[1] user index; returns the sids it held
+REVOKE_ALL_SESSIONS_SCRIPT = LuaScript(
+    """
+local sids = redis.call('ZRANGE', KEYS[1], 0, -1)
+redis.call('DEL', KEYS[1])
+return sids
+"""
+)
 
 
 class SessionAgent:
+    def __init__(self) -> None:
+        self.settings = get_settings()
+
+    @staticmethod
+    def new_sid() -> str:
+        return f"sess_{uuid4().hex}"
+
     async def create_session(
         self,
         redis: Redis,
         user_id: int,
         refresh_jti: str,
         device_id: str | None,
+        sid: str | None = None,
     ) -> dict:
-        sid = f"sess_{uuid4().hex}"
-        expires_at = datetime.now(timezone.utc) + timedelta(minutes=settings.refresh_token_ttl_minutes)
-        session_key = f"sess:{sid}"
+        """Create (or, for an existing ``sid``, extend) a session and register it for the user.
+
+        Sessions beyond ``session_max_per_user`` are evicted oldest-first and returned
+        under ``evicted``.
+        """
+        sid = sid or self.new_sid()
+        now = datetime.now(timezone.utc)
+        expires_at = now + timedelta(minutes=self.settings.refresh_token_ttl_minutes)
         payload = {
             "user_id": user_id,
             "refresh_jti": refresh_jti,
             "device_id": device_id,
             "expires_at": expires_at.isoformat(),
         }
-        clean_payload = {k: v for k, v in payload.items() if v is not None}
-        await redis.hset(session_key, mapping=clean_payload)
-        await redis.expireat(session_key, int(expires_at.timestamp()))
-        return {"sid": sid, "expires_at": expires_at}
+        fields: list[str] = []
+        for key, value in payload.items():
+            if value is not None:
+                fields.extend((key, str(value)))
+        evicted = list(
+            await CREATE_SESSION_SCRIPT(
+                redis,
+                keys=[self._session_key(user_id, sid), self._user_key(user_id)],
+                args=[
+                    now.timestamp(),
+                    expires_at.timestamp(),
+                    self.settings.session_max_per_user,
+                    sid,
+                    *fields,
+                ],
+            )
+            or []
+        )
+        await self._delete_session_hashes(redis, user_id, evicted)
+        return {"sid": sid, "expires_at": expires_at, "evicted": evicted}
+
+    async def list_sessions(self, redis: Redis, user_id: int) -> list[dict]:
+        now = datetime.now(timezone.utc).timestamp()
+        flat = await LIST_SESSIONS_SCRIPT(redis, keys=[self._user_key(user_id)], args=[now])
+        sids = flat[0::2]
+        device_ids = await asyncio.gather(
+            *(redis.hget(self._session_key(user_id, sid), "device_id") for sid in sids)
+        )
+        return [
+            {
+                "sid": sid,
+                "expires_at": datetime.fromtimestamp(float(score), tz=timezone.utc),
+                "device_id": device_id or None,
+            }
+            for sid, score, device_id in zip(sids, flat[1::2], device_ids)
+        ]
+
+    async def is_session_active(self, redis: Redis, user_id: int, sid: str) -> bool:
+        """A session is active while its sid is in the user's index and not yet expired."""
+        expires_at = await redis.zscore(self._user_key(user_id), sid)
+        return expires_at is not None and float(expires_at) > datetime.now(timezone.utc).timestamp()
+
+    async def invalidate_session(self, redis: Redis, sid: str, user_id: int | None) -> bool:
+        if user_id is None:
+            return False
+        removed = await REVOKE_SESSION_SCRIPT(
+            redis, keys=[self._user_key(user_id), self._session_key(user_id, sid)], args=[sid]
+        )
+        return bool(removed)
+
+    async def invalidate_all_sessions(self, redis: Redis, user_id: int) -> list[str]:
+        """Revoke every session of ``user_id`` (password change, lock) without a keyspace scan."""
+        revoked = list(
+            await REVOKE_ALL_SESSIONS_SCRIPT(redis, keys=[self._user_key(user_id)]) or []
+        )
+        await self._delete_session_hashes(redis, user_id, revoked)
+        return revoked
+
+    async def _delete_session_hashes(self, redis: Redis, user_id: int, sids: list[str]) -> None:
+        # 同一用户的键共享哈希标签，单条 DEL 在集群模式下也不会跨槽
+        if sids:
+            await redis.delete(*(self._session_key(user_id, sid) for sid in sids))
+
+    @staticmethod
+    def _session_key(user_id: int, sid: str) -> str:
+        return f"{SESSION_KEY_PREFIX}{{{user_id}}}:{sid}"
+
+    @staticmethod
+    def _user_key(user_id: int) -> str:
+        return f"{SESSION_KEY_PREFIX}{{{user_id}}}:index"
+
 
-    async def invalidate_session(self, redis: Redis, sid: str) -> None:
-        await redis.delete(f"sess:{sid}")
+@lru_cache
+def get_session_agent() -> SessionAgent:
+    return SessionAgent()
@@ -3,13 +3,12 @@ from hashlib import sha256
 
 from redis.asyncio import Redis
 
+from app.core.permsets import PERMISSION_SET_VERSION, store_permission_set
+from app.core.revocation import get_revocation_checker
 from app.core.security import create_jwt_token
 from app.core.settings import get_settings
 from app.agents.identity import AuthenticatedUser
 
-settings = get_settings()
-
-
 @dataclass(slots=True)
 class IssuedTokens:
     access_token: str
@@ -20,31 +19,49 @@ class IssuedTokens:
 
 
 class TokenAgent:
+    def __init__(self) -> None:
+        self.settings = get_settings()
+
     async def issue_pair(
-        self, redis: Redis, user: AuthenticatedUser, device_id: str | None = None
+        self,
+        redis: Redis,
+        user: AuthenticatedUser,
+        device_id: str | None = None,
+        sid: str | None = None,
     ) -> IssuedTokens:
         primary_role = user.primary_role
+        session_claims = {"sid": sid} if sid else {}
+        if self.settings.access_token_permissions == "reference":
+            # 只携带权限集引用，令牌大小不再随权限数量增长
+            set_id = await store_permission_set(
+                redis, user.permissions, self.settings.access_token_ttl_minutes * 60
+            )
+            permission_claims = {"pset": set_id, "psv": PERMISSION_SET_VERSION}
+        else:
+            permission_claims = {"permissions": user.permissions}
         access = create_jwt_token(
             sub=str(user.id),
-            expires_minutes=settings.access_token_ttl_minutes,
+            expires_minutes=self.settings.access_token_ttl_minutes,
             token_type="access",
             username=user.username,
             role=primary_role.code if primary_role else "",
             role_id=str(primary_role.id) if primary_role else "",
-            permissions=user.permissions,
             device_id=device_id,
+            **permission_claims,
+            **session_claims,
         )
         refresh = create_jwt_token(
             sub=str(user.id),
-            expires_minutes=settings.refresh_token_ttl_minutes,
+            expires_minutes=self.settings.refresh_token_ttl_minutes,
             token_type="refresh",
             rotation="single",
             device_id=device_id,
+            **session_claims,
         )
         tokens = IssuedTokens(
             access_token=access["token"],
             refresh_token=refresh["token"],
-            expires_in=settings.access_token_ttl_minutes * 60,
+            expires_in=self.settings.access_token_ttl_minutes * 60,
             access_payload=access["payload"],
             refresh_payload=refresh["payload"],
         )
@@ -54,30 +71,9 @@ class TokenAgent:
     async def _persist_tokens(
         self, redis: Redis, tokens: IssuedTokens, user: AuthenticatedUser, device_id: str | None
     ) -> None:
-        await self._store_access_token(redis, tokens.access_payload, user, device_id)
+        # 访问令牌不落 Redis：声明都在 JWT 内，撤销由 jti 黑名单负责
         await self._store_refresh_token(redis, tokens.refresh_token, tokens.refresh_payload, user, device_id)
 
-    async def _store_access_token(
-        self, redis: Redis, payload: dict, user: AuthenticatedUser, device_id: str | None
-    ) -> None:
-        permissions = payload.get("permissions") or []
-        key = f"token:access:{payload['jti']}"
-        mapping = self._prepare_mapping(
-            {
-                "user_id": user.id,
-                "username": user.username,
-                "role": payload.get("role"),
-                "role_id": payload.get("role_id"),
-                "permissions": ",".join(permissions) if permissions else None,
-                "device_id": device_id,
-                "exp": payload.get("exp"),
-                "type": "access",
-            }
-        )
-        await redis.hset(key, mapping=mapping)
-        if payload.get("exp"):
-            await redis.expireat(key, int(payload["exp"]))
-
     async def _store_refresh_token(
         self,
         redis: Redis,
@@ -129,22 +125,17 @@ class TokenAgent:
             return None
         return data
 
-    async def is_token_blacklisted(self, redis: Redis, jti: str) -> bool:
-        """检查 token 是否在黑名单中"""
-        key = f"jti:black:{jti}"
-        exists = await redis.exists(key)
-        return exists > 0
+    async def is_token_blacklisted(self, redis: Redis, jti: str, exp: int | None = None) -> bool:
+        """检查 token 是否在黑名单中（先查进程内 Bloom 过滤器，命中后再查 Redis）"""
+        return await get_revocation_checker().is_revoked(redis, jti, exp)
 
-    async def blacklist_token(self, redis: Redis, jti: str, exp: int | None = None) -> None:
+    async def blacklist_token(self, redis: Redis, jti: str, exp: int | None) -> None:
         """
         将 token 加入黑名单
-        exp: token 的过期时间（Unix timestamp），用于设置黑名单的 TTL
+        exp: token 自身的 exp 声明（Unix timestamp），用于设置黑名单的 TTL 和过滤器分桶；
+             缺失时黑名单不设过期，校验直接查 Redis
         """
-        key = f"jti:black:{jti}"
-        await redis.set(key, "1")
-        if exp:
-            # 设置黑名单的过期时间为原 token 的过期时间
-            await redis.expireat(key, int(exp))
+        await get_revocation_checker().revoke(redis, jti, exp)
 
     async def revoke_refresh_token(self, redis: Redis, refresh_token: str) -> None:
         """撤销 refresh token（标记为已使用）"""
@@ -9,6 +9,7 @@ class AuditAction(StrEnum):
     AUTH_LOGIN_FAILED = "AUTH_LOGIN_FAILED"
     AUTH_REFRESH = "AUTH_REFRESH"
     AUTH_LOGOUT = "AUTH_LOGOUT"
+    AUTH_SESSION_REVOKE = "AUTH_SESSION_REVOKE"
 
     # 角色 / 权限管理
     ROLE_PERMISSION_CREATE = "ROLE_PERMISSION_CREATE"
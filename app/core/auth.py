@@ -1,30 +1,33 @@
 from __future__ import annotations
 
-from fastapi import Depends, Header
+from fastapi import Depends, Header, Request
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.agents.identity import AuthenticatedUser, IdentityAgent
-from app.agents.rbac import RBACAgent
+from app.agents.identity import AuthenticatedUser, get_identity_agent
+from app.agents.rbac import get_rbac_agent
 from app.core.database import get_db
 from app.core.errors import raise_error
 from app.core.logging import get_logger
+from app.core.permsets import get_permission_set_cache
+from app.core.redis import get_redis
+from app.core.revocation import get_revocation_checker
 from app.core.security import decode_jwt_token
 
-identity_agent = IdentityAgent()
-rbac_agent = RBACAgent()
 logger = get_logger(__name__)
 
 
 async def get_current_user(
+    request: Request,
     authorization: str | None = Header(default=None, alias="Authorization"),
     db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
 ) -> AuthenticatedUser:
     if not authorization or not authorization.lower().startswith("bearer "):
         raise_error("AUTH.INVALID_CREDENTIAL", detail="Missing or invalid Authorization header")
     token = authorization.split(" ", 1)[1]
     try:
-        # logger.info("Decoding JWT token: %s", token)
-        payload = decode_jwt_token(token)
+        payload = _decode_access_token(request, token)
     except ValueError as exc:
         message = str(exc).lower()
         if "expired" in message:
@@ -37,7 +40,30 @@ async def get_current_user(
     user_id = payload.get("sub")
     if not user_id:
         raise_error("AUTH.INVALID_CREDENTIAL")
-    return await identity_agent.load_user(db, int(user_id))
+    jti = payload.get("jti")
+    if jti and await get_revocation_checker().is_revoked(redis, jti, payload.get("exp")):
+        raise_error("AUTH.INVALID_CREDENTIAL", detail="Token revoked")
+    return await get_identity_agent().load_user(db, int(user_id))
+
+
+def _decode_access_token(request: Request, token: str) -> dict:
+    # AuthMiddleware already verified this exact token for the request
+    if getattr(request.state, "access_token", None) == token:
+        return request.state.access_claims
+    return decode_jwt_token(token)
+
+
+async def resolve_token_permissions(redis: Redis, claims: dict) -> list[str] | None:
+    """Permissions carried by access-token ``claims``, embedded or by reference.
+
+    Describes what the token was issued with; authorization always reloads the
+    principal from the database (see ``get_current_user``).
+    """
+    if "permissions" in claims:
+        return list(claims["permissions"] or [])
+    if claims.get("pset"):
+        return await get_permission_set_cache().resolve(redis, claims["pset"], int(claims.get("psv", 0)))
+    return None
 
 
 def require_authenticated_user(
@@ -50,7 +76,7 @@ def require_permission(resource: str, action: str, namespace: str | None = "syst
     async def dependency(
         user: AuthenticatedUser = Depends(get_current_user),
     ) -> AuthenticatedUser:
-        if not await rbac_agent.is_allowed(user, resource, action, namespace=namespace):
+        if not await get_rbac_agent().is_allowed(user, resource, action, namespace=namespace):
             raise_error("AUTH.FORBIDDEN")
         return user
 
@@ -64,5 +90,5 @@ def permission_guard(resource: str, action: str, namespace: str | None = "system
 async def ensure_permission(
     user: AuthenticatedUser, resource: str, action: str, namespace: str | None = "system"
 ) -> None:
-    if not await rbac_agent.is_allowed(user, resource, action, namespace=namespace):
+    if not await get_rbac_agent().is_allowed(user, resource, action, namespace=namespace):
         raise_error("AUTH.FORBIDDEN")
@@ -1,22 +1,68 @@
 from collections.abc import AsyncGenerator
+from functools import lru_cache
+from typing import Any
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
+from app.core.metrics import instrument_engine
 from app.core.settings import get_settings
 
-settings = get_settings()
 
-engine = create_async_engine(
-    settings.database_url,
-    pool_pre_ping=True,
-    pool_size=20,
-    max_overflow=20,
-)
+def build_engine(url: str) -> AsyncEngine:
+    """Create an instrumented engine using the pool settings from ``Settings``."""
+    settings = get_settings()
+    engine_kwargs: dict[str, Any] = {
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+    }
+    if make_url(url).get_driver_name() == "asyncpg":
+        engine_kwargs["connect_args"] = {
+            # asyncpg's own per-connection statement cache (0 when behind pgbouncer).
+            "statement_cache_size": settings.db_statement_cache_size,
+            # SQLAlchemy's prepared-statement cache on the asyncpg adapter.
+            "prepared_statement_cache_size": settings.db_prepared_statement_cache_size,
+        }
+    new_engine = create_async_engine(url, **engine_kwargs)
+    instrument_engine(new_engine)
+    return new_engine
 
-AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+# Engines and session factories are built on first use rather than at import,
+# so importing the application (tests, CLI scripts, worker boot) stays cheap.
+@lru_cache
+def get_engine() -> AsyncEngine:
+    return build_engine(get_settings().database_url)
+
+
+@lru_cache
+def get_replica_engine() -> AsyncEngine | None:
+    replica_url = get_settings().database_replica_url
+    return build_engine(replica_url) if replica_url else None
+
+
+@lru_cache
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(get_engine(), expire_on_commit=False, class_=AsyncSession)
+
+
+@lru_cache
+def get_read_session_factory() -> async_sessionmaker[AsyncSession]:
+    replica_engine = get_replica_engine()
+    if replica_engine is None:
+        return get_session_factory()
+    return async_sessionmaker(replica_engine, expire_on_commit=False, class_=AsyncSession)
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    async with AsyncSessionLocal() as session:
+    async with get_session_factory()() as session:
         yield session
 
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only endpoints; uses the replica when one is configured."""
+    async with get_read_session_factory()() as session:
+        yield session
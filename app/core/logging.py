@@ -2,7 +2,11 @@ from __future__ import annotations
 
 import json
 import logging
+import queue
+import random
 import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 from typing import Any, Mapping
 
 from app.core.trace import get_trace_id
@@ -10,106 +14,279 @@ from app.core.trace import get_trace_id
 DEFAULT_LOG_FORMAT = "%(asctime)s %(levelname)s [%(name)s] trace_id=%(trace_id)s %(message)s"
 DEFAULT_LOG_LEVEL = logging.INFO
 
+_stream_handler: logging.Handler | None = None
+_listener: QueueListener | None = None
+_queue_handler: "BoundedQueueHandler | None" = None
+_sampling_filter: "InfoSamplingFilter | None" = None
+
 
 class TraceFormatter(logging.Formatter):
+    """Plain-text formatter; appends bound context after the message."""
+
     def format(self, record: logging.LogRecord) -> str:  # type: ignore[override]
         if not hasattr(record, "trace_id"):
             record.trace_id = get_trace_id()
-        return super().format(record)
+        record.msg = _record_message(record)
+        record.args = None
+        formatted = super().format(record)
+        context = _record_context(record)
+        if context:
+            formatted = f"{formatted} | context={_dumps(context)}"
+        return formatted
+
+
+class JsonFormatter(logging.Formatter):
+    """Render each record as one JSON object with context emitted as top-level fields."""
+
+    def format(self, record: logging.LogRecord) -> str:  # type: ignore[override]
+        payload: dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "trace_id": getattr(record, "trace_id", None) or get_trace_id(),
+            "message": _record_message(record),
+        }
+        context = _record_context(record)
+        if context:
+            for key, value in context.items():
+                payload.setdefault(key, value)
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            payload["stack_info"] = self.formatStack(record.stack_info)
+        return _dumps(payload)
+
 
+class BoundedQueueHandler(QueueHandler):
+    """Non-blocking queue handler: records are dropped (and counted) when the queue is full."""
 
-def configure_logging(level: str | int = DEFAULT_LOG_LEVEL) -> None:
-    """Configure the root logger once with a predictable format."""
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.enqueued = 0
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:  # type: ignore[override]
+        # Only resolve what depends on the calling context; serialization and I/O
+        # happen on the listener thread.
+        if not hasattr(record, "trace_id"):
+            record.trace_id = get_trace_id()
+        record.msg = _record_message(record)
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:  # type: ignore[override]
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # emit() runs under the handler lock, so the counters need no extra locking.
+            self.dropped += 1
+            return
+        self.enqueued += 1
+
+
+class InfoSamplingFilter(logging.Filter):
+    """Keep only a fraction of INFO records emitted by hot-path loggers."""
+
+    def __init__(self, rate: float, logger_names: list[str] | tuple[str, ...]) -> None:
+        super().__init__()
+        self.rate = max(0.0, min(1.0, rate))
+        self.prefixes = tuple(logger_names)
+        self.sampled_out = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:  # type: ignore[override]
+        if self.rate >= 1.0 or record.levelno != logging.INFO:
+            return True
+        if not record.name.startswith(self.prefixes):
+            return True
+        if random.random() < self.rate:
+            return True
+        self.sampled_out += 1
+        return False
+
+
+def configure_logging(level: str | int | None = None) -> None:
+    """Configure the root logger once with a plain stream handler.
+
+    Records are written synchronously until ``start_logging`` (called from the
+    app lifespan) moves them onto the queue pipeline; scripts and tests never
+    start a background thread.
+    """
+    global _stream_handler
     root_logger = logging.getLogger()
     if root_logger.handlers:
         return
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setFormatter(TraceFormatter(DEFAULT_LOG_FORMAT))
+
+    from app.core.settings import get_settings
+
+    settings = get_settings()
+    _stream_handler = logging.StreamHandler(sys.stdout)
+    if settings.log_format == "json":
+        _stream_handler.setFormatter(JsonFormatter())
+    else:
+        _stream_handler.setFormatter(TraceFormatter(DEFAULT_LOG_FORMAT))
     logging.basicConfig(
-        level=_resolve_level(level),
-        handlers=[handler],
+        level=_resolve_level(level if level is not None else settings.log_level),
+        handlers=[_stream_handler],
+    )
+
+
+def start_logging() -> None:
+    """Route root records through a bounded queue drained by a listener thread."""
+    global _listener, _queue_handler, _sampling_filter
+    if _listener is not None:
+        return
+    configure_logging()
+    if _stream_handler is None:
+        # Logging was configured elsewhere (e.g. by the server); leave it alone.
+        return
+
+    from app.core.settings import get_settings
+
+    settings = get_settings()
+    _queue_handler = BoundedQueueHandler(queue.Queue(maxsize=settings.log_queue_size))
+    _sampling_filter = InfoSamplingFilter(
+        settings.log_info_sample_rate, settings.log_sampled_loggers
     )
+    _queue_handler.addFilter(_sampling_filter)
+    _listener = QueueListener(_queue_handler.queue, _stream_handler, respect_handler_level=True)
+    _listener.start()
+    root_logger = logging.getLogger()
+    root_logger.removeHandler(_stream_handler)
+    root_logger.addHandler(_queue_handler)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records, stop the listener and write synchronously again."""
+    global _listener
+    if _listener is None:
+        return
+    root_logger = logging.getLogger()
+    root_logger.removeHandler(_queue_handler)
+    _listener.stop()
+    _listener = None
+    if _stream_handler is not None:
+        root_logger.addHandler(_stream_handler)
+
+
+def get_logging_stats() -> dict[str, int]:
+    """Counters for the queue pipeline, useful for metrics endpoints."""
+    return {
+        "enqueued": _queue_handler.enqueued if _queue_handler else 0,
+        "dropped": _queue_handler.dropped if _queue_handler else 0,
+        "sampled_out": _sampling_filter.sampled_out if _sampling_filter else 0,
+        "queue_depth": _queue_handler.queue.qsize() if _queue_handler else 0,
+    }
 
 
 class StructuredLogger:
-    """Lightweight wrapper around logging.Logger that injects trace ids and context."""
+    """Lightweight wrapper around logging.Logger that injects trace ids and context.
+
+    Disabled calls cost a single level check. Bound context is kept as a tuple of
+    pairs; merging and serialization are deferred to the formatter on the listener thread.
+    """
+
+    __slots__ = ("_logger", "_context")
 
     def __init__(
-        self, logger: logging.Logger, bound_context: Mapping[str, Any] | None = None
+        self,
+        logger: logging.Logger,
+        bound_context: Mapping[str, Any] | tuple[tuple[str, Any], ...] | None = None,
     ) -> None:
         self._logger = logger
-        self._context = dict(bound_context or {})
+        if bound_context is None:
+            self._context: tuple[tuple[str, Any], ...] = ()
+        elif isinstance(bound_context, tuple):
+            self._context = bound_context
+        else:
+            self._context = tuple(bound_context.items())
 
     def bind(self, **context: Any) -> "StructuredLogger":
-        """Bind static context that will be appended to every log message."""
+        """Bind static context that will be attached to every log record."""
         if not context:
             return self
-        return StructuredLogger(self._logger, {**self._context, **context})
+        return StructuredLogger(self._logger, self._context + tuple(context.items()))
 
     def debug(self, msg: str, *args: Any, **kwargs: Any) -> None:
-        self._log(logging.DEBUG, msg, args, kwargs)
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._log(logging.DEBUG, msg, args, kwargs)
 
     def info(self, msg: str, *args: Any, **kwargs: Any) -> None:
-        self._log(logging.INFO, msg, args, kwargs)
+        if self._logger.isEnabledFor(logging.INFO):
+            self._log(logging.INFO, msg, args, kwargs)
 
     def warning(self, msg: str, *args: Any, **kwargs: Any) -> None:
-        self._log(logging.WARNING, msg, args, kwargs)
+        if self._logger.isEnabledFor(logging.WARNING):
+            self._log(logging.WARNING, msg, args, kwargs)
 
     def error(self, msg: str, *args: Any, **kwargs: Any) -> None:
-        self._log(logging.ERROR, msg, args, kwargs)
+        if self._logger.isEnabledFor(logging.ERROR):
+            self._log(logging.ERROR, msg, args, kwargs)
 
     def critical(self, msg: str, *args: Any, **kwargs: Any) -> None:
-        self._log(logging.CRITICAL, msg, args, kwargs)
+        if self._logger.isEnabledFor(logging.CRITICAL):
+            self._log(logging.CRITICAL, msg, args, kwargs)
 
     def exception(self, msg: str, *args: Any, **kwargs: Any) -> None:
-        kwargs["exc_info"] = kwargs.get("exc_info", True)
-        self._log(logging.ERROR, msg, args, kwargs)
+        if self._logger.isEnabledFor(logging.ERROR):
+            kwargs.setdefault("exc_info", True)
+            self._log(logging.ERROR, msg, args, kwargs)
 
     def log(self, level: int, msg: str, *args: Any, **kwargs: Any) -> None:
-        self._log(level, msg, args, kwargs)
+        if self._logger.isEnabledFor(level):
+            self._log(level, msg, args, kwargs)
+
+    def isEnabledFor(self, level: int) -> bool:  # noqa: N802 - mirrors logging.Logger
+        return self._logger.isEnabledFor(level)
 
     def _log(self, level: int, msg: str, args: tuple[Any, ...], kwargs: dict[str, Any]) -> None:
-        if not self._logger.isEnabledFor(level):
-            return
-        kwargs = dict(kwargs)
-        extra = kwargs.pop("extra", None) or {}
-        context = kwargs.pop("context", None)
-        merged_context = dict(self._context)
-        if isinstance(context, Mapping):
-            merged_context.update(context)
-        elif context is not None:
-            merged_context["data"] = context
-        formatted_message = msg
-        if merged_context:
-            formatted_message = f"{msg} | context={self._serialize(merged_context)}"
-        formatted_message = self._format_message(formatted_message, args)
-        extra_with_trace = {**extra, "trace_id": get_trace_id()}
-        self._logger.log(level, formatted_message, extra=extra_with_trace, **kwargs)
-
-    @staticmethod
-    def _serialize(value: Any) -> str:
-        try:
-            return json.dumps(value, ensure_ascii=False, default=str)
-        except (TypeError, ValueError):
-            return str(value)
-
-    @staticmethod
-    def _format_message(message: str, args: tuple[Any, ...]) -> str:
-        if not args:
-            return message
-        try:
-            return message % args
-        except TypeError:
-            joined_args = " ".join(str(arg) for arg in args)
-            return f"{message} | args={joined_args}"
+        # kwargs is already a fresh dict built by the calling method, so it is safe to mutate.
+        record_extra = {
+            "trace_id": get_trace_id(),
+            "bound_context": self._context,
+            "context": kwargs.pop("context", None),
+        }
+        extra = kwargs.pop("extra", None)
+        if extra:
+            record_extra = {**extra, **record_extra}
+        kwargs.setdefault("stacklevel", 3)
+        self._logger.log(level, msg, *args, extra=record_extra, **kwargs)
 
 
 def get_logger(name: str | None = None) -> StructuredLogger:
-    configure_logging()
+    # No configuration here: module-level loggers must not read settings at
+    # import. create_app() (or a script's entry point) calls configure_logging.
     base_logger = logging.getLogger(name or "app")
     return StructuredLogger(base_logger)
 
 
+def _record_message(record: logging.LogRecord) -> str:
+    try:
+        return record.getMessage()
+    except TypeError:
+        joined_args = " ".join(str(arg) for arg in record.args or ())
+        return f"{record.msg} | args={joined_args}"
+
+
+def _record_context(record: logging.LogRecord) -> dict[str, Any] | None:
+    bound = getattr(record, "bound_context", None)
+    context = getattr(record, "context", None)
+    if not bound and context is None:
+        return None
+    merged = dict(bound or ())
+    if isinstance(context, Mapping):
+        merged.update(context)
+    elif context is not None:
+        merged["data"] = context
+    return merged
+
+
+def _dumps(value: Any) -> str:
+    try:
+        return json.dumps(value, ensure_ascii=False, default=str)
+    except (TypeError, ValueError):
+        return str(value)
+
+
 def _resolve_level(level: str | int) -> int:
     if isinstance(level, int):
         return level
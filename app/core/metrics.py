@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from time import perf_counter
+from typing import Any
+
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class _Series:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self, size: int) -> None:
+        self.counts = [0] * size
+        self.total = 0.0
+        self.count = 0
+
+
+class Histogram:
+    """Prometheus-style histogram.
+
+    Observations only happen on the event loop thread, so no locking is done;
+    bucket counts are stored per-bucket and made cumulative at render time.
+    """
+
+    __slots__ = ("name", "description", "label_names", "buckets", "_series")
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[tuple[str, ...], _Series] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = _Series(len(self.buckets) + 1)
+        series.counts[bisect_left(self.buckets, value)] += 1
+        series.total += value
+        series.count += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        for label_values, series in sorted(self._series.items()):
+            base_labels = [f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, label_values)]
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), series.counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                labels = ",".join([*base_labels, f'le="{le}"'])
+                lines.append(f"{self.name}_bucket{{{labels}}} {cumulative}")
+            suffix = "{" + ",".join(base_labels) + "}" if base_labels else ""
+            lines.append(f"{self.name}_sum{suffix} {series.total}")
+            lines.append(f"{self.name}_count{suffix} {series.count}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._histograms: dict[str, Histogram] = {}
+        self._collectors: list[Callable[[], list[str]]] = []
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        existing = self._histograms.get(name)
+        if existing is not None:
+            return existing
+        histogram = Histogram(name, description, label_names, buckets)
+        self._histograms[name] = histogram
+        return histogram
+
+    def register_collector(self, collector: Callable[[], list[str]]) -> None:
+        """Register a callable producing extra exposition lines at scrape time."""
+        if collector not in self._collectors:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for histogram in self._histograms.values():
+            lines.extend(histogram.render())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds", "Request latency by route", ("method", "route", "status")
+)
+DB_STATEMENT_DURATION = REGISTRY.histogram(
+    "db_statement_duration_seconds", "SQL statement execution time", ("operation",)
+)
+REDIS_COMMAND_DURATION = REGISTRY.histogram(
+    "redis_command_duration_seconds", "Redis command round-trip time", ("command",)
+)
+BCRYPT_DURATION = REGISTRY.histogram(
+    "bcrypt_duration_seconds",
+    "Password hashing time",
+    ("operation",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.5),
+)
+DB_STATEMENTS_PER_REQUEST = REGISTRY.histogram(
+    "db_statements_per_request",
+    "Number of SQL statements issued per request",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 250),
+)
+JWT_DURATION = REGISTRY.histogram(
+    "jwt_duration_seconds",
+    "JWT encode/decode time",
+    ("operation",),
+    buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01),
+)
+
+
+class RequestTimings:
+    """Per-request accumulator of span durations, keyed by category (db, redis, ...)."""
+
+    __slots__ = ("spans",)
+
+    def __init__(self) -> None:
+        self.spans: dict[str, list[float]] = {}
+
+    def add(self, category: str, seconds: float) -> None:
+        span = self.spans.get(category)
+        if span is None:
+            self.spans[category] = [seconds, 1]
+        else:
+            span[0] += seconds
+            span[1] += 1
+
+    def server_timing(self, total_seconds: float) -> str:
+        parts = [
+            f'{category};dur={duration * 1000:.2f};desc="{int(count)}x"'
+            for category, (duration, count) in self.spans.items()
+        ]
+        parts.append(f"total;dur={total_seconds * 1000:.2f}")
+        return ", ".join(parts)
+
+
+_request_timings_ctx: ContextVar[RequestTimings | None] = ContextVar("request_timings", default=None)
+
+
+def start_request_timings() -> tuple[RequestTimings, Token]:
+    timings = RequestTimings()
+    return timings, _request_timings_ctx.set(timings)
+
+
+def reset_request_timings(token: Token | None) -> None:
+    if token is None:
+        return
+    _request_timings_ctx.reset(token)
+
+
+def get_request_timings() -> RequestTimings | None:
+    return _request_timings_ctx.get()
+
+
+def record_span(category: str, seconds: float) -> None:
+    timings = _request_timings_ctx.get()
+    if timings is not None:
+        timings.add(category, seconds)
+
+
+@contextmanager
+def timed(histogram: Histogram, category: str, *label_values: str) -> Iterator[None]:
+    """Observe the wrapped block in ``histogram`` and the current request's ``category`` span."""
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = perf_counter() - start
+        histogram.observe(elapsed, *label_values)
+        record_span(category, elapsed)
+
+
+_statement_observers: list[Callable[[str, float], None]] = []
+
+
+def add_statement_observer(observer: Callable[[str, float], None]) -> None:
+    """Register a callback receiving ``(statement, elapsed_seconds)`` for every executed statement."""
+    if observer not in _statement_observers:
+        _statement_observers.append(observer)
+
+
+def instrument_engine(engine: Any) -> None:
+    """Time every statement executed through ``engine`` (sync or async)."""
+    from sqlalchemy import event
+
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_start", []).append(perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    elapsed = perf_counter() - starts.pop()
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement else "UNKNOWN"
+    DB_STATEMENT_DURATION.observe(elapsed, operation)
+    record_span("db", elapsed)
+    for observer in _statement_observers:
+        observer(statement, elapsed)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _logging_collector() -> list[str]:
+    from app.core.logging import get_logging_stats
+
+    stats = get_logging_stats()
+    return [
+        "# TYPE log_records_dropped_total counter",
+        f"log_records_dropped_total {stats['dropped']}",
+        "# TYPE log_records_sampled_out_total counter",
+        f"log_records_sampled_out_total {stats['sampled_out']}",
+        "# TYPE log_queue_depth gauge",
+        f"log_queue_depth {stats['queue_depth']}",
+    ]
+
+
+REGISTRY.register_collector(_logging_collector)
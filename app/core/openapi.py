@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import gzip
+import json
+from hashlib import sha256
+from pathlib import Path
+from typing import Any
+
+from fastapi import FastAPI, Request
+from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
+from fastapi.openapi.utils import get_openapi
+from fastapi.responses import HTMLResponse, Response
+
+from app.core.logging import get_logger
+from app.core.settings import Settings
+
+logger = get_logger(__name__)
+
+OPENAPI_URL = "/openapi.json"
+
+
+def resolve_openapi_mode(settings: Settings) -> str:
+    if settings.openapi_mode is not None:
+        return settings.openapi_mode
+    return "static" if settings.environment == "prod" else "runtime"
+
+
+def build_openapi_schema(app: FastAPI) -> dict[str, Any]:
+    """Generate the schema from the routes, ignoring any static override on ``app``."""
+    return get_openapi(
+        title=app.title,
+        version=app.version,
+        openapi_version=app.openapi_version,
+        summary=app.summary,
+        description=app.description,
+        routes=app.routes,
+        tags=app.openapi_tags,
+        servers=app.servers,
+    )
+
+
+def export_openapi(app: FastAPI, path: str | Path) -> tuple[Path, Path]:
+    """Write ``path`` and a gzip-compressed ``path.gz`` next to it."""
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    body = json.dumps(build_openapi_schema(app), ensure_ascii=False, separators=(",", ":")).encode()
+    target.write_bytes(body)
+    compressed = target.with_name(target.name + ".gz")
+    # mtime=0 keeps the archive byte-identical across builds.
+    compressed.write_bytes(gzip.compress(body, compresslevel=9, mtime=0))
+    return target, compressed
+
+
+class StaticOpenAPI:
+    """Pre-generated schema bytes, loaded once and served without touching the routes."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._body: bytes | None = None
+        self._compressed: bytes | None = None
+        self._etag = ""
+
+    def load(self) -> None:
+        if self._body is not None:
+            return
+        body = self.path.read_bytes()
+        compressed_path = self.path.with_name(self.path.name + ".gz")
+        self._compressed = (
+            compressed_path.read_bytes()
+            if compressed_path.exists()
+            else gzip.compress(body, compresslevel=9, mtime=0)
+        )
+        self._etag = f'"{sha256(body).hexdigest()[:32]}"'
+        self._body = body
+
+    def schema(self) -> dict[str, Any]:
+        self.load()
+        return json.loads(self._body or b"{}")
+
+    def response(self, request: Request) -> Response:
+        self.load()
+        headers = {"ETag": self._etag, "Vary": "Accept-Encoding", "Cache-Control": "public, max-age=300"}
+        if request.headers.get("if-none-match") == self._etag:
+            return Response(status_code=304, headers=headers)
+        if "gzip" in request.headers.get("accept-encoding", ""):
+            headers["Content-Encoding"] = "gzip"
+            return Response(self._compressed, media_type="application/json", headers=headers)
+        return Response(self._body, media_type="application/json", headers=headers)
+
+
+def install_static_openapi(
+    app: FastAPI,
+    path: str | Path,
+    openapi_url: str,
+    docs_url: str | None,
+    redoc_url: str | None,
+) -> None:
+    """Serve a build-time schema file and disable runtime generation on ``app``.
+
+    ``app`` must be created with ``openapi_url=None`` so FastAPI does not register
+    its own generating routes.
+    """
+    static = StaticOpenAPI(path)
+    if not static.path.exists():
+        logger.warning("OpenAPI schema file %s not found; docs will return 404", static.path)
+
+    # Anything calling app.openapi() gets the file instead of a route walk.
+    app.openapi = static.schema  # type: ignore[method-assign]
+
+    async def openapi_json(request: Request) -> Response:
+        if not static.path.exists():
+            return Response(status_code=404)
+        return static.response(request)
+
+    app.add_route(openapi_url, openapi_json, include_in_schema=False)
+
+    if docs_url:
+
+        async def swagger_ui(request: Request) -> HTMLResponse:
+            return get_swagger_ui_html(openapi_url=openapi_url, title=f"{app.title} - Swagger UI")
+
+        app.add_route(docs_url, swagger_ui, include_in_schema=False)
+
+    if redoc_url:
+
+        async def redoc(request: Request) -> HTMLResponse:
+            return get_redoc_html(openapi_url=openapi_url, title=f"{app.title} - ReDoc")
+
+        app.add_route(redoc_url, redoc, include_in_schema=False)
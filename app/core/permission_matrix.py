@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import base64
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class PermissionEntry:
+    id: int
+    code: str
+    label: str | None
+    menu_id: int | None
+
+
+class PermissionMatrix:
+    """Role x permission grid for GET /roles/matrix, one bitmap per role.
+
+    Bit ``i`` of a mask stands for ``entries[i]`` (permissions ordered by id),
+    so each role's grants travel as one encoded int instead of a list of ids.
+    This is a wire format for the admin editor only; authorization and role
+    serialization keep working from permission codes and ids.
+    """
+
+    def __init__(
+        self, entries: Iterable[PermissionEntry], grants: Iterable[tuple[int, int]]
+    ) -> None:
+        self.entries: list[PermissionEntry] = sorted(entries, key=lambda entry: entry.id)
+        bit_by_id = {entry.id: bit for bit, entry in enumerate(self.entries)}
+        self._role_masks: dict[int, int] = {}
+        for role_id, permission_id in grants:
+            bit = bit_by_id.get(permission_id)
+            if bit is not None:
+                self._role_masks[role_id] = self._role_masks.get(role_id, 0) | (1 << bit)
+
+    def role_mask(self, role_id: int) -> int:
+        return self._role_masks.get(role_id, 0)
+
+    @staticmethod
+    def encode(mask: int) -> str:
+        """Little-endian bytes of ``mask`` as unpadded base64url (bit 0 = first byte, LSB)."""
+        raw = mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
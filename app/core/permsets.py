@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from hashlib import sha256
+
+from redis.asyncio import Redis
+
+from app.core.settings import get_settings
+
+# Bump when the stored layout of a permission set changes; old entries then age out.
+PERMISSION_SET_VERSION = 1
+PERMISSION_SET_KEY_PREFIX = f"permset:v{PERMISSION_SET_VERSION}:"
+
+
+def permission_set_id(permissions: list[str]) -> str:
+    """Content hash of a permission list; identical sets share one id across users."""
+    canonical = "\n".join(sorted(set(permissions)))
+    return sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def permission_set_key(set_id: str) -> str:
+    return f"{PERMISSION_SET_KEY_PREFIX}{set_id}"
+
+
+async def store_permission_set(redis: Redis, permissions: list[str], ttl_seconds: int) -> str:
+    """Ensure the shared entry for ``permissions`` exists and return its id.
+
+    The entry is written with twice the token lifetime and rewritten at most once
+    per lifetime by this process, so it always outlives the tokens issued here
+    without a Redis write on every login.
+    """
+    set_id = permission_set_id(permissions)
+    cache = get_permission_set_cache()
+    now = time.monotonic()
+    if cache.stored_until(set_id) > now + ttl_seconds:
+        return set_id
+    await redis.set(permission_set_key(set_id), ",".join(sorted(set(permissions))), ex=2 * ttl_seconds)
+    cache.put(set_id, permissions, stored_until=now + 2 * ttl_seconds)
+    return set_id
+
+
+class PermissionSetCache:
+    """Process-local LRU of permission sets referenced by access tokens.
+
+    Sets are immutable (the id is their content hash), so entries never go
+    stale; they are only evicted for size. Misses fall back to the shared
+    Redis entry written when the token was issued.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        # set id -> (permissions, monotonic time until which this process knows the Redis entry lives)
+        self._entries: OrderedDict[str, tuple[tuple[str, ...], float]] = OrderedDict()
+
+    def put(self, set_id: str, permissions: list[str], stored_until: float = 0.0) -> None:
+        self._entries[set_id] = (tuple(sorted(set(permissions))), stored_until)
+        self._entries.move_to_end(set_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, set_id: str) -> tuple[str, ...] | None:
+        entry = self._entries.get(set_id)
+        if entry is None:
+            return None
+        self._entries.move_to_end(set_id)
+        return entry[0]
+
+    def stored_until(self, set_id: str) -> float:
+        entry = self._entries.get(set_id)
+        return entry[1] if entry else 0.0
+
+    async def resolve(self, redis: Redis, set_id: str, version: int) -> list[str] | None:
+        """Permissions behind a token's ``pset``/``psv`` claims, or None if unknown."""
+        if version != PERMISSION_SET_VERSION:
+            return None
+        cached = self.get(set_id)
+        if cached is not None:
+            return list(cached)
+        raw = await redis.get(permission_set_key(set_id))
+        if raw is None:
+            return None
+        permissions = [code for code in raw.split(",") if code]
+        self.put(set_id, permissions)
+        return permissions
+
+
+@lru_cache
+def get_permission_set_cache() -> PermissionSetCache:
+    return PermissionSetCache(get_settings().permission_set_cache_size)
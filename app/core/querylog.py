@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+
+from app.core.logging import get_logger
+from app.core.metrics import DB_STATEMENTS_PER_REQUEST, add_statement_observer
+from app.core.settings import get_settings
+
+logger = get_logger(__name__)
+
+_PLACEHOLDER = r"(?:\?|\$\d+|%\(\w+\)s|:\w+|'[^']*'|\d+)"
+_PLACEHOLDER_LIST_RE = re.compile(rf"{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})+")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+class QueryStats:
+    """Statements issued while handling one request."""
+
+    __slots__ = ("count", "total_seconds", "shapes")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_seconds = 0.0
+        self.shapes: dict[str, int] = {}
+
+
+class QueryCounter:
+    """Explicit statement recorder used by tests and benchmarks."""
+
+    __slots__ = ("statements",)
+
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+_query_stats_ctx: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+_active_counters: list[QueryCounter] = []
+
+
+def normalize_statement(statement: str) -> str:
+    """Collapse whitespace and expanded IN-lists so equivalent statements share one shape."""
+    collapsed = _WHITESPACE_RE.sub(" ", statement).strip()
+    return _PLACEHOLDER_LIST_RE.sub("?, ...", collapsed)
+
+
+def start_query_tracking() -> tuple[QueryStats | None, Token | None]:
+    if get_settings().query_tracking == "off":
+        return None, None
+    stats = QueryStats()
+    return stats, _query_stats_ctx.set(stats)
+
+
+def finish_query_tracking(stats: QueryStats | None, token: Token | None, label: str) -> None:
+    if token is not None:
+        _query_stats_ctx.reset(token)
+    if stats is None:
+        return
+    DB_STATEMENTS_PER_REQUEST.observe(stats.count)
+    settings = get_settings()
+    if stats.count > settings.query_budget_statements:
+        logger.warning(
+            "Query budget exceeded: %s issued %d statements",
+            label,
+            stats.count,
+            context={"statements": stats.count, "db_ms": round(stats.total_seconds * 1000, 2)},
+        )
+    repeated = {
+        shape: times for shape, times in stats.shapes.items() if times > settings.query_budget_repeats
+    }
+    if repeated:
+        logger.warning(
+            "Possible N+1: %s repeated %d statement shape(s)",
+            label,
+            len(repeated),
+            context={"repeated": repeated},
+        )
+
+
+def observe_statement(statement: str, elapsed: float) -> None:
+    for counter in _active_counters:
+        counter.statements.append(statement)
+    stats = _query_stats_ctx.get()
+    if stats is None:
+        return
+    stats.count += 1
+    stats.total_seconds += elapsed
+    settings = get_settings()
+    # prod mode keys on the raw statement text; dev mode also folds expanded IN-lists.
+    shape = normalize_statement(statement) if settings.query_tracking == "dev" else statement
+    stats.shapes[shape] = stats.shapes.get(shape, 0) + 1
+    if elapsed * 1000 >= settings.slow_query_threshold_ms:
+        logger.warning(
+            "Slow query took %.1fms",
+            elapsed * 1000,
+            context={"statement": normalize_statement(statement)},
+        )
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCounter]:
+    """Record every statement executed by instrumented engines inside the block."""
+    counter = QueryCounter()
+    _active_counters.append(counter)
+    try:
+        yield counter
+    finally:
+        _active_counters.remove(counter)
+
+
+add_statement_observer(observe_statement)
@@ -1,21 +1,207 @@
-from collections.abc import AsyncGenerator
+from __future__ import annotations
 
-from redis.asyncio import Redis
+import asyncio
+import hashlib
+from collections.abc import AsyncGenerator, Sequence
+from functools import lru_cache
+from time import perf_counter
+from typing import Any
+from urllib.parse import unquote, urlsplit
 
-from app.core.settings import get_settings
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.asyncio.retry import Retry
+from redis.backoff import ExponentialBackoff
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import NoScriptError, RedisError
+from redis.exceptions import TimeoutError as RedisTimeoutError
 
-settings = get_settings()
+from app.core.logging import get_logger
+from app.core.metrics import REDIS_COMMAND_DURATION, REGISTRY, record_span
+from app.core.settings import Settings, get_settings
 
-_redis_client: Redis | None = None
+logger = get_logger(__name__)
+
+SENTINEL_SCHEME = "redis+sentinel"
+CLUSTER_SCHEME = "redis+cluster"
+
+
+class InstrumentedRedis(Redis):
+    """Redis client that records per-command latency into metrics and request timings."""
+
+    async def execute_command(self, *args: Any, **options: Any) -> Any:
+        start = perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            elapsed = perf_counter() - start
+            REDIS_COMMAND_DURATION.observe(elapsed, str(args[0]).upper() if args else "UNKNOWN")
+            record_span("redis", elapsed)
+
+
+class LuaScript:
+    """Server-side script run with EVALSHA, falling back to EVAL when not cached yet.
+
+    Unlike ``Redis.register_script`` it is not bound to a client, so module-level
+    scripts work with whichever client the request dependency provides.
+    """
+
+    __slots__ = ("source", "sha")
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.sha = hashlib.sha1(source.encode("utf-8")).hexdigest()
+
+    async def __call__(self, redis: Redis, keys: Sequence[str], args: Sequence[Any] = ()) -> Any:
+        try:
+            return await redis.evalsha(self.sha, len(keys), *keys, *args)
+        except NoScriptError:
+            # EVAL also loads the script into the server cache for later EVALSHA calls.
+            return await redis.eval(self.source, len(keys), *keys, *args)
+
+
+class RedisManager:
+    """Owns the process-wide Redis client; started and closed by the application lifespan.
+
+    Plain ``redis://`` URLs use a ``BlockingConnectionPool`` so that exhausted pools
+    wait at most ``redis_pool_timeout_seconds`` instead of opening unbounded
+    connections. ``redis+sentinel://host:port[,host:port]/service[/db]`` and
+    ``redis+cluster://host:port`` URLs are also accepted.
+    """
+
+    def __init__(self, settings: Settings | None = None) -> None:
+        self.settings = settings or get_settings()
+        self._client: Any = None
+        self._pool: BlockingConnectionPool | None = None
+
+    @property
+    def client(self) -> Redis:
+        if self._client is None:
+            self._client = self._build_client()
+        return self._client
+
+    async def startup(self) -> None:
+        client = self.client
+        try:
+            await asyncio.wait_for(client.ping(), timeout=self.settings.redis_socket_timeout_seconds)
+        except (RedisError, asyncio.TimeoutError, OSError) as exc:
+            # Do not block startup; requests fail fast until Redis comes back.
+            logger.warning("Redis not reachable at startup: %s", exc)
+
+    async def shutdown(self) -> None:
+        client, self._client = self._client, None
+        pool, self._pool = self._pool, None
+        if client is not None:
+            await client.aclose()
+        if pool is not None:
+            await pool.disconnect()
+
+    async def health(self) -> bool:
+        try:
+            return bool(
+                await asyncio.wait_for(
+                    self.client.ping(), timeout=self.settings.redis_socket_timeout_seconds
+                )
+            )
+        except (RedisError, asyncio.TimeoutError, OSError):
+            return False
+
+    def pool_stats(self) -> dict[str, int]:
+        pool = self._pool
+        if pool is None:
+            return {"max": 0, "in_use": 0, "idle": 0}
+        in_use = len(getattr(pool, "_in_use_connections", ()))
+        idle = len(getattr(pool, "_available_connections", ()))
+        return {"max": pool.max_connections, "in_use": in_use, "idle": idle}
+
+    def _connection_kwargs(self) -> dict[str, Any]:
+        settings = self.settings
+        retry = Retry(
+            ExponentialBackoff(
+                cap=settings.redis_retry_backoff_cap_seconds,
+                base=settings.redis_retry_backoff_base_seconds,
+            ),
+            settings.redis_retry_attempts,
+            supported_errors=(RedisConnectionError, RedisTimeoutError, OSError),
+        )
+        return {
+            "decode_responses": True,
+            "socket_timeout": settings.redis_socket_timeout_seconds,
+            "socket_connect_timeout": settings.redis_socket_connect_timeout_seconds,
+            "health_check_interval": settings.redis_health_check_interval_seconds,
+            "retry": retry,
+        }
+
+    def _build_client(self) -> Any:
+        url = self.settings.redis_url
+        scheme = urlsplit(url).scheme
+        if scheme == SENTINEL_SCHEME:
+            return self._build_sentinel_client(url)
+        if scheme == CLUSTER_SCHEME:
+            from redis.asyncio.cluster import RedisCluster
+
+            return RedisCluster.from_url(
+                url.replace(f"{CLUSTER_SCHEME}://", "redis://", 1),
+                max_connections=self.settings.redis_max_connections,
+                **self._connection_kwargs(),
+            )
+        self._pool = BlockingConnectionPool.from_url(
+            url,
+            max_connections=self.settings.redis_max_connections,
+            timeout=self.settings.redis_pool_timeout_seconds,
+            **self._connection_kwargs(),
+        )
+        return InstrumentedRedis(connection_pool=self._pool)
+
+    def _build_sentinel_client(self, url: str) -> Redis:
+        from redis.asyncio.sentinel import Sentinel
+
+        parts = urlsplit(url)
+        hosts_part = parts.netloc.rsplit("@", 1)[-1]
+        hosts = []
+        for item in hosts_part.split(","):
+            host, _, port = item.partition(":")
+            hosts.append((host, int(port or 26379)))
+        path = [segment for segment in parts.path.split("/") if segment]
+        if not path:
+            raise ValueError("Sentinel URL must include the service name")
+        service_name = path[0]
+        db = int(path[1]) if len(path) > 1 else 0
+        kwargs = self._connection_kwargs()
+        if parts.password:
+            kwargs["password"] = unquote(parts.password)
+        sentinel = Sentinel(
+            hosts,
+            socket_timeout=self.settings.redis_socket_timeout_seconds,
+            socket_connect_timeout=self.settings.redis_socket_connect_timeout_seconds,
+        )
+        return sentinel.master_for(
+            service_name,
+            redis_class=InstrumentedRedis,
+            db=db,
+            max_connections=self.settings.redis_max_connections,
+            **kwargs,
+        )
+
+
+@lru_cache
+def get_redis_manager() -> RedisManager:
+    return RedisManager()
 
 
 async def get_redis() -> AsyncGenerator[Redis, None]:
-    global _redis_client
-    if _redis_client is None:
-        _redis_client = Redis.from_url(settings.redis_url, decode_responses=True, max_connections=100)
-    try:
-        yield _redis_client
-    finally:
-        # Keep connection open for reuse
-        pass
+    yield get_redis_manager().client
+
+
+def _redis_pool_collector() -> list[str]:
+    stats = get_redis_manager().pool_stats()
+    return [
+        "# TYPE redis_pool_max_connections gauge",
+        f"redis_pool_max_connections {stats['max']}",
+        "# TYPE redis_pool_connections_in_use gauge",
+        f"redis_pool_connections_in_use {stats['in_use']}",
+        "# TYPE redis_pool_connections_idle gauge",
+        f"redis_pool_connections_idle {stats['idle']}",
+    ]
+
 
+REGISTRY.register_collector(_redis_pool_collector)
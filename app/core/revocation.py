@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import asyncio
+import math
+from functools import lru_cache
+from hashlib import blake2b
+from time import monotonic, time
+from typing import Any
+
+from redis.asyncio import Redis
+
+from app.core.logging import get_logger
+from app.core.metrics import REGISTRY
+from app.core.redis import LuaScript
+from app.core.settings import Settings, get_settings
+
+logger = get_logger(__name__)
+
+BLACKLIST_KEY_PREFIX = "jti:black:"
+BLACKLIST_INDEX_KEY = "jti:black:index"
+REVOCATION_CHANNEL = "jti:revoked"
+
+# KEYS[1] index zset; ARGV[1] jti, ARGV[2] exp, ARGV[3] now, ARGV[4] channel
+# The per-jti blacklist key is written separately: it hashes to its own slot, and
+# tagging every jti into the index's slot would pin the whole blacklist on one shard.
+REVOKE_TOKEN_SCRIPT = LuaScript(
+    """
+redis.call('ZADD', KEYS[1], ARGV[2], ARGV[1])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[3])
+redis.call('PUBLISH', ARGV[4], ARGV[1] .. '|' .. ARGV[2])
+return 1
+"""
+)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter using double hashing over one blake2b digest."""
+
+    __slots__ = ("size", "hash_count", "bits")
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> list[int]:
+        digest = blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        size = self.size
+        return [(h1 + i * h2) % size for i in range(self.hash_count)]
+
+    def add(self, item: str) -> None:
+        bits = self.bits
+        for position in self._positions(item):
+            bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        bits = self.bits
+        for position in self._positions(item):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+
+class TimeBucketedBloom:
+    """Bloom filters keyed by the expiry window of the revoked token.
+
+    A token that has expired no longer needs a blacklist entry, so whole buckets
+    are dropped once their window has passed; memory stays bounded without ever
+    deleting individual bits.
+    """
+
+    def __init__(self, bucket_seconds: int, capacity: int, error_rate: float) -> None:
+        self.bucket_seconds = bucket_seconds
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.buckets: dict[int, BloomFilter] = {}
+
+    def add(self, jti: str, exp: int) -> None:
+        bucket_id = exp // self.bucket_seconds
+        bucket = self.buckets.get(bucket_id)
+        if bucket is None:
+            bucket = self.buckets[bucket_id] = BloomFilter(self.capacity, self.error_rate)
+        bucket.add(jti)
+
+    def might_contain(self, jti: str, exp: int | None = None) -> bool:
+        if exp is not None:
+            bucket = self.buckets.get(int(exp) // self.bucket_seconds)
+            return bucket is not None and jti in bucket
+        return any(jti in bucket for bucket in self.buckets.values())
+
+    def rotate(self, now: float) -> None:
+        current = int(now) // self.bucket_seconds
+        for bucket_id in [bucket_id for bucket_id in self.buckets if bucket_id < current]:
+            del self.buckets[bucket_id]
+
+
+class RevocationChecker:
+    """Answers "is this jti revoked?" from process memory, asking Redis only on filter hits.
+
+    The filter is loaded from the ``jti:black:index`` sorted set and kept current
+    through the ``jti:revoked`` pub/sub channel, with a periodic full resync to
+    cover missed messages. Until the first sync completes (or after the
+    subscription drops) every check goes to Redis.
+    """
+
+    def __init__(self, settings: Settings | None = None) -> None:
+        self.settings = settings or get_settings()
+        self.filter = self._new_filter()
+        self.synced = False
+        self.stats = {"negative": 0, "filter_hit": 0, "revoked": 0, "unsynced": 0}
+        self._task: asyncio.Task | None = None
+
+    def _new_filter(self) -> TimeBucketedBloom:
+        return TimeBucketedBloom(
+            self.settings.revocation_bucket_seconds,
+            self.settings.revocation_bloom_capacity,
+            self.settings.revocation_bloom_error_rate,
+        )
+
+    async def is_revoked(self, redis: Redis, jti: str, exp: int | None = None) -> bool:
+        # Without an exp claim the token has no bucket in the filter; only Redis can answer.
+        if self.synced and exp is not None:
+            if not self.filter.might_contain(jti, exp):
+                self.stats["negative"] += 1
+                return False
+            self.stats["filter_hit"] += 1
+        elif not self.synced:
+            self.stats["unsynced"] += 1
+        revoked = await redis.exists(f"{BLACKLIST_KEY_PREFIX}{jti}") > 0
+        if revoked:
+            self.stats["revoked"] += 1
+        return revoked
+
+    async def revoke(self, redis: Redis, jti: str, exp: int | None) -> None:
+        """Blacklist ``jti`` until ``exp``, the revoked token's own exp claim.
+
+        A token without an exp claim is blacklisted without expiry and kept out of
+        the filter and index; ``is_revoked`` sends such tokens straight to Redis.
+        """
+        if exp is None:
+            await redis.set(f"{BLACKLIST_KEY_PREFIX}{jti}", "1")
+            return
+        now = int(time())
+        exp = int(exp)
+        # Blacklist key first, so a peer notified by the script already finds it.
+        await redis.set(f"{BLACKLIST_KEY_PREFIX}{jti}", "1", exat=exp)
+        await REVOKE_TOKEN_SCRIPT(
+            redis, keys=[BLACKLIST_INDEX_KEY], args=[jti, exp, now, REVOCATION_CHANNEL]
+        )
+        self.filter.add(jti, exp)
+
+    async def load_snapshot(self, redis: Redis) -> int:
+        now = time()
+        entries = await redis.zrangebyscore(BLACKLIST_INDEX_KEY, now, "+inf", withscores=True)
+        fresh = self._new_filter()
+        for jti, exp in entries:
+            fresh.add(jti, int(exp))
+        self.filter = fresh
+        return len(entries)
+
+    def apply_message(self, data: Any) -> None:
+        if isinstance(data, bytes):
+            data = data.decode("utf-8")
+        jti, _, exp = str(data).rpartition("|")
+        if jti and exp.isdigit():
+            self.filter.add(jti, int(exp))
+
+    def start(self, redis: Redis) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(redis))
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        self.synced = False
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self, redis: Redis) -> None:
+        resync_seconds = self.settings.revocation_resync_seconds
+        while True:
+            pubsub = redis.pubsub()
+            try:
+                # Subscribe before loading so nothing published in between is missed.
+                await pubsub.subscribe(REVOCATION_CHANNEL)
+                loaded = await self.load_snapshot(redis)
+                self.synced = True
+                logger.info("Revocation filter synced with %d entries", loaded)
+                next_resync = monotonic() + resync_seconds
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is not None:
+                        self.apply_message(message.get("data"))
+                    if monotonic() >= next_resync:
+                        self.filter.rotate(time())
+                        await self.load_snapshot(redis)
+                        next_resync = monotonic() + resync_seconds
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001 - keep the sync loop alive
+                self.synced = False
+                logger.warning("Revocation filter sync failed: %s", exc)
+                await asyncio.sleep(1.0)
+            finally:
+                await pubsub.aclose()
+
+
+@lru_cache
+def get_revocation_checker() -> RevocationChecker:
+    return RevocationChecker()
+
+
+def _revocation_collector() -> list[str]:
+    checker = get_revocation_checker()
+    stats = checker.stats
+    lines = ["# TYPE revocation_checks_total counter"]
+    for outcome in ("negative", "filter_hit", "unsynced"):
+        lines.append(f'revocation_checks_total{{outcome="{outcome}"}} {stats[outcome]}')
+    lines.append("# TYPE revocation_revoked_total counter")
+    lines.append(f"revocation_revoked_total {stats['revoked']}")
+    lines.append("# TYPE revocation_filter_synced gauge")
+    lines.append(f"revocation_filter_synced {int(checker.synced)}")
+    return lines
+
+
+REGISTRY.register_collector(_revocation_collector)
@@ -9,17 +9,20 @@ from uuid import uuid4
 from jose import ExpiredSignatureError, JWTError, jwt
 from passlib.context import CryptContext
 
+from app.core.metrics import BCRYPT_DURATION, JWT_DURATION, timed
 from app.core.settings import get_settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    with timed(BCRYPT_DURATION, "bcrypt", "hash"):
+        return pwd_context.hash(password)
 
 
 def verify_password(password: str, password_hash: str) -> bool:
-    return pwd_context.verify(password, password_hash)
+    with timed(BCRYPT_DURATION, "bcrypt", "verify"):
+        return pwd_context.verify(password, password_hash)
 
 
 def _load_key(path: str) -> str:
@@ -57,14 +60,16 @@ def create_jwt_token(sub: str, expires_minutes: int, token_type: str, **claims:
         "jti": str(uuid4()),
         **claims,
     }
-    token = jwt.encode(payload, get_signing_key(), algorithm=settings.jwt_algorithm)
+    with timed(JWT_DURATION, "jwt", "encode"):
+        token = jwt.encode(payload, get_signing_key(), algorithm=settings.jwt_algorithm)
     return {"token": token, "payload": payload}
 
 
 def decode_jwt_token(token: str) -> dict[str, Any]:
     settings = get_settings()
     try:
-        return jwt.decode(token, get_verification_key(), algorithms=[settings.jwt_algorithm])
+        with timed(JWT_DURATION, "jwt", "decode"):
+            return jwt.decode(token, get_verification_key(), algorithms=[settings.jwt_algorithm])
     except ExpiredSignatureError:
         raise ValueError("Token expired")
     except JWTError as exc:  # pragma: no cover - thin wrapper
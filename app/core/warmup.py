@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from time import perf_counter
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import configure_mappers
+
+from app.core.logging import get_logger
+from app.core.settings import get_settings
+
+logger = get_logger(__name__)
+
+
+class WarmupState:
+    """Progress of the startup warm-up, reported by the readiness endpoint."""
+
+    def __init__(self) -> None:
+        self.ready = False
+        self.finished = False
+        self.attempts = 0
+        self.steps: dict[str, float] = {}
+        self.errors: dict[str, str] = {}
+
+    def reset(self) -> None:
+        self.ready = False
+        self.finished = False
+        self.attempts = 0
+        self.steps.clear()
+        self.errors.clear()
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "finished": self.finished,
+            "attempts": self.attempts,
+            "steps_ms": {name: round(seconds * 1000, 2) for name, seconds in self.steps.items()},
+            "errors": dict(self.errors),
+        }
+
+
+warmup_state = WarmupState()
+
+
+def get_warmup_state() -> WarmupState:
+    return warmup_state
+
+
+async def _hot_user_by_id(session: AsyncSession) -> None:
+    from app.repositories.user_repository import UserRepository
+
+    await UserRepository(session).fetch_principal(user_id=-1)
+
+
+async def _hot_user_by_username(session: AsyncSession) -> None:
+    from app.repositories.user_repository import UserRepository
+
+    await UserRepository(session).fetch_principal(username="")
+
+
+# Statements on the login / token-validation path. Executing them once with keys
+# that match nothing fills the engine's compiled-statement cache.
+HOT_STATEMENTS: list[Callable[[AsyncSession], Awaitable[None]]] = [
+    _hot_user_by_id,
+    _hot_user_by_username,
+]
+
+
+def load_jwt_keys() -> None:
+    from app.core.security import create_jwt_token, decode_jwt_token, get_signing_key, get_verification_key
+
+    get_signing_key()
+    get_verification_key()
+    # Round-trip once so python-jose resolves its algorithm backend now.
+    decode_jwt_token(create_jwt_token("0", 1, "warmup")["token"])
+
+
+def configure_orm_mappers() -> None:
+    # Import every model module so all mapped classes are registered first.
+    from app.models import audit, department, menu, role, user  # noqa: F401
+
+    configure_mappers()
+
+
+async def open_db_connections(engine: AsyncEngine, count: int) -> None:
+    """Check out ``count`` connections at once so the pool keeps them when released."""
+    pool_size = getattr(engine.sync_engine.pool, "size", None)
+    count = min(count, pool_size() if callable(pool_size) else 1)
+    if count <= 0:
+        return
+    barrier = asyncio.Barrier(count)
+
+    async def _touch() -> None:
+        async with engine.connect() as conn:
+            try:
+                await conn.execute(text("SELECT 1"))
+            except BaseException:
+                await barrier.abort()
+                raise
+            await barrier.wait()
+
+    await asyncio.gather(*(_touch() for _ in range(count)))
+
+
+async def precompile_statements(session_factory: async_sessionmaker[AsyncSession]) -> None:
+    async with session_factory() as session:
+        for statement in HOT_STATEMENTS:
+            await statement(session)
+        await session.rollback()
+
+
+async def open_redis_connections(client: Any, count: int) -> None:
+    if count <= 0:
+        return
+    # Concurrent commands force the pool to open distinct connections.
+    await asyncio.gather(*(client.ping() for _ in range(count)))
+
+
+def _warmup_steps(
+    engine: AsyncEngine,
+    session_factory: async_sessionmaker[AsyncSession],
+    redis_client: Any,
+) -> dict[str, Callable[[], Any]]:
+    settings = get_settings()
+    return {
+        "jwt_keys": load_jwt_keys,
+        "mappers": configure_orm_mappers,
+        "db_pool": lambda: open_db_connections(engine, settings.warmup_db_connections),
+        "statements": lambda: precompile_statements(session_factory),
+        "redis_pool": lambda: open_redis_connections(redis_client, settings.warmup_redis_connections),
+    }
+
+
+async def _run_steps(steps: dict[str, Callable[[], Any]], state: WarmupState) -> None:
+    timeout = get_settings().warmup_step_timeout_seconds
+    state.attempts += 1
+    for name, step in steps.items():
+        start = perf_counter()
+        state.errors.pop(name, None)
+        try:
+            result = step()
+            if asyncio.iscoroutine(result):
+                await asyncio.wait_for(result, timeout=timeout)
+        except Exception as exc:  # noqa: BLE001 - reported through readiness
+            state.errors[name] = f"{type(exc).__name__}: {exc}"
+            logger.warning("Warm-up step %s failed: %s", name, exc)
+        finally:
+            state.steps[name] = perf_counter() - start
+    state.ready = not state.errors
+
+
+async def warm_up(
+    engine: AsyncEngine,
+    session_factory: async_sessionmaker[AsyncSession],
+    redis_client: Any,
+    state: WarmupState | None = None,
+) -> WarmupState:
+    """Run every warm-up step once, recording durations and failures in ``state``.
+
+    A failing step does not stop the remaining ones; ``state.ready`` is only set
+    when all of them succeed.
+    """
+    state = state or warmup_state
+    state.reset()
+    await _run_steps(_warmup_steps(engine, session_factory, redis_client), state)
+    state.finished = True
+    logger.info("Warm-up finished", context=state.as_dict())
+    return state
+
+
+async def warm_up_until_ready(
+    engine: AsyncEngine,
+    session_factory: async_sessionmaker[AsyncSession],
+    redis_client: Any,
+    state: WarmupState | None = None,
+) -> WarmupState:
+    """Run the warm-up, then retry only the failed steps with doubling backoff.
+
+    A transient database or Redis outage during boot therefore delays
+    readiness instead of pinning it at 503 for the life of the process.
+    """
+    settings = get_settings()
+    state = await warm_up(engine, session_factory, redis_client, state)
+    steps = _warmup_steps(engine, session_factory, redis_client)
+    delay = settings.warmup_retry_initial_seconds
+    while not state.ready:
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, settings.warmup_retry_max_seconds)
+        await _run_steps({name: steps[name] for name in list(state.errors)}, state)
+        logger.info("Warm-up retried", context=state.as_dict())
+    return state
@@ -1,27 +1,74 @@
+import asyncio
 import traceback
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from redis.exceptions import RedisError
 
 from app.agents.audit import get_audit_agent
 from app.core.audit_actions import AuditAction
+from app.core.database import get_engine, get_session_factory
+from app.core.logging import configure_logging, get_logger, shutdown_logging, start_logging
+from app.core.openapi import OPENAPI_URL, install_static_openapi, resolve_openapi_mode
+from app.core.redis import get_redis_manager
+from app.core.revocation import get_revocation_checker
 from app.core.settings import get_settings
 from app.core.trace import get_trace_id
+from app.core.warmup import get_warmup_state, warm_up_until_ready
 from app.middleware.auth import AuthMiddleware
+from app.middleware.timing import TimingMiddleware
 from app.middleware.trace import TraceMiddleware
-from app.routers import auth, audit, user, menu, role, department
+from app.routers import auth, audit, user, menu, role, department, health, metrics
+
+logger = get_logger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    settings = get_settings()
+    start_logging()
+    redis_manager = get_redis_manager()
+    await redis_manager.startup()
+    warmup_task: asyncio.Task | None = None
+    revocation_checker = get_revocation_checker()
+    if settings.revocation_filter_enabled:
+        revocation_checker.start(redis_manager.client)
+    if settings.warmup_enabled:
+        # Run in the background so liveness answers immediately; readiness flips once every
+        # step has succeeded, failed steps being retried with backoff.
+        warmup_task = asyncio.create_task(
+            warm_up_until_ready(get_engine(), get_session_factory(), redis_manager.client)
+        )
+    else:
+        state = get_warmup_state()
+        state.finished = state.ready = True
+    try:
+        yield
+    finally:
+        if warmup_task is not None and not warmup_task.done():
+            warmup_task.cancel()
+        await revocation_checker.stop()
+        await redis_manager.shutdown()
+        shutdown_logging()
 
 
 def create_app() -> FastAPI:
     settings = get_settings()
+    configure_logging()
+    openapi_mode = resolve_openapi_mode(settings)
+    runtime_docs = openapi_mode == "runtime"
     app = FastAPI(
         title="FastAPI Admin Service",
         version="0.1.0",
         summary="Agent-Oriented authentication and authorization backend",
-        docs_url=settings.docs_url,
-        redoc_url=settings.redoc_url,
+        openapi_url=OPENAPI_URL if runtime_docs else None,
+        docs_url=settings.docs_url if runtime_docs else None,
+        redoc_url=settings.redoc_url if runtime_docs else None,
+        lifespan=lifespan,
     )
 
     app.add_middleware(
@@ -33,6 +80,8 @@ def create_app() -> FastAPI:
     )
     app.add_middleware(TraceMiddleware)
     app.add_middleware(AuthMiddleware)
+    if settings.metrics_enabled:
+        app.add_middleware(TimingMiddleware)
 
     app.include_router(auth.router, prefix="/auth", tags=["auth"])
     app.include_router(user.router, prefix="/users", tags=["users"])
@@ -40,6 +89,13 @@ def create_app() -> FastAPI:
     app.include_router(role.router, prefix="/roles", tags=["roles"])
     app.include_router(department.router, prefix="/departments", tags=["departments"])
     app.include_router(audit.router, prefix="/audit", tags=["audit"])
+    app.include_router(health.router, prefix="/health", tags=["health"])
+    if settings.metrics_enabled:
+        app.include_router(metrics.router)
+    if openapi_mode == "static":
+        install_static_openapi(
+            app, settings.openapi_static_path, OPENAPI_URL, settings.docs_url, settings.redoc_url
+        )
 
     @app.exception_handler(HTTPException)
     async def http_exception_handler(request: Request, exc: HTTPException) -> JSONResponse:
@@ -79,6 +135,19 @@ def create_app() -> FastAPI:
             content={"code": 422, "message": exc.errors(), "data": None},
         )
 
+    @app.exception_handler(RedisError)
+    async def redis_exception_handler(request: Request, exc: RedisError) -> JSONResponse:
+        # Redis 不可用时快速失败，避免请求堆积在连接池上
+        logger.warning(
+            "Redis unavailable: %s",
+            exc,
+            context={"path": request.url.path, "exception_type": type(exc).__name__},
+        )
+        return JSONResponse(
+            status_code=503,
+            content={"code": 503, "message": "Service Temporarily Unavailable", "data": None},
+        )
+
     @app.exception_handler(Exception)
     async def generic_exception_handler(request: Request, exc: Exception) -> JSONResponse:
         # 记录未捕获的异常
@@ -110,4 +179,12 @@ def create_app() -> FastAPI:
     return app
 
 
-app = create_app()
+def __getattr__(name: str) -> FastAPI:
+    # Build the application on first access instead of at import, so
+    # ``uvicorn app.main:app`` keeps working while ``--factory app.main:create_app``
+    # and the test-suite only pay for what they use.
+    if name == "app":
+        application = create_app()
+        globals()["app"] = application
+        return application
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -17,6 +17,9 @@ class AuthMiddleware(BaseHTTPMiddleware):
             try:
                 payload = decode_jwt_token(token)
                 if payload.get("type") == "access":
+                    # 供 get_current_user 复用，避免同一请求重复验签
+                    request.state.access_token = token
+                    request.state.access_claims = payload
                     user_id = payload.get("sub")
                     if user_id:
                         request.state.user_id = int(user_id)
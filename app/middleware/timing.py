@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from time import perf_counter
+
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.metrics import HTTP_REQUEST_DURATION, reset_request_timings, start_request_timings
+from app.core.settings import get_settings
+
+
+class TimingMiddleware(BaseHTTPMiddleware):
+    """Record request latency histograms and expose per-request spans via Server-Timing."""
+
+    async def dispatch(self, request: Request, call_next):
+        timings, token = start_request_timings()
+        start = perf_counter()
+        status_code = 500
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+        finally:
+            elapsed = perf_counter() - start
+            reset_request_timings(token)
+            HTTP_REQUEST_DURATION.observe(
+                elapsed, request.method, _route_template(request), str(status_code)
+            )
+        if get_settings().server_timing_enabled:
+            response.headers["Server-Timing"] = timings.server_timing(elapsed)
+        return response
+
+
+def _route_template(request: Request) -> str:
+    """Label requests by route template, never the raw path, to keep cardinality bounded."""
+    # FastAPI stores the full mounted template (router prefix included): older
+    # releases on the route copied by include_router, newer ones, which include
+    # routers lazily, on the effective route context.
+    context = (request.scope.get("fastapi") or {}).get("effective_route_context")
+    template = getattr(context, "path", None) or getattr(request.scope.get("route"), "path", None)
+    return template or "unmatched"
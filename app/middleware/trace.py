@@ -3,6 +3,7 @@ from __future__ import annotations
 from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from app.core.querylog import finish_query_tracking, start_query_tracking
 from app.core.trace import bind_trace_id, get_trace_id, reset_trace_id
 
 
@@ -12,9 +13,12 @@ class TraceMiddleware(BaseHTTPMiddleware):
         token = bind_trace_id(incoming_trace)
         trace_id = get_trace_id()
         request.state.trace_id = trace_id
+        query_stats, query_token = start_query_tracking()
         try:
             response = await call_next(request)
         finally:
+            # Report while the trace id is still bound so warnings carry it.
+            finish_query_tracking(query_stats, query_token, f"{request.method} {request.url.path}")
             reset_trace_id(token)
         response.headers["X-Trace-Id"] = trace_id
         return response
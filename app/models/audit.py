@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, Index, String, BigInteger, func
+from sqlalchemy import DateTime, Index, Integer, String, BigInteger, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base
@@ -17,7 +17,7 @@ class AuditLog(Base):
         Index("idx_audit_log_created_at", "created_at"),
     )
 
-    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    id: Mapped[int] = mapped_column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
     trace_id: Mapped[str] = mapped_column(String(64), nullable=False)
     operator_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     operator_name: Mapped[str | None] = mapped_column(String(128), nullable=True)
@@ -22,9 +22,11 @@ class Department(TimestampMixin, Base):
     order: Mapped[int] = mapped_column(Integer, default=0)
 
     parent: Mapped["Department | None"] = relationship(
-        remote_side="Department.id", back_populates="children"
+        remote_side="Department.id", back_populates="children", lazy="raise"
     )
     children: Mapped[list["Department"]] = relationship(
-        back_populates="parent", cascade="all,delete-orphan"
+        back_populates="parent", cascade="all,delete-orphan", lazy="raise"
+    )
+    users: Mapped[list["User"]] = relationship(
+        "User", back_populates="department", lazy="raise", passive_deletes=True
     )
-    users: Mapped[list["User"]] = relationship("User", back_populates="department")
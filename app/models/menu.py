@@ -3,8 +3,8 @@ from __future__ import annotations
 from enum import Enum
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, Enum as SqlEnum, ForeignKey, Integer, String
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import Boolean, Enum as SqlEnum, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, backref, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin
 
@@ -45,10 +45,29 @@ class Menu(TimestampMixin, Base):
     no_tags_view: Mapped[bool] = mapped_column(Boolean, default=False)
     can_to: Mapped[bool] = mapped_column(Boolean, default=False)
 
-    parent: Mapped["Menu | None"] = relationship(remote_side="Menu.id", backref="children")
+    parent: Mapped["Menu | None"] = relationship(
+        remote_side="Menu.id",
+        backref=backref("children", lazy="raise", passive_deletes=True),
+        lazy="raise",
+    )
     permissions: Mapped[list["Permission"]] = relationship(
-        "Permission", back_populates="menu", cascade="all, delete-orphan"
+        "Permission", back_populates="menu", cascade="all, delete-orphan", lazy="raise"
     )
     roles: Mapped[list["Role"]] = relationship(
-        "Role", secondary="role_menus", back_populates="menus", lazy="selectin"
+        "Role", secondary="role_menus", back_populates="menus", lazy="raise", passive_deletes=True
+    )
+
+
+class MenuClosure(Base):
+    """One row per (ancestor, descendant) pair of the menu tree, including depth-0 self rows."""
+
+    __tablename__ = "menu_closure"
+    __table_args__ = (Index("idx_menu_closure_descendant", "descendant_id", "depth"),)
+
+    ancestor_id: Mapped[int] = mapped_column(
+        ForeignKey("menus.id", ondelete="CASCADE"), primary_key=True
+    )
+    descendant_id: Mapped[int] = mapped_column(
+        ForeignKey("menus.id", ondelete="CASCADE"), primary_key=True
     )
+    depth: Mapped[int] = mapped_column(Integer, default=0)
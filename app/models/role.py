@@ -2,11 +2,11 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, ForeignKey, String, UniqueConstraint
+from sqlalchemy import Boolean, Computed, ForeignKey, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin
-from app.models.types import jsonb
+from app.models.types import InternedString, jsonb
 from app.models.menu import Menu
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -22,32 +22,65 @@ class Role(TimestampMixin, Base):
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
 
     users: Mapped[list["User"]] = relationship(
-        "User", secondary="user_roles", back_populates="roles", lazy="selectin"
+        "User", secondary="user_roles", back_populates="roles", lazy="raise", passive_deletes=True
     )
     permissions: Mapped[list["Permission"]] = relationship(
-        "Permission", secondary="role_permissions", lazy="selectin", back_populates="roles"
+        "Permission",
+        secondary="role_permissions",
+        lazy="raise",
+        back_populates="roles",
+        passive_deletes=True,
     )
     menus: Mapped[list["Menu"]] = relationship(
-        "Menu", secondary="role_menus", lazy="selectin", back_populates="roles"
+        "Menu", secondary="role_menus", lazy="raise", back_populates="roles", passive_deletes=True
     )
 
 
+# 权限编码 namespace:resource:action 由数据库生成并存储；format_permission_code 为其 Python 等价实现
+PERMISSION_CODE_SQL = (
+    "CASE WHEN trim(namespace) = '*' AND trim(resource) = '*' AND trim(action) = '*' THEN '*.*.*' "
+    "WHEN trim(coalesce(namespace, '')) <> '' "
+    "THEN trim(namespace) || ':' || trim(resource) || ':' || trim(action) "
+    "ELSE trim(resource) || ':' || trim(action) END"
+)
+
+
+def format_permission_code(namespace: str | None, resource: str, action: str) -> str:
+    namespace = (namespace or "").strip()
+    resource = resource.strip()
+    action = action.strip()
+    if namespace == resource == action == "*":
+        return "*.*.*"
+    if namespace:
+        return f"{namespace}:{resource}:{action}"
+    return f"{resource}:{action}"
+
+
 class Permission(TimestampMixin, Base):
     __tablename__ = "permissions"
+    # 插入/更新时通过 RETURNING 取回生成的 code，避免异步会话中的惰性刷新
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(primary_key=True)
     namespace: Mapped[str] = mapped_column(String(128), index=True)
     resource: Mapped[str] = mapped_column(String(128))
     action: Mapped[str] = mapped_column(String(64))
+    code: Mapped[str] = mapped_column(
+        InternedString(330), Computed(PERMISSION_CODE_SQL, persisted=True), unique=True
+    )
     label: Mapped[str | None] = mapped_column(String(128))
     menu_id: Mapped[int | None] = mapped_column(ForeignKey("menus.id", ondelete="CASCADE"), nullable=True)
     effect: Mapped[str] = mapped_column(String(16), default="allow")
     condition: Mapped[dict | None] = mapped_column(jsonb)
 
     roles: Mapped[list["Role"]] = relationship(
-        "Role", secondary="role_permissions", lazy="selectin", back_populates="permissions"
+        "Role",
+        secondary="role_permissions",
+        lazy="raise",
+        back_populates="permissions",
+        passive_deletes=True,
     )
-    menu: Mapped["Menu | None"] = relationship("Menu", back_populates="permissions")
+    menu: Mapped["Menu | None"] = relationship("Menu", back_populates="permissions", lazy="raise")
 
 
 class RolePermission(Base):
@@ -1,5 +1,18 @@
-from sqlalchemy import JSON
+import sys
+
+from sqlalchemy import JSON, String
 from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.types import TypeDecorator
 
 jsonb = JSONB().with_variant(JSON(), "sqlite")
 
+
+class InternedString(TypeDecorator):
+    """String column whose loaded values are interned, so repeated codes share one object."""
+
+    impl = String
+    cache_ok = True
+
+    def process_result_value(self, value, dialect):
+        return sys.intern(value) if value is not None else None
+
@@ -32,10 +32,10 @@ class User(TimestampMixin, Base):
     )
 
     roles: Mapped[list["Role"]] = relationship(
-        "Role", secondary="user_roles", back_populates="users", lazy="selectin"
+        "Role", secondary="user_roles", back_populates="users", lazy="raise", passive_deletes=True
     )
     department: Mapped["Department | None"] = relationship(
-        "Department", back_populates="users", lazy="joined"
+        "Department", back_populates="users", lazy="raise"
     )
 
 
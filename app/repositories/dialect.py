@@ -0,0 +1,31 @@
+"""Dialect-specific statement pieces shared by the repositories.
+
+PostgreSQL is the production database; SQLite backs the test suite. Only the
+constructs whose spelling differs between the two live here.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import BigInteger, any_, cast
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def is_postgres(session: AsyncSession) -> bool:
+    return session.bind.dialect.name == "postgresql"
+
+
+def upsert(session: AsyncSession, target: Any):
+    """INSERT construct that supports ``on_conflict_do_nothing``/``on_conflict_do_update``."""
+    return pg_insert(target) if is_postgres(session) else sqlite_insert(target)
+
+
+def id_in(session: AsyncSession, column: Any, ids: list[int]):
+    # PostgreSQL 使用 = ANY(数组)，语句文本不随 ID 个数变化，可复用预编译语句
+    if is_postgres(session):
+        return column == any_(cast(ids, ARRAY(BigInteger)))
+    return column.in_(ids)
@@ -0,0 +1,39 @@
+"""Named loader-option profiles.
+
+Every relationship on the models defaults to ``lazy="raise"``: nothing is loaded
+unless a query asks for it, and touching an unloaded relationship fails loudly
+instead of issuing a hidden query. Repositories pick one of the profiles below
+for each read path so the statements a request issues are visible in one place.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.models.department import Department  # noqa: F401  (mappers configure when profiles are built)
+from app.models.menu import Menu
+from app.models.role import Role
+from app.models.user import User
+
+# Admin user tables: roles with their permissions plus the department column shown per row.
+USER_ADMIN_LIST = (
+    joinedload(User.roles).joinedload(Role.permissions),
+    joinedload(User.department),
+)
+
+# Single user being edited; its role collection is replaced on update.
+USER_MUTATION = (selectinload(User.roles),)
+
+# Role tables and role detail/edit: granted menus (with their actions) and permissions.
+ROLE_ADMIN_LIST = (
+    selectinload(Role.menus).selectinload(Menu.permissions),
+    selectinload(Role.permissions),
+)
+ROLE_DETAIL = ROLE_ADMIN_LIST
+
+# Menu trees: the tree is assembled from parent_id, so only actions are needed.
+MENU_TREE = (selectinload(Menu.permissions),)
+
+# Single menu shown or edited: its actions joined onto the one row; the parent
+# title and breadcrumb come from the closure table.
+MENU_DETAIL = (joinedload(Menu.permissions),)
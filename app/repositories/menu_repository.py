@@ -1,23 +1,46 @@
 from __future__ import annotations
 
 from collections import defaultdict
+from collections.abc import AsyncIterator
 from typing import Any, Literal
 
-from sqlalchemy import Select, delete, select, union_all
-from sqlalchemy.orm import aliased, selectinload
-
-from app.models.menu import Menu, MenuType
-from app.models.role import Permission, RoleMenu, RolePermission
+from sqlalchemy import (
+    Integer,
+    Select,
+    bindparam,
+    cast,
+    column,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    true,
+    union_all,
+    update,
+    values,
+)
+from sqlalchemy.orm import aliased
+
+from app.models.menu import Menu, MenuClosure, MenuType
+from app.models.role import Permission, RoleMenu, RolePermission, format_permission_code
 from app.core.logging import get_logger
+from app.repositories.dialect import is_postgres, upsert
+from app.repositories.loaders import MENU_DETAIL, MENU_TREE
 
 logger = get_logger(__name__)
 
+# 批量导入时每条 INSERT 的行数上限，避免超出 PostgreSQL 单语句 32767 个参数
+IMPORT_BATCH_ROWS = 500
+# rebuild_closure 使用的 PostgreSQL 事务级咨询锁编号
+MENU_CLOSURE_LOCK_KEY = 0x6D656E75
+
 class MenuRepository:
     def __init__(self, session):
         self.session = session
 
     def _base_query(self) -> Select[tuple[Menu]]:
-        return select(Menu).options(selectinload(Menu.permissions), selectinload(Menu.parent))
+        return select(Menu).options(*MENU_TREE)
 
     async def fetch_routes_for_roles(
         self, role_ids: list[int], include_all: bool
@@ -36,6 +59,12 @@ class MenuRepository:
             action_code_map = await self._get_role_action_map(role_ids)
         return self._build_route_tree(menus, mode="route", action_code_map=action_code_map)
 
+    async def fetch_detail_tree(self) -> list[dict[str, Any]]:
+        """Every menu in the detailed shape used by the role editor, with all actions."""
+        result = await self.session.execute(self._base_query())
+        menus = result.scalars().unique().all()
+        return self._build_route_tree(menus, mode="full")
+
     async def fetch_admin_tree(self) -> list[dict[str, Any]]:
         result = await self.session.execute(self._base_query())
         menus = result.scalars().unique().all()
@@ -58,53 +87,400 @@ class MenuRepository:
 
     async def get_menu(self, menu_id: int) -> Menu | None:
         result = await self.session.execute(
-            self._base_query().where(Menu.id == menu_id)
+            select(Menu)
+            .where(Menu.id == menu_id)
+            .options(*MENU_DETAIL)
+            .execution_options(populate_existing=True)
         )
-        return result.scalar_one_or_none()
+        return result.unique().scalar_one_or_none()
 
     async def create_menu(self, payload) -> Menu:
-        menu = Menu()
+        menu = Menu(permissions=[])
         self._assign_fields(menu, payload)
         self.session.add(menu)
         await self.session.flush()
+        await self._closure_attach([menu.id])
         self._sync_actions(menu, payload.permission_list)
         await self.session.commit()
-        await self.session.refresh(menu)
-        return menu
+        return await self.get_menu(menu.id)
 
     async def update_menu(self, menu: Menu, payload) -> Menu:
+        previous_parent = menu.parent_id
+        parent_id = payload.parent_id if payload.parent_id not in (0, "") else None
+        # 新父级位于自身子树内（含自身）即成环，一次主键查找即可判定
+        if parent_id not in (None, previous_parent) and await self._is_ancestor(menu.id, parent_id):
+            raise ValueError("MENU_CYCLE")
         self._assign_fields(menu, payload)
+        if menu.parent_id != previous_parent:
+            await self._closure_move(menu.id, menu.parent_id)
         self._sync_actions(menu, payload.permission_list)
         await self.session.commit()
-        await self.session.refresh(menu)
-        return menu
+        return await self.get_menu(menu.id)
 
-    async def delete_menu(self, menu: Menu, force: bool = False) -> None:
-        if force:
-            await self._delete_subtree(menu.id)
-            return
+    async def ancestors(self, menu_id: int) -> list[dict[str, Any]]:
+        """Ancestors of ``menu_id`` from the root down, excluding the menu itself."""
+        result = await self.session.execute(
+            select(Menu.id, Menu.name, Menu.title, Menu.path)
+            .join(MenuClosure, MenuClosure.ancestor_id == Menu.id)
+            .where(MenuClosure.descendant_id == menu_id, MenuClosure.depth > 0)
+            .order_by(MenuClosure.depth.desc())
+        )
+        return [dict(row) for row in result.mappings()]
 
-        child_exists = await self.session.scalar(
-            select(Menu.id).where(Menu.parent_id == menu.id).limit(1)
+    async def descendants(self, menu_id: int, max_depth: int | None = None) -> list[int]:
+        """Ids below ``menu_id``, nearest levels first; ``max_depth`` limits how far down."""
+        stmt = select(MenuClosure.descendant_id).where(
+            MenuClosure.ancestor_id == menu_id, MenuClosure.depth > 0
         )
-        if child_exists:
-            raise ValueError("MENU_HAS_CHILDREN")
-        await self.session.delete(menu)
-        await self.session.commit()
+        if max_depth is not None:
+            stmt = stmt.where(MenuClosure.depth <= max_depth)
+        result = await self.session.execute(
+            stmt.order_by(MenuClosure.depth, MenuClosure.descendant_id)
+        )
+        return list(result.scalars().all())
 
-    async def _delete_subtree(self, root_id: int) -> None:
-        menu_cte = select(Menu.id).where(Menu.id == root_id).cte(name="menu_tree", recursive=True)
-        menu_alias = aliased(Menu)
-        menu_cte = menu_cte.union_all(
-            select(menu_alias.id).where(menu_alias.parent_id == menu_cte.c.id)
+    async def iter_admin_tree(self) -> AsyncIterator[dict[str, Any]]:
+        """The ``fetch_admin_tree`` roots one at a time, each with its whole subtree.
+
+        Only the root ids are read up front; each subtree is loaded through the
+        closure table when it is reached, so a single subtree is in memory at
+        a time instead of the whole tree.
+        """
+        result = await self.session.execute(
+            select(Menu.id)
+            .where(Menu.parent_id.is_(None), Menu.type != MenuType.ACTION)
+            .order_by(Menu.order, Menu.id)
         )
-        stmt = select(menu_cte.c.id)
+        for root_id in result.scalars().all():
+            subtree = await self.fetch_subtree(root_id)
+            if subtree:
+                yield subtree[0]
+
+    async def fetch_subtree(self, menu_id: int, max_depth: int | None = None) -> list[dict[str, Any]]:
+        """``menu_id`` and the levels below it, in the admin tree shape."""
+        stmt = (
+            self._base_query()
+            .join(MenuClosure, MenuClosure.descendant_id == Menu.id)
+            .where(MenuClosure.ancestor_id == menu_id)
+        )
+        if max_depth is not None:
+            stmt = stmt.where(MenuClosure.depth <= max_depth)
         result = await self.session.execute(stmt)
-        ids = [row[0] for row in result]
-        if not ids:
+        menus = result.scalars().unique().all()
+        return self._build_route_tree(menus, mode="compact", root_id=menu_id)
+
+    async def rebuild_closure(self) -> None:
+        """Recompute ``menu_closure`` from ``parent_id`` in two statements.
+
+        For databases whose menus were written outside the application (seeding,
+        restores, tables created before the closure existed); every write path
+        in this repository keeps the table in step incrementally. On PostgreSQL
+        a transaction-scoped advisory lock keeps concurrent rebuilds from
+        interleaving their delete and insert.
+        """
+        if is_postgres(self.session):
+            await self.session.execute(select(func.pg_advisory_xact_lock(MENU_CLOSURE_LOCK_KEY)))
+        tree = select(
+            Menu.id.label("ancestor_id"), Menu.id.label("descendant_id"), literal(0).label("depth")
+        ).cte(name="menu_paths", recursive=True)
+        child = aliased(Menu)
+        tree = tree.union_all(
+            select(tree.c.ancestor_id, child.id, tree.c.depth + 1).where(
+                child.parent_id == tree.c.descendant_id
+            )
+        )
+        await self.session.execute(delete(MenuClosure))
+        await self.session.execute(
+            insert(MenuClosure).from_select(
+                ["ancestor_id", "descendant_id", "depth"],
+                select(tree.c.ancestor_id, tree.c.descendant_id, tree.c.depth),
+            )
+        )
+
+    async def _is_ancestor(self, ancestor_id: int, descendant_id: int) -> bool:
+        found = await self.session.scalar(
+            select(MenuClosure.depth).where(
+                MenuClosure.ancestor_id == ancestor_id, MenuClosure.descendant_id == descendant_id
+            )
+        )
+        return found is not None
+
+    async def _closure_attach(self, menu_ids: list[int]) -> None:
+        # 新菜单：自身一行，外加其父级（已在闭包表中）每个祖先各一行（深度 +1）
+        parent = select(MenuClosure.ancestor_id, Menu.id, MenuClosure.depth + 1).join(
+            Menu, MenuClosure.descendant_id == Menu.parent_id
+        )
+        rows = union_all(
+            select(Menu.id, Menu.id, literal(0)).where(Menu.id.in_(menu_ids)),
+            parent.where(Menu.id.in_(menu_ids)),
+        )
+        await self.session.execute(
+            insert(MenuClosure).from_select(["ancestor_id", "descendant_id", "depth"], rows)
+        )
+
+    async def _closure_move(self, menu_id: int, parent_id: int | None) -> None:
+        await self._closure_detach(menu_id)
+        await self._closure_link(menu_id, parent_id)
+
+    async def _closure_detach(self, menu_id: int) -> None:
+        # 断开子树与旧祖先之间的路径，子树内部的路径保持不变
+        subtree = select(MenuClosure.descendant_id).where(MenuClosure.ancestor_id == menu_id)
+        await self.session.execute(
+            delete(MenuClosure)
+            .where(
+                MenuClosure.descendant_id.in_(subtree),
+                MenuClosure.ancestor_id.not_in(subtree),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    async def _closure_link(self, menu_id: int, parent_id: int | None) -> None:
+        # 已断开的子树与新父级的全部祖先逐一连接
+        if parent_id is None:
             return
-        await self.session.execute(delete(Menu).where(Menu.id.in_(ids)))
+        above = aliased(MenuClosure)
+        below = aliased(MenuClosure)
+        await self.session.execute(
+            insert(MenuClosure).from_select(
+                ["ancestor_id", "descendant_id", "depth"],
+                select(above.ancestor_id, below.descendant_id, above.depth + below.depth + 1)
+                .join_from(above, below, true())
+                .where(above.descendant_id == parent_id, below.ancestor_id == menu_id),
+            )
+        )
+
+    async def _closure_reparent(self, moves: list[tuple[int, int | None]]) -> None:
+        """Apply ``(menu_id, new_parent_id)`` moves of an already validated, acyclic batch.
+
+        Every moved subtree is detached first and only then linked under its
+        new parent, so no link is made against a path that a later move in the
+        same batch removes.
+        """
+        for menu_id, _ in moves:
+            await self._closure_detach(menu_id)
+        for menu_id, parent_id in moves:
+            await self._closure_link(menu_id, parent_id)
+
+    async def delete_menus(self, menu_ids: list[int], force: bool = False) -> list[int]:
+        """Delete ``menu_ids`` in one transaction and return the ids actually removed.
+
+        With ``force`` every subtree goes in one delete driven by the closure
+        table (filled on existing databases by database/upgrades/002_menu_closure.sql
+        or ``scripts/menu_tree.py closure``). Otherwise one
+        lookup on ``parent_id`` checks that no listed menu keeps a child outside
+        the set (raising MENU_HAS_CHILDREN) before the delete. Actions, role
+        grants and closure rows follow through ON DELETE CASCADE.
+        """
+        ids = sorted({int(menu_id) for menu_id in menu_ids})
+        if not ids:
+            return []
+        if force:
+            targets = Menu.id.in_(
+                select(MenuClosure.descendant_id).where(MenuClosure.ancestor_id.in_(ids))
+            )
+        else:
+            orphaned = await self.session.scalar(
+                select(Menu.id).where(Menu.parent_id.in_(ids), Menu.id.not_in(ids)).limit(1)
+            )
+            if orphaned:
+                raise ValueError("MENU_HAS_CHILDREN")
+            targets = Menu.id.in_(ids)
+        result = await self.session.execute(
+            delete(Menu)
+            .where(targets)
+            .returning(Menu.id)
+            .execution_options(synchronize_session=False)
+        )
+        deleted = sorted(result.scalars().all())
+        await self.session.commit()
+        return deleted
+
+    async def reorder_menus(self, moves: list[tuple[int, int | None, int]]) -> int:
+        """Apply ``(id, parent_id, order)`` moves in one UPDATE and return the row count.
+
+        The resulting tree is checked in memory first: unknown ids or parents
+        raise MENU_NOT_FOUND / MENU_PARENT_NOT_FOUND, a menu listed twice raises
+        MENU_DUPLICATE_ID and any move that would make a menu its own ancestor
+        raises MENU_CYCLE. Moves are validated together because one batch may
+        swap parents; the closure table is then updated for the menus whose
+        parent changed.
+        """
+        result = await self.session.execute(select(Menu.id, Menu.parent_id))
+        parents: dict[int, int | None] = dict(result.all())
+        reparented = [
+            (menu_id, parent_id)
+            for menu_id, parent_id, _ in moves
+            if menu_id in parents and parents[menu_id] != parent_id
+        ]
+        moved: set[int] = set()
+        for menu_id, parent_id, _ in moves:
+            if menu_id in moved:
+                raise ValueError("MENU_DUPLICATE_ID")
+            if menu_id not in parents:
+                raise ValueError("MENU_NOT_FOUND")
+            if parent_id is not None and parent_id not in parents:
+                raise ValueError("MENU_PARENT_NOT_FOUND")
+            moved.add(menu_id)
+            parents[menu_id] = parent_id
+        for menu_id in moved:
+            seen = {menu_id}
+            parent_id = parents[menu_id]
+            while parent_id is not None:
+                if parent_id in seen:
+                    raise ValueError("MENU_CYCLE")
+                seen.add(parent_id)
+                parent_id = parents[parent_id]
+
+        if is_postgres(self.session):
+            rows = values(
+                column("id", Integer), column("parent_id", Integer), column("order", Integer), name="moves"
+            ).data([(menu_id, parent_id, order) for menu_id, parent_id, order in moves])
+            # 全部移动在一条 UPDATE ... FROM (VALUES ...) 中完成；全为 NULL 的列需显式转换类型
+            result = await self.session.execute(
+                update(Menu)
+                .where(Menu.id == rows.c.id)
+                .values(parent_id=cast(rows.c.parent_id, Integer), order=rows.c.order)
+                .execution_options(synchronize_session=False)
+            )
+            updated = result.rowcount
+        else:
+            # SQLite 不支持带列名的 VALUES 别名，退化为一次 executemany
+            await self.session.execute(
+                update(Menu.__table__)
+                .where(Menu.__table__.c.id == bindparam("menu_id"))
+                .values(parent_id=bindparam("new_parent_id"), order=bindparam("new_order")),
+                [
+                    {"menu_id": menu_id, "new_parent_id": parent_id, "new_order": order}
+                    for menu_id, parent_id, order in moves
+                ],
+            )
+            updated = len(moves)
+        await self._closure_reparent(reparented)
         await self.session.commit()
+        return updated
+
+    async def import_tree(self, nodes: list[dict[str, Any]]) -> dict[str, int]:
+        """Upsert a menu tree in the shape ``fetch_admin_tree`` emits, matched by ``name``.
+
+        Parents are written before their children, one INSERT ... ON CONFLICT
+        (name) DO UPDATE per tree level, so every parent id is known when its
+        children go in. Actions are then upserted on their generated code.
+        Existing menus and actions missing from the payload are left alone.
+        New menus are added to the closure table level by level and existing
+        menus whose parent changed are moved; everything commits in one
+        transaction.
+        """
+        levels: list[list[tuple[dict[str, Any], str | None, int]]] = []
+        seen: set[str] = set()
+        pending = [(node, None, index) for index, node in enumerate(nodes, start=1)]
+        while pending:
+            levels.append(pending)
+            next_level = []
+            for node, _, _ in pending:
+                name = (node.get("name") or "").strip()
+                if not name:
+                    raise ValueError("MENU_NAME_REQUIRED")
+                if name in seen:
+                    raise ValueError("MENU_DUPLICATE_NAME")
+                seen.add(name)
+                next_level.extend(
+                    (child, name, index) for index, child in enumerate(node.get("children") or [], start=1)
+                )
+            pending = next_level
+
+        existing_parents: dict[str, int | None] = dict(
+            (await self.session.execute(select(Menu.name, Menu.parent_id))).all()
+        )
+        ids_by_name: dict[str, int] = {}
+        action_rows: dict[str, dict[str, Any]] = {}
+        for level in levels:
+            rows = [
+                self._import_row(node, ids_by_name[parent] if parent else None, position)
+                for node, parent, position in level
+            ]
+            for start in range(0, len(rows), IMPORT_BATCH_ROWS):
+                batch = rows[start : start + IMPORT_BATCH_ROWS]
+                stmt = upsert(self.session, Menu.__table__).values(batch)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["name"],
+                    set_={
+                        **{key: stmt.excluded[key] for key in rows[0] if key != "name"},
+                        "updated_at": func.now(),
+                    },
+                ).returning(Menu.__table__.c.id, Menu.__table__.c.name)
+                ids_by_name.update({name: menu_id for menu_id, name in await self.session.execute(stmt)})
+            for node, _, _ in level:
+                menu_id = ids_by_name[node["name"].strip()]
+                for item in node.get("permissionList") or []:
+                    namespace, resource, action = self._parse_permission_value(item.get("value") or "")
+                    action_rows[format_permission_code(namespace, resource, action)] = {
+                        "namespace": namespace,
+                        "resource": resource,
+                        "action": action,
+                        "label": item.get("label"),
+                        "menu_id": menu_id,
+                        "effect": "allow",
+                    }
+
+        actions = list(action_rows.values())
+        for start in range(0, len(actions), IMPORT_BATCH_ROWS):
+            batch = actions[start : start + IMPORT_BATCH_ROWS]
+            stmt = upsert(self.session, Permission.__table__).values(batch)
+            await self.session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=["code"],
+                    set_={
+                        "label": stmt.excluded.label,
+                        "menu_id": stmt.excluded.menu_id,
+                        "updated_at": func.now(),
+                    },
+                )
+            )
+        # 载荷自身是一棵树，父级只会是载荷内菜单或根，因此不会成环
+        reparented: list[tuple[int, int | None]] = []
+        for level in levels:
+            created: list[int] = []
+            for node, parent, _ in level:
+                name = node["name"].strip()
+                parent_id = ids_by_name[parent] if parent else None
+                if name not in existing_parents:
+                    created.append(ids_by_name[name])
+                elif existing_parents[name] != parent_id:
+                    reparented.append((ids_by_name[name], parent_id))
+            # 按层写入：新菜单的父级在上一层已进入闭包表
+            for start in range(0, len(created), IMPORT_BATCH_ROWS):
+                await self._closure_attach(created[start : start + IMPORT_BATCH_ROWS])
+        await self._closure_reparent(reparented)
+        await self.session.commit()
+        return {"menus": len(ids_by_name), "actions": len(actions)}
+
+    @staticmethod
+    def _import_row(node: dict[str, Any], parent_id: int | None, position: int) -> dict[str, Any]:
+        meta = node.get("meta") or {}
+        title = node.get("title") or meta.get("title") or node["name"]
+        path = node.get("path") or ""
+        return {
+            "name": node["name"].strip(),
+            "parent_id": parent_id,
+            "title": title,
+            "title_i18n": meta.get("titleKey") or title,
+            "path": path,
+            "component": node.get("component") or "#",
+            "redirect": node.get("redirect") or None,
+            "order": node["order"] if node.get("order") is not None else position,
+            "icon": meta.get("icon"),
+            "type": MenuType.DIRECTORY if node.get("type", 0) == 0 else MenuType.ROUTE,
+            "is_external": str(path).startswith("http"),
+            "always_show": bool(meta.get("alwaysShow")),
+            "keep_alive": not bool(meta.get("noCache")),
+            "affix": bool(meta.get("affix")),
+            "hidden": bool(meta.get("hidden")),
+            "enabled": bool(node.get("status", 1)),
+            "active_menu": meta.get("activeMenu") or None,
+            "show_breadcrumb": meta.get("breadcrumb", True),
+            "no_tags_view": bool(meta.get("noTagsView")),
+            "can_to": bool(meta.get("canTo")),
+        }
 
     async def add_action(self, menu: Menu, label: str, value: str) -> Permission:
         namespace, resource, action_value = self._parse_permission_value(value)
@@ -179,28 +555,6 @@ class MenuRepository:
             return "system", parts[0], parts[1]
         raise ValueError("INVALID_PERMISSION_VALUE")
 
-    @staticmethod
-    def _permission_code(permission: Permission) -> str:
-        namespace = (permission.namespace or "").strip()
-        resource = permission.resource.strip()
-        action = permission.action.strip()
-        if namespace == resource == action == "*":
-            return "*.*.*"
-        if namespace:
-            return f"{namespace}:{resource}:{action}"
-        return f"{resource}:{action}"
-
-    @staticmethod
-    def _permission_code_from_parts(namespace: str | None, resource: str, action: str) -> str:
-        namespace = (namespace or "").strip()
-        resource = resource.strip()
-        action = action.strip()
-        if namespace == resource == action == "*":
-            return "*.*.*"
-        if namespace:
-            return f"{namespace}:{resource}:{action}"
-        return f"{resource}:{action}"
-
     def _sync_actions(self, menu: Menu, permissions: list) -> None:
         existing = {perm.id: perm for perm in menu.permissions}
         next_permissions: list[Permission] = []
@@ -234,12 +588,15 @@ class MenuRepository:
             self.session.delete(permission)
         menu.permissions = next_permissions
 
-    def serialize_menu(self, menu: Menu) -> dict[str, Any]:
-        parent_title = menu.parent.title if menu.parent else None
-        return self._menu_dict(menu, parent_title=parent_title)
+    async def serialize_menu(self, menu: Menu) -> dict[str, Any]:
+        breadcrumb = await self.ancestors(menu.id)
+        parent_title = breadcrumb[-1]["title"] if breadcrumb else None
+        data = self._menu_dict(menu, parent_title=parent_title)
+        data["breadcrumb"] = breadcrumb
+        return data
 
     def _menu_dict(self, menu: Menu, parent_title: str | None = None) -> dict[str, Any]:
-        permission_codes = [self._permission_code(permission) for permission in menu.permissions]
+        permission_codes = [permission.code for permission in menu.permissions]
         permission_ids = [permission.id for permission in menu.permissions]
         meta = {
             "title": menu.title,
@@ -257,7 +614,7 @@ class MenuRepository:
             "permissionIds": permission_ids,
         }
         permission_list = [
-            {"id": permission.id, "label": permission.label, "value": self._permission_code(permission)}
+            {"id": permission.id, "label": permission.label, "value": permission.code}
             for permission in menu.permissions
         ]
         data = {
@@ -291,23 +648,16 @@ class MenuRepository:
         if not role_ids:
             return None
         stmt = (
-            select(
-                RolePermission.role_id,
-                Permission.menu_id,
-                Permission.namespace,
-                Permission.resource,
-                Permission.action,
-            )
+            select(RolePermission.role_id, Permission.menu_id, Permission.code)
             .join(Permission, Permission.id == RolePermission.permission_id)
             .where(RolePermission.role_id.in_(role_ids))
             .where(Permission.menu_id.is_not(None))
         )
         result = await self.session.execute(stmt)
         action_map: dict[int, set[str]] = defaultdict(set)
-        for _, menu_id, namespace, resource, action in result:
+        for _, menu_id, code in result:
             if menu_id is None:
                 continue
-            code = self._permission_code_from_parts(namespace, resource, action)
             action_map[int(menu_id)].add(code)
         return action_map or None
 
@@ -317,6 +667,7 @@ class MenuRepository:
         mode: Literal["full", "route", "compact"],
         action_code_map: dict[int, set[str]] | None = None,
         action_id_map: dict[int, set[int]] | None = None,
+        root_id: int | None = None,
     ) -> list[dict[str, Any]]:
         if not menus:
             return []
@@ -342,7 +693,7 @@ class MenuRepository:
             if action_id_map is not None:
                 allowed_ids = action_id_map.get(menu.id)
             permission_entries = [
-                (permission, self._permission_code(permission)) for permission in menu.permissions
+                (permission, permission.code) for permission in menu.permissions
             ]
             if allowed_codes is None:
                 permission_codes = [code for _, code in permission_entries]
@@ -434,5 +785,8 @@ class MenuRepository:
             route_node["children"] = children
             return route_node
 
-        roots = children_map.get(None, [])
+        if root_id is not None:
+            roots = [node_map[root_id]] if root_id in node_map else []
+        else:
+            roots = children_map.get(None, [])
         return [build(menu) for menu in roots]
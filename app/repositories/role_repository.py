@@ -1,13 +1,16 @@
+from collections import defaultdict
 from collections.abc import Sequence
 
-from sqlalchemy import func, or_, select
+from sqlalchemy import delete, func, literal, or_, select, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
+from app.core.permission_matrix import PermissionEntry, PermissionMatrix
 from app.core.settings import get_settings
 from app.models.menu import Menu
-from app.models.role import Permission, Role
+from app.models.role import Permission, Role, RoleMenu, RolePermission
 from app.models.user import UserRole
+from app.repositories.dialect import id_in, upsert
+from app.repositories.loaders import ROLE_ADMIN_LIST, ROLE_DETAIL
 from app.schemas.role import RoleCreate, RoleUpdate
 
 
@@ -16,20 +19,51 @@ class RoleRepository:
         self.session = session
         self.settings = get_settings()
 
-    def _base_query(self):
-        return select(Role).options(
-            selectinload(Role.menus).selectinload(Menu.permissions),
-            selectinload(Role.permissions),
-            selectinload(Role.users),
-        )
-
     async def list_roles_with_menus(self) -> Sequence[Role]:
-        stmt = self._base_query().order_by(Role.id)
+        stmt = select(Role).options(*ROLE_ADMIN_LIST).order_by(Role.id)
         result = await self.session.execute(stmt)
         return result.scalars().unique().all()
 
+    async def list_roles(self) -> Sequence[Role]:
+        result = await self.session.execute(select(Role).order_by(Role.id))
+        return result.scalars().all()
+
+    async def list_grants(self) -> tuple[dict[int, list[int]], dict[int, list[int]]]:
+        """Granted menu ids and permission ids per role, read straight from the link tables."""
+        menu_ids: dict[int, list[int]] = defaultdict(list)
+        permission_ids: dict[int, list[int]] = defaultdict(list)
+        grants = union_all(
+            select(RoleMenu.role_id, literal(0).label("kind"), RoleMenu.menu_id.label("target_id")),
+            select(RolePermission.role_id, literal(1), RolePermission.permission_id),
+        ).subquery()
+        result = await self.session.execute(
+            select(grants.c.role_id, grants.c.kind, grants.c.target_id).order_by(
+                grants.c.role_id, grants.c.kind, grants.c.target_id
+            )
+        )
+        for role_id, kind, target_id in result:
+            (permission_ids if kind else menu_ids)[role_id].append(target_id)
+        return menu_ids, permission_ids
+
+    async def load_permission_matrix(self) -> PermissionMatrix:
+        permissions = await self.session.execute(
+            select(Permission.id, Permission.code, Permission.label, Permission.menu_id)
+        )
+        grants = await self.session.execute(
+            select(RolePermission.role_id, RolePermission.permission_id)
+        )
+        return PermissionMatrix(
+            (PermissionEntry(*row) for row in permissions),
+            ((role_id, permission_id) for role_id, permission_id in grants),
+        )
+
     async def get_role(self, role_id: int) -> Role | None:
-        stmt = self._base_query().where(Role.id == role_id)
+        stmt = (
+            select(Role)
+            .where(Role.id == role_id)
+            .options(*ROLE_DETAIL)
+            .execution_options(populate_existing=True)
+        )
         result = await self.session.execute(stmt)
         return result.scalars().unique().first()
 
@@ -42,11 +76,10 @@ class RoleRepository:
             name=payload.role_name,
             description=payload.remark,
             is_active=bool(payload.status),
-            menus=[],
         )
         self.session.add(role)
         await self.session.flush()
-        await self._assign_menus(role, payload.menu_ids, replace=True)
+        await self._assign_menus(role, payload.menu_ids)
         await self._assign_permissions(role, payload.permission_ids)
         await self.session.commit()
         return await self.get_role(role.id)
@@ -61,7 +94,7 @@ class RoleRepository:
         role.name = payload.role_name
         role.description = payload.remark
         role.is_active = bool(payload.status)
-        await self._assign_menus(role, payload.menu_ids, replace=True)
+        await self._assign_menus(role, payload.menu_ids)
         await self._assign_permissions(role, payload.permission_ids)
         await self.session.commit()
         return await self.get_role(role.id)
@@ -77,29 +110,39 @@ class RoleRepository:
         await self.session.delete(role)
         await self.session.commit()
 
-    async def _assign_menus(self, role: Role, menu_ids: list[int], replace: bool = False) -> None:
-        if replace:
-            role.menus = []
-        if menu_ids:
-            result = await self.session.execute(
-                select(Menu)
-                .where(Menu.id.in_(menu_ids))
-                .options(selectinload(Menu.permissions))
-            )
-            menus = result.scalars().unique().all()
-            role.menus.extend(menus)
+    async def _assign_menus(self, role: Role, menu_ids: list[int]) -> None:
+        await self._sync_links(RoleMenu.menu_id, Menu.id, role.id, menu_ids)
 
     async def _assign_permissions(self, role: Role, permission_ids: list[int] | None) -> None:
         if permission_ids is None:
             return
-        if not permission_ids:
-            role.permissions = []
-            return
-        result = await self.session.execute(
-            select(Permission).where(Permission.id.in_(permission_ids))
+        await self._sync_links(RolePermission.permission_id, Permission.id, role.id, permission_ids)
+
+    async def _sync_links(self, link_column, target_id, role_id: int, wanted: list[int]) -> None:
+        """Bring one role's rows in a link table to ``wanted`` by touching only the difference.
+
+        Ids that do not exist in the target table are skipped, as the entity
+        based assignment used to do. No ORM entities are loaded.
+        """
+        link = link_column.class_
+        current = set(
+            (await self.session.scalars(select(link_column).where(link.role_id == role_id))).all()
         )
-        permissions = result.scalars().unique().all()
-        role.permissions = permissions
+        wanted_ids = {int(item) for item in wanted or []}
+        removed = sorted(current - wanted_ids)
+        added = sorted(wanted_ids - current)
+        if removed:
+            await self.session.execute(
+                delete(link).where(link.role_id == role_id, id_in(self.session, link_column, removed))
+            )
+        if added:
+            stmt = upsert(self.session, link).from_select(
+                ["role_id", link_column.key],
+                select(literal(role_id), target_id).where(id_in(self.session, target_id, added)),
+            )
+            await self.session.execute(
+                stmt.on_conflict_do_nothing(index_elements=["role_id", link_column.key])
+            )
 
     async def _ensure_unique(self, *, code: str, name: str, exclude_id: int | None = None) -> None:
         stmt = select(Role.id).where(or_(Role.code == code, Role.name == name))
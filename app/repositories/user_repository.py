@@ -1,13 +1,16 @@
 from collections.abc import Sequence
+from datetime import datetime
 
-from sqlalchemy import delete, func, select
+from sqlalchemy import JSON, delete, distinct, func, select, type_coerce, update
+from sqlalchemy.engine import RowMapping
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload, selectinload
 
 from app.core.security import hash_password
 from app.core.settings import get_settings
-from app.models.role import Permission, Role
-from app.models.user import User
+from app.models.role import Permission, Role, RolePermission
+from app.models.user import User, UserRole
+from app.repositories.dialect import is_postgres
+from app.repositories.loaders import USER_ADMIN_LIST, USER_MUTATION
 from app.schemas.user import UserCreatePayload, UserUpdatePayload
 
 
@@ -16,20 +19,66 @@ class UserRepository:
         self.session = session
         self.settings = get_settings()
 
-    async def get_by_username(self, username: str) -> User | None:
-        stmt = (
-            select(User)
-            .where(User.username == username)
-            .options(joinedload(User.roles).joinedload(Role.permissions))
+    async def fetch_principal(
+        self, *, user_id: int | None = None, username: str | None = None
+    ) -> RowMapping | None:
+        """Columns, roles and permission codes of one user in a single statement.
+
+        Returns plain rows rather than ORM entities. ``roles`` is a list of
+        ``{"id", "code", "name"}`` objects, ``permissions`` the de-duplicated
+        permission codes; neither is ordered.
+        """
+        postgres = is_postgres(self.session)
+        role_object = (func.json_build_object if postgres else func.json_object)(
+            "id", Role.id, "code", Role.code, "name", Role.name
+        )
+        if postgres:
+            roles_agg = func.json_agg(role_object)
+            permissions_agg = func.array_agg(distinct(Permission.code))
+        else:
+            roles_agg = func.json_group_array(role_object)
+            permissions_agg = type_coerce(func.json_group_array(distinct(Permission.code)), JSON)
+        roles = (
+            select(type_coerce(roles_agg, JSON))
+            .select_from(UserRole)
+            .join(Role, Role.id == UserRole.role_id)
+            .where(UserRole.user_id == User.id)
+            .scalar_subquery()
+        )
+        permissions = (
+            select(permissions_agg)
+            .select_from(UserRole)
+            .join(RolePermission, RolePermission.role_id == UserRole.role_id)
+            .join(Permission, Permission.id == RolePermission.permission_id)
+            .where(UserRole.user_id == User.id)
+            .scalar_subquery()
         )
+        stmt = select(
+            User.id,
+            User.username,
+            User.email,
+            User.full_name,
+            User.password_hash,
+            User.is_active,
+            User.is_superuser,
+            User.locked_until,
+            User.attributes,
+            roles.label("roles"),
+            permissions.label("permissions"),
+        )
+        if user_id is not None:
+            stmt = stmt.where(User.id == user_id)
+        else:
+            stmt = stmt.where(User.username == username)
         result = await self.session.execute(stmt)
-        return result.scalars().unique().first()
+        return result.mappings().first()
 
-    async def get_by_id(self, user_id: int) -> User | None:
+    async def get_for_update(self, user_id: int) -> User | None:
         stmt = (
             select(User)
             .where(User.id == user_id)
-            .options(joinedload(User.roles).joinedload(Role.permissions))
+            .options(*USER_MUTATION)
+            .execution_options(populate_existing=True)
         )
         result = await self.session.execute(stmt)
         return result.scalars().unique().first()
@@ -37,10 +86,7 @@ class UserRepository:
     async def list_users(self) -> Sequence[User]:
         stmt = (
             select(User)
-            .options(
-                joinedload(User.roles).joinedload(Role.permissions),
-                selectinload(User.department),
-            )
+            .options(*USER_ADMIN_LIST)
             .order_by(User.id)
         )
         stmt = stmt.where(User.username != self.settings.super_admin_username)
@@ -52,10 +98,7 @@ class UserRepository:
     ) -> tuple[list[User], int]:
         stmt = (
             select(User)
-            .options(
-                joinedload(User.roles).joinedload(Role.permissions),
-                selectinload(User.department),
-            )
+            .options(*USER_ADMIN_LIST)
             .order_by(User.id)
         )
         count_stmt = select(func.count()).select_from(User)
@@ -90,7 +133,7 @@ class UserRepository:
             roles = result.scalars().unique().all()
             user.roles.extend(roles)
         await self.session.commit()
-        return await self.get_by_id(user.id)
+        return await self.get_for_update(user.id)
 
     async def update_user(self, user: User, payload: UserUpdatePayload) -> User:
         if user.username == self.settings.super_admin_username:
@@ -116,7 +159,13 @@ class UserRepository:
             user.roles = []
 
         await self.session.commit()
-        return await self.get_by_id(user.id)
+        return await self.get_for_update(user.id)
+
+    async def set_locked_until(self, user_id: int, locked_until: datetime | None) -> None:
+        await self.session.execute(
+            update(User).where(User.id == user_id).values(locked_until=locked_until)
+        )
+        await self.session.commit()
 
     async def delete_users(self, user_ids: list[int]) -> int:
         if not user_ids:
@@ -6,7 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.agents.identity import AuthenticatedUser
 from app.core.auth import get_current_user, permission_guard
-from app.core.database import get_db
+from app.core.database import get_read_db
 from app.core.responses import success_response
 from app.models.audit import AuditLog
 from app.schemas.audit import AuditLogListResponse, AuditLogQuery, AuditLogRead
@@ -26,7 +26,7 @@ async def list_audit_logs(
     end_time: datetime | None = Query(default=None),
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: AuthenticatedUser = Depends(get_current_user),
 ) -> dict:
     """查询审计日志列表"""
@@ -80,7 +80,7 @@ async def list_audit_logs(
 )
 async def get_audit_log(
     log_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: AuthenticatedUser = Depends(get_current_user),
 ) -> dict:
     """获取单个审计日志详情"""
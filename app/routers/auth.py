@@ -1,35 +1,42 @@
+from functools import lru_cache
+
 from fastapi import APIRouter, Depends, Header, HTTPException, Request
 from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.agents.audit import get_audit_agent
-from app.agents.identity import IdentityAgent
+from app.agents.identity import AuthenticatedUser, get_identity_agent
 from app.agents.orchestrator import AuthOrchestrator
 from app.agents.ratelimit import RateLimitAgent
-from app.agents.rbac import RBACAgent
-from app.agents.session import SessionAgent
+from app.agents.rbac import get_rbac_agent
+from app.agents.session import SessionAgent, get_session_agent
 from app.agents.token import TokenAgent
 from app.core.audit_actions import AuditAction
+from app.core.auth import get_current_user
 from app.core.database import get_db
 from app.core.redis import get_redis
 from app.core.responses import success_response
 from app.core.security import decode_jwt_token
-from app.schemas.auth import LoginRequest, LoginResponse, LogoutRequest, RefreshRequest
-
-router = APIRouter()
-
-_orchestrator = AuthOrchestrator(
-    identity_agent=IdentityAgent(),
-    token_agent=TokenAgent(),
-    rbac_agent=RBACAgent(),
-    session_agent=SessionAgent(),
-    audit_agent=get_audit_agent(),
-    rate_limit_agent=RateLimitAgent(),
+from app.schemas.auth import (
+    LoginRequest,
+    LoginResponse,
+    LogoutRequest,
+    RefreshRequest,
+    SessionRevokeRequest,
 )
 
+router = APIRouter()
 
+@lru_cache
 def get_orchestrator() -> AuthOrchestrator:
-    return _orchestrator
+    return AuthOrchestrator(
+        identity_agent=get_identity_agent(),
+        token_agent=TokenAgent(),
+        rbac_agent=get_rbac_agent(),
+        session_agent=get_session_agent(),
+        audit_agent=get_audit_agent(),
+        rate_limit_agent=RateLimitAgent(),
+    )
 
 
 @router.post("/login")
@@ -70,19 +77,80 @@ async def refresh(
 
 @router.post("/logout")
 async def logout(
-    _: LogoutRequest,
+    payload: LogoutRequest,
     request: Request,
     authorization: str | None = Header(default=None),
     orchestrator: AuthOrchestrator = Depends(get_orchestrator),
     db: AsyncSession = Depends(get_db),
     redis: Redis = Depends(get_redis),
 ) -> dict:
-    sub = None
+    claims: dict = {}
     if authorization and authorization.lower().startswith("bearer "):
-        token = authorization.split(" ", 1)[1]
-        try:
-            sub = decode_jwt_token(token).get("sub")
-        except ValueError:
-            sub = None
-    result = await orchestrator.logout(db, redis, sub, request=request)
+        claims = _safe_decode(authorization.split(" ", 1)[1])
+    sub, sid = claims.get("sub"), claims.get("sid")
+    access_jti = claims.get("jti") if claims.get("type") == "access" else None
+    if not sid and payload.refresh_token:
+        # access token 已过期时，仍可通过 refresh token 定位会话
+        refresh_claims = _safe_decode(payload.refresh_token)
+        if refresh_claims.get("type") == "refresh":
+            sub, sid = sub or refresh_claims.get("sub"), refresh_claims.get("sid")
+    result = await orchestrator.logout(
+        db,
+        redis,
+        sub,
+        request=request,
+        sid=sid,
+        access_jti=access_jti,
+        access_exp=claims.get("exp") if access_jti else None,
+    )
     return success_response(result)
+
+
+@router.get("/sessions")
+async def list_sessions(
+    authorization: str | None = Header(default=None),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    session_agent: SessionAgent = Depends(get_session_agent),
+    redis: Redis = Depends(get_redis),
+) -> dict:
+    """当前用户的在线会话列表"""
+    current_sid = None
+    if authorization and authorization.lower().startswith("bearer "):
+        current_sid = _safe_decode(authorization.split(" ", 1)[1]).get("sid")
+    sessions = await session_agent.list_sessions(redis, current_user.id)
+    for item in sessions:
+        item["current"] = item["sid"] == current_sid
+    return success_response(sessions)
+
+
+@router.post("/sessions/revoke")
+async def revoke_session(
+    payload: SessionRevokeRequest,
+    request: Request,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    session_agent: SessionAgent = Depends(get_session_agent),
+    redis: Redis = Depends(get_redis),
+) -> dict:
+    """注销当前用户的指定会话；未指定 sid 时注销全部会话"""
+    if payload.sid:
+        removed = await session_agent.invalidate_session(redis, payload.sid, user_id=current_user.id)
+        revoked = [payload.sid] if removed else []
+    else:
+        revoked = await session_agent.invalidate_all_sessions(redis, current_user.id)
+    await get_audit_agent().log_event(
+        action=AuditAction.AUTH_SESSION_REVOKE,
+        resource_type="SESSION",
+        resource_id=payload.sid or "*",
+        operator_id=current_user.id,
+        operator_name=current_user.username,
+        after_state={"revoked": revoked},
+        request=request,
+    )
+    return success_response({"revoked": revoked})
+
+
+def _safe_decode(token: str) -> dict:
+    try:
+        return decode_jwt_token(token)
+    except ValueError:
+        return {}
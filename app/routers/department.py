@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth import permission_guard
-from app.core.database import get_db
+from app.core.database import get_read_db
 from app.core.responses import success_response
 from app.repositories.department_repository import DepartmentRepository
 from app.repositories.user_repository import UserRepository
@@ -23,7 +23,7 @@ async def _department_tree_payload(db: AsyncSession) -> dict:
 
 @router.get("/list", dependencies=[permission_guard("department", "list")])
 async def list_departments(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> dict:
     return await _department_tree_payload(db)
 
@@ -40,7 +40,7 @@ async def _department_table_payload(
 async def department_table_list(
     pageIndex: int = Query(1, ge=1),
     pageSize: int = Query(10, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> dict:
     return await _department_table_payload(pageIndex, pageSize, db)
 
@@ -78,6 +78,6 @@ async def department_users(
     id: str | None = Query(default=None, description="Department ID"),
     pageIndex: int = Query(1, ge=1),
     pageSize: int = Query(10, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> dict:
     return await _department_users_payload(id, pageIndex, pageSize, db)
@@ -0,0 +1,24 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.core.responses import success_response
+from app.core.warmup import get_warmup_state
+
+router = APIRouter()
+
+
+@router.get("/live", response_model=dict)
+async def liveness() -> dict:
+    return success_response({"status": "alive"})
+
+
+@router.get("/ready", response_model=dict)
+async def readiness() -> JSONResponse:
+    """就绪探针：预热全部成功后返回 200；失败的步骤会在后台退避重试"""
+    state = get_warmup_state()
+    if state.ready:
+        return JSONResponse(status_code=200, content=success_response(state.as_dict()))
+    return JSONResponse(
+        status_code=503,
+        content={"code": 503, "message": "Service warming up", "data": state.as_dict()},
+    )
@@ -1,23 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import json
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.agents.identity import AuthenticatedUser
-from app.agents.rbac import RBACAgent
+from app.agents.rbac import get_rbac_agent
 from app.core.auth import permission_guard, require_authenticated_user
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.core.errors import raise_error
 from app.core.responses import success_response
+from app.models.role import format_permission_code
 from app.repositories.menu_repository import MenuRepository
 from app.schemas.menu import (
     MenuCreate,
     MenuDeletePayload,
+    MenuReorderPayload,
     MenuEditPayload,
     MenuPermissionPayload,
     MenuUpdate,
 )
 
 router = APIRouter()
-_rbac_agent = RBACAgent()
 
 async def _menu_list_payload(db: AsyncSession) -> dict:
     menu_repo = MenuRepository(db)
@@ -27,24 +32,62 @@ async def _menu_list_payload(db: AsyncSession) -> dict:
 
 @router.get("/list", dependencies=[permission_guard("menu", "list")])
 async def list_menus_alias(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> dict:
     return await _menu_list_payload(db)
 
 
 @router.get("/routes")
 async def get_menu_routes(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: AuthenticatedUser = Depends(require_authenticated_user),
 ) -> dict:
     menu_repo = MenuRepository(db)
     routes = await menu_repo.fetch_routes_for_roles(
         [role.id for role in current_user.roles], include_all=current_user.is_superuser
     )
-    principal = await _rbac_agent.build_principal(current_user)
+    principal = await get_rbac_agent().build_principal(current_user)
     return success_response({"routes": routes, "user": principal})
 
 
+@router.get("/export", dependencies=[permission_guard("menu", "list")])
+async def export_menus(
+    db: AsyncSession = Depends(get_read_db),
+) -> StreamingResponse:
+    # 导出格式与 /menus/list 的树一致，可直接用于 /menus/import；逐个顶级菜单查询并输出
+    menu_repo = MenuRepository(db)
+
+    async def _chunks():
+        yield "["
+        separator = ""
+        async for node in menu_repo.iter_admin_tree():
+            yield separator + json.dumps(node, ensure_ascii=False)
+            separator = ","
+        yield "]"
+
+    return StreamingResponse(
+        _chunks(),
+        media_type="application/json",
+        headers={"Content-Disposition": 'attachment; filename="menus.json"'},
+    )
+
+
+@router.post(
+    "/import",
+    dependencies=[permission_guard("menu", "create"), permission_guard("menu", "update")],
+)
+async def import_menus(
+    nodes: List[Dict[str, Any]] = Body(...),
+    db: AsyncSession = Depends(get_db),
+) -> dict:
+    try:
+        summary = await MenuRepository(db).import_tree(nodes)
+    except ValueError as exc:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return success_response(summary)
+
+
 @router.get("/{menu_id}", dependencies=[permission_guard("menu", "list")])
 async def get_menu_detail(
     menu_id: int,
@@ -54,7 +97,21 @@ async def get_menu_detail(
     menu = await menu_repo.get_menu(menu_id)
     if not menu:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Menu not found")
-    return success_response(menu_repo.serialize_menu(menu))
+    return success_response(await menu_repo.serialize_menu(menu))
+
+
+@router.get("/{menu_id}/subtree", dependencies=[permission_guard("menu", "list")])
+async def get_menu_subtree(
+    menu_id: int,
+    depth: Optional[int] = Query(None, ge=0, description="向下展开的层数，不传则返回整棵子树"),
+    db: AsyncSession = Depends(get_read_db),
+) -> dict:
+    # 子树通过闭包表一次索引查找取得，无需递归
+    menu_repo = MenuRepository(db)
+    tree = await menu_repo.fetch_subtree(menu_id, max_depth=depth)
+    if not tree:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Menu not found")
+    return success_response(tree[0])
 
 
 @router.post("/save", dependencies=[permission_guard("menu", "create")])
@@ -64,7 +121,7 @@ async def create_menu(
 ) -> dict:
     menu_repo = MenuRepository(db)
     menu = await menu_repo.create_menu(payload)
-    return success_response(menu_repo.serialize_menu(menu))
+    return success_response(await menu_repo.serialize_menu(menu))
 
 
 @router.post("/edit", dependencies=[permission_guard("menu", "update")])
@@ -77,8 +134,29 @@ async def edit_menu(
     if not menu:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Menu not found")
     update_payload = MenuUpdate(**payload.model_dump(exclude={"id"}))
-    menu = await menu_repo.update_menu(menu, update_payload)
-    return success_response(menu_repo.serialize_menu(menu))
+    try:
+        menu = await menu_repo.update_menu(menu, update_payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return success_response(await menu_repo.serialize_menu(menu))
+
+
+@router.post("/reorder", dependencies=[permission_guard("menu", "update")])
+async def reorder_menus(
+    payload: MenuReorderPayload,
+    db: AsyncSession = Depends(get_db),
+) -> dict:
+    # 批量调整菜单的父级与排序，一次事务完成
+    menu_repo = MenuRepository(db)
+    try:
+        updated = await menu_repo.reorder_menus(
+            [(item.id, item.parent_id, item.order) for item in payload.items]
+        )
+    except ValueError as exc:
+        if str(exc) in {"MENU_NOT_FOUND", "MENU_PARENT_NOT_FOUND"}:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return success_response({"updated": updated})
 
 
 @router.put("/{menu_id}", dependencies=[permission_guard("menu", "update")])
@@ -91,8 +169,11 @@ async def update_menu(
     menu = await menu_repo.get_menu(menu_id)
     if not menu:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Menu not found")
-    menu = await menu_repo.update_menu(menu, payload)
-    return success_response(menu_repo.serialize_menu(menu))
+    try:
+        menu = await menu_repo.update_menu(menu, payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return success_response(await menu_repo.serialize_menu(menu))
 
 
 @router.post("/del", dependencies=[permission_guard("menu", "delete")])
@@ -101,22 +182,15 @@ async def delete_menu_batch(
     db: AsyncSession = Depends(get_db),
 ) -> dict:
     menu_repo = MenuRepository(db)
-    deleted = 0
-    for menu_id in payload.ids:
-        menu = await menu_repo.get_menu(menu_id)
-        if not menu:
-            continue
-        try:
-            await menu_repo.delete_menu(menu, force=payload.force)
-        except ValueError as exc:
-            if str(exc) == "MENU_HAS_CHILDREN":
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST, detail="Please remove child menus first"
-                ) from exc
-            raise
-        else:
-            deleted += 1
-    return success_response({"deleted": deleted})
+    try:
+        deleted_ids = await menu_repo.delete_menus(payload.ids, force=payload.force)
+    except ValueError as exc:
+        if str(exc) == "MENU_HAS_CHILDREN":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Please remove child menus first"
+            ) from exc
+        raise
+    return success_response({"deleted": len(deleted_ids), "ids": deleted_ids})
 
 
 @router.delete("/{menu_id}", dependencies=[permission_guard("menu", "delete")])
@@ -126,17 +200,16 @@ async def delete_menu(
     db: AsyncSession = Depends(get_db),
 ) -> dict:
     menu_repo = MenuRepository(db)
-    menu = await menu_repo.get_menu(menu_id)
-    if not menu:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Menu not found")
     try:
-        await menu_repo.delete_menu(menu, force=force)
+        deleted_ids = await menu_repo.delete_menus([menu_id], force=force)
     except ValueError as exc:
         if str(exc) == "MENU_HAS_CHILDREN":
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST, detail="Please remove child menus first"
             ) from exc
         raise
+    if not deleted_ids:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Menu not found")
     return success_response({"deleted": True})
 
 
@@ -157,14 +230,12 @@ async def create_menu_action(
         namespace, resource, action_value = menu_repo._parse_permission_value(payload.value)
     except ValueError as exc:  # type: ignore[attr-defined]
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="INVALID_PERMISSION_VALUE") from exc
-    normalized_value = menu_repo._permission_code_from_parts(namespace, resource, action_value)
-    if any(
-        menu_repo._permission_code(action) == normalized_value for action in menu.permissions
-    ):
+    normalized_value = format_permission_code(namespace, resource, action_value)
+    if any(action.code == normalized_value for action in menu.permissions):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="ACTION_EXISTS")
     action = await menu_repo.add_action(menu, payload.label, payload.value)
     return success_response(
-        {"id": action.id, "label": action.label, "value": menu_repo._permission_code(action)}
+        {"id": action.id, "label": action.label, "value": action.code}
     )
 
 
@@ -187,9 +258,9 @@ async def update_menu_action(
             namespace, resource, action_value = menu_repo._parse_permission_value(payload.value)
         except ValueError as exc:  # type: ignore[attr-defined]
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="INVALID_PERMISSION_VALUE") from exc
-        normalized_value = menu_repo._permission_code_from_parts(namespace, resource, action_value)
+        normalized_value = format_permission_code(namespace, resource, action_value)
         if any(
-            menu_repo._permission_code(action) == normalized_value and action.id != action_id
+            action.code == normalized_value and action.id != action_id
             for action in menu.permissions
         ):
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="ACTION_EXISTS")
@@ -199,7 +270,7 @@ async def update_menu_action(
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Action not found") from exc
         raise
     return success_response(
-        {"id": action.id, "label": action.label, "value": menu_repo._permission_code(action)}
+        {"id": action.id, "label": action.label, "value": action.code}
     )
 
 
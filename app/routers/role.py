@@ -1,6 +1,8 @@
 from collections import defaultdict
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -8,7 +10,7 @@ from app.agents.audit import AuditAgent, get_audit_agent
 from app.agents.identity import AuthenticatedUser
 from app.core.audit_actions import AuditAction
 from app.core.auth import get_current_user, permission_guard
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.core.responses import success_response
 from app.core.settings import get_settings
 from app.repositories.menu_repository import MenuRepository
@@ -17,8 +19,6 @@ from app.schemas.role import RoleCreate, RoleDeletePayload, RoleEditPayload, Rol
 
 router = APIRouter()
 
-settings = get_settings()
-
 
 def _format_datetime(value) -> str | None:
     if not value:
@@ -26,24 +26,13 @@ def _format_datetime(value) -> str | None:
     return value.strftime("%Y-%m-%d %H:%M:%S")
 
 
-def _permission_code(permission) -> str:
-    namespace = (permission.namespace or "").strip()
-    resource = permission.resource.strip()
-    action = permission.action.strip()
-    if namespace == resource == action == "*":
-        return "*.*.*"
-    if namespace:
-        return f"{namespace}:{resource}:{action}"
-    return f"{resource}:{action}"
-
-
 def _serialize_role(role, menu_repo: MenuRepository) -> dict:
     action_code_map: dict[int, set[str]] = defaultdict(set)
     action_id_map: dict[int, set[int]] = defaultdict(set)
     for perm in role.permissions:
         if perm.menu_id is None:
             continue
-        action_code_map[int(perm.menu_id)].add(_permission_code(perm))
+        action_code_map[int(perm.menu_id)].add(perm.code)
         if perm.id is not None:
             action_id_map[int(perm.menu_id)].add(int(perm.id))
     menu_tree = menu_repo.build_tree_from_menus(
@@ -82,18 +71,80 @@ async def _role_list_payload(db: AsyncSession) -> dict:
     role_items = [
         _serialize_role(role, menu_repo)
         for role in roles
-        if role.code != settings.super_admin_role_code
+        if role.code != get_settings().super_admin_role_code
     ]
     return success_response({"list": role_items, "total": len(role_items)})
 
 
+async def _role_skeleton_payload(db: AsyncSession) -> dict:
+    # 共享一棵菜单树，每个角色只返回已授权的菜单 ID 与权限 ID
+    role_repo = RoleRepository(db)
+    roles = await role_repo.list_roles()
+    menu_ids, permission_ids = await role_repo.list_grants()
+    menus = await MenuRepository(db).fetch_detail_tree()
+    role_items = [
+        {
+            "id": role.id,
+            "roleName": role.name,
+            "role": role.code,
+            "status": 1 if role.is_active else 0,
+            "createTime": _format_datetime(role.created_at),
+            "remark": role.description,
+            "menuIds": menu_ids.get(role.id, []),
+            "permissionIds": permission_ids.get(role.id, []),
+        }
+        for role in roles
+        if role.code != get_settings().super_admin_role_code
+    ]
+    return success_response(
+        {"layout": "skeleton", "menus": menus, "list": role_items, "total": len(role_items)}
+    )
+
+
 @router.get("/list", dependencies=[permission_guard("role", "list")])
 async def list_roles_alias(
-    db: AsyncSession = Depends(get_db),
+    layout: Literal["nested", "skeleton"] = Query(
+        "nested",
+        description="nested: 每个角色各自携带完整菜单树（默认，兼容旧客户端）；"
+        "skeleton: 共享一棵菜单树，角色只带授权 ID",
+    ),
+    db: AsyncSession = Depends(get_read_db),
 ) -> dict:
+    if layout == "skeleton":
+        return await _role_skeleton_payload(db)
     return await _role_list_payload(db)
 
 
+@router.get("/matrix", dependencies=[permission_guard("role", "list")])
+async def role_permission_matrix(
+    db: AsyncSession = Depends(get_read_db),
+) -> dict:
+    # 角色×权限矩阵：权限按位排列，每个角色的授权为一个位图
+    role_repo = RoleRepository(db)
+    matrix = await role_repo.load_permission_matrix()
+    roles = await role_repo.list_roles()
+    super_admin_code = get_settings().super_admin_role_code
+    return success_response(
+        {
+            "encoding": "bitmap-le-base64url",
+            "permissions": [
+                {"id": entry.id, "code": entry.code, "label": entry.label, "menuId": entry.menu_id}
+                for entry in matrix.entries
+            ],
+            "roles": [
+                {
+                    "id": role.id,
+                    "role": role.code,
+                    "roleName": role.name,
+                    "grants": matrix.encode(matrix.role_mask(role.id)),
+                }
+                for role in roles
+                if role.code != super_admin_code
+            ],
+        }
+    )
+
+
 @router.post("/save", dependencies=[permission_guard("role", "create")])
 async def create_role(
     payload: RoleCreate,
@@ -102,7 +153,7 @@ async def create_role(
     current_user: AuthenticatedUser = Depends(get_current_user),
     audit_agent: AuditAgent = Depends(get_audit_agent),
 ) -> dict:
-    if payload.role_code == settings.super_admin_role_code:
+    if payload.role_code == get_settings().super_admin_role_code:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="SUPER_ADMIN_RESERVED"
         )
@@ -200,7 +251,7 @@ async def update_role(
     role = await role_repo.get_role(role_id)
     if not role:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Role not found")
-    if role.code == settings.super_admin_role_code:
+    if role.code == get_settings().super_admin_role_code:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="SUPER_ADMIN_IMMUTABLE"
         )
@@ -291,7 +342,7 @@ async def delete_role(
     role = await role_repo.get_role(role_id)
     if not role:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Role not found")
-    if role.code == settings.super_admin_role_code:
+    if role.code == get_settings().super_admin_role_code:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="SUPER_ADMIN_IMMUTABLE"
         )
@@ -1,16 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from redis.asyncio import Redis
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.agents.audit import AuditAgent, get_audit_agent
 from app.agents.identity import AuthenticatedUser
+from app.agents.session import get_session_agent
 from app.core.audit_actions import AuditAction
 from app.core.auth import (
     ensure_permission,
     get_current_user,
     permission_guard,
 )
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
+from app.core.redis import get_redis
 from app.core.responses import success_response
 from app.repositories.user_repository import UserRepository
 from app.schemas.user import (
@@ -27,7 +30,7 @@ router = APIRouter()
 
 @router.get("/list", dependencies=[permission_guard("user", "list")])
 async def list_users(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> dict:
     repo = UserRepository(db)
     users = await repo.list_users()
@@ -43,13 +46,7 @@ async def list_users(
                 role_ids=[role.id for role in user.roles],
                 roles=[RoleBrief(id=role.id, code=role.code, name=role.name) for role in user.roles],
                 permissions=sorted(
-                    {
-                        f"{perm.namespace}:{perm.resource}:{perm.action}"
-                        if perm.namespace
-                        else f"{perm.resource}:{perm.action}"
-                        for role in user.roles
-                        for perm in role.permissions
-                    }
+                    {perm.code for role in user.roles for perm in role.permissions}
                 ),
             )
         )
@@ -63,11 +60,12 @@ async def save_user(
     db: AsyncSession = Depends(get_db),
     current_user: AuthenticatedUser = Depends(get_current_user),
     audit_agent: AuditAgent = Depends(get_audit_agent),
+    redis: Redis = Depends(get_redis),
 ) -> dict:
     repo = UserRepository(db)
     if payload.id:
         await ensure_permission(current_user, "user", "update")
-        user = await repo.get_by_id(payload.id)
+        user = await repo.get_for_update(payload.id)
         if not user:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
         return await _update_user(
@@ -77,6 +75,7 @@ async def save_user(
             request=request,
             operator=current_user,
             audit_agent=audit_agent,
+            redis=redis,
         )
     await ensure_permission(current_user, "user", "create")
     return await _create_user(
@@ -95,9 +94,10 @@ async def edit_user(
     db: AsyncSession = Depends(get_db),
     current_user: AuthenticatedUser = Depends(get_current_user),
     audit_agent: AuditAgent = Depends(get_audit_agent),
+    redis: Redis = Depends(get_redis),
 ) -> dict:
     repo = UserRepository(db)
-    user = await repo.get_by_id(payload.id)
+    user = await repo.get_for_update(payload.id)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     return await _update_user(
@@ -107,6 +107,7 @@ async def edit_user(
         request=request,
         operator=current_user,
         audit_agent=audit_agent,
+        redis=redis,
     )
 
 
@@ -171,6 +172,7 @@ async def _update_user(
     request: Request,
     operator: AuthenticatedUser,
     audit_agent: AuditAgent,
+    redis: Redis,
 ) -> dict:
     try:
         before_snapshot = _user_snapshot(user)
@@ -205,6 +207,8 @@ async def _update_user(
             params={"initiator": operator.username},
             request=request,
         )
+        # 修改密码后注销该用户的全部会话
+        await get_session_agent().invalidate_all_sessions(redis, updated.id)
     return success_response({"id": updated.id})
 
 
@@ -36,3 +36,7 @@ class RefreshRequest(BaseModel):
 
 class LogoutRequest(BaseModel):
     refresh_token: str | None = Field(default=None, alias="refreshToken")
+
+
+class SessionRevokeRequest(BaseModel):
+    sid: str | None = None
@@ -59,3 +59,15 @@ class MenuEditPayload(MenuUpdate):
 class MenuDeletePayload(BaseModel):
     ids: List[int]
     force: bool = False
+
+
+class MenuMoveItem(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    id: int
+    parent_id: Optional[int] = Field(default=None, alias="parentId")
+    order: int = 0
+
+
+class MenuReorderPayload(BaseModel):
+    items: List[MenuMoveItem] = Field(..., min_length=1)
@@ -0,0 +1,358 @@
+"""Throughput and latency percentiles of the auth and listing hot paths.
+
+Drives the ASGI app in process through httpx ``ASGITransport`` (no network, no
+server) against a seeded database of configurable size:
+
+    POST /auth/login, POST /auth/refresh, GET /menus/routes, GET /roles/list,
+    GET /users/list, GET /audit/list
+
+By default the database is a scratch SQLite file and Redis is the in-process
+stand-in from tests/support/fake_redis.py (shared with the test suite), so the
+numbers isolate application cost. Pass ``--database-url`` / ``--redis-url`` to
+measure against real services; with ``--skip-seed`` an existing dataset (e.g.
+from scripts/seed_synthetic.py) is used as-is and only the benchmark login user
+must exist.
+
+Usage: python benchmarks/bench_api.py [--users N] [--roles N] [--menus N] [--audit-rows N]
+                                     [--requests N] [--concurrency N] [--seed N]
+                                     [--database-url URL] [--redis-url URL] [--skip-seed]
+                                     [--json] [--output PATH]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import pathlib
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+from sqlalchemy import insert, text  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+
+from app.agents.audit import get_audit_agent  # noqa: E402
+from app.core.database import get_db, get_read_db  # noqa: E402
+from app.core.redis import get_redis  # noqa: E402
+from app.core.security import hash_password  # noqa: E402
+from app.main import create_app  # noqa: E402
+from app.models.audit import AuditLog  # noqa: E402
+from app.models.base import Base  # noqa: E402
+from app.models.menu import Menu, MenuType  # noqa: E402
+from app.models.role import Permission, Role, RoleMenu, RolePermission  # noqa: E402
+from app.models.user import User, UserRole  # noqa: E402
+from app.repositories.menu_repository import MenuRepository  # noqa: E402
+
+ADMIN_USERNAME = "bench_admin"
+PASSWORD = "bench-password"
+ACTIONS = ("list", "create", "update", "delete")
+BATCH = 5000
+
+
+async def _insert(session: AsyncSession, table, rows: list[dict]) -> None:
+    for start in range(0, len(rows), BATCH):
+        await session.execute(insert(table), rows[start : start + BATCH])
+
+
+async def seed(factory: async_sessionmaker, users: int, roles: int, menus: int, audit_rows: int, seed: int) -> None:
+    rng = random.Random(seed)
+    password_hash = hash_password(PASSWORD)
+    now = datetime.now(timezone.utc)
+
+    menu_rows: list[dict] = []
+    permission_rows: list[dict] = []
+    directories = max(1, menus // 10)
+    for menu_id in range(1, menus + 1):
+        is_directory = menu_id <= directories
+        menu_rows.append(
+            {
+                "id": menu_id,
+                "parent_id": None if is_directory else rng.randint(1, directories),
+                "name": f"Menu{menu_id}",
+                "title": f"Menu {menu_id}",
+                "path": f"/m{menu_id}" if is_directory else f"m{menu_id}",
+                "component": "#" if is_directory else f"views/Bench/Menu{menu_id}",
+                "order": menu_id,
+                "type": MenuType.DIRECTORY if is_directory else MenuType.ROUTE,
+            }
+        )
+        if not is_directory:
+            for action in ACTIONS:
+                permission_rows.append(
+                    {
+                        "id": len(permission_rows) + 2,
+                        "namespace": "bench",
+                        "resource": f"menu{menu_id}",
+                        "action": action,
+                        "label": action,
+                        "menu_id": menu_id,
+                    }
+                )
+    permission_rows.insert(
+        0, {"id": 1, "namespace": "*", "resource": "*", "action": "*", "label": "All", "menu_id": None}
+    )
+
+    role_rows = [{"id": 1, "code": "bench_admin", "name": "Bench administrator"}]
+    role_rows += [{"id": role_id, "code": f"role{role_id}", "name": f"Role {role_id}"} for role_id in range(2, roles + 2)]
+    role_menu_rows = [{"role_id": 1, "menu_id": row["id"]} for row in menu_rows]
+    role_permission_rows = [{"role_id": 1, "permission_id": 1}]
+    for role in role_rows[1:]:
+        for menu in rng.sample(menu_rows, k=max(1, len(menu_rows) // 3)):
+            role_menu_rows.append({"role_id": role["id"], "menu_id": menu["id"]})
+        for permission in rng.sample(permission_rows[1:], k=min(len(permission_rows) - 1, 40)):
+            role_permission_rows.append({"role_id": role["id"], "permission_id": permission["id"]})
+
+    user_rows = [
+        {
+            "id": 1,
+            "username": ADMIN_USERNAME,
+            "email": "bench_admin@example.com",
+            "password_hash": password_hash,
+            "full_name": "Bench administrator",
+            "is_superuser": True,
+            "is_active": True,
+            "attributes": {},
+        }
+    ]
+    user_role_rows = [{"user_id": 1, "role_id": 1}]
+    for user_id in range(2, users + 2):
+        user_rows.append(
+            {
+                "id": user_id,
+                "username": f"user{user_id}",
+                "email": f"user{user_id}@example.com",
+                "password_hash": password_hash,
+                "full_name": f"User {user_id}",
+                "is_active": True,
+                "is_superuser": False,
+                "attributes": {},
+            }
+        )
+        for role_id in rng.sample(range(2, roles + 2), k=min(roles, 2)):
+            user_role_rows.append({"user_id": user_id, "role_id": role_id})
+
+    audit_rows_data = [
+        {
+            "id": index + 1,
+            "trace_id": f"bench-{index}",
+            "operator_id": rng.randint(1, users + 1),
+            "operator_name": "bench",
+            "action": rng.choice(("AUTH_LOGIN", "USER_UPDATE", "ROLE_UPDATE", "MENU_UPDATE")),
+            "resource_type": "USER",
+            "resource_id": str(rng.randint(1, users + 1)),
+            "result_status": 1,
+            "created_at": now - timedelta(seconds=rng.randint(0, 90 * 24 * 3600)),
+        }
+        for index in range(audit_rows)
+    ]
+
+    async with factory() as session:
+        for table, rows in (
+            (Menu.__table__, menu_rows),
+            (Permission.__table__, permission_rows),
+            (Role.__table__, role_rows),
+            (RoleMenu.__table__, role_menu_rows),
+            (RolePermission.__table__, role_permission_rows),
+            (User.__table__, user_rows),
+            (UserRole.__table__, user_role_rows),
+            (AuditLog.__table__, audit_rows_data),
+        ):
+            await _insert(session, table, rows)
+            if session.bind.dialect.name == "postgresql":
+                # Rows carry explicit ids; move the sequences past them for later app inserts.
+                await session.execute(
+                    text(
+                        f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+                        f"COALESCE((SELECT MAX(id) FROM {table.name}), 1))"
+                    )
+                )
+        await MenuRepository(session).rebuild_closure()
+        await session.commit()
+
+
+def _summarize(name: str, latencies: list[float], errors: int, elapsed: float) -> dict:
+    ordered = sorted(latencies)
+
+    def percentile(fraction: float) -> float:
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000
+
+    return {
+        "endpoint": name,
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "mean_ms": statistics.fmean(ordered) * 1000 if ordered else 0.0,
+        "p50_ms": percentile(0.50),
+        "p90_ms": percentile(0.90),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "max_ms": ordered[-1] * 1000 if ordered else 0.0,
+    }
+
+
+async def _drive(name: str, call, requests: int, concurrency: int) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker(worker_id: int) -> None:
+        nonlocal errors
+        for _ in remaining:
+            start = time.perf_counter()
+            ok = await call(worker_id)
+            latencies.append(time.perf_counter() - start)
+            errors += 0 if ok else 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(index) for index in range(concurrency)))
+    return _summarize(name, latencies, errors, time.perf_counter() - started)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    scratch = tempfile.TemporaryDirectory() if not args.database_url else None
+    database_url = args.database_url or f"sqlite+aiosqlite:///{scratch.name}/bench.db"
+    engine = create_async_engine(database_url)
+    factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    if not args.skip_seed:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        await seed(factory, args.users, args.roles, args.menus, args.audit_rows, args.seed)
+
+    if args.redis_url:
+        from redis.asyncio import Redis
+
+        redis = Redis.from_url(args.redis_url, decode_responses=True)
+    else:
+        from tests.support.fake_redis import FakeRedis
+
+        redis = FakeRedis()
+
+    app = create_app()
+    # Request logging would dominate the measurement and the output.
+    for name in ("", "httpx", "app"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    get_audit_agent().configure_session_factory(factory)
+
+    async def _override_get_db():
+        async with factory() as session:
+            yield session
+
+    async def _override_get_redis():
+        yield redis
+
+    app.dependency_overrides[get_db] = _override_get_db
+    app.dependency_overrides[get_read_db] = _override_get_db
+    app.dependency_overrides[get_redis] = _override_get_redis
+
+    results = []
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        # The login rate limit is per username, so logins rotate over the seeded users.
+        usernames = [f"user{user_id}" for user_id in range(2, args.users + 2)] or [ADMIN_USERNAME]
+        login_cursor = iter(range(10**9))
+
+        async def login(username: str | None = None) -> dict | None:
+            name = username or usernames[next(login_cursor) % len(usernames)]
+            response = await client.post("/auth/login", json={"username": name, "password": PASSWORD})
+            return response.json()["data"] if response.status_code == 200 else None
+
+        admin = await login(ADMIN_USERNAME)
+        if admin is None:
+            raise SystemExit(f"cannot log in as {ADMIN_USERNAME}; seed the database first")
+        headers = {"Authorization": f"Bearer {admin['tokens']['accessToken']}"}
+        refresh_tokens = {}
+        for worker_id in range(args.concurrency):
+            data = await login()
+            refresh_tokens[worker_id] = data["tokens"]["refreshToken"] if data else None
+
+        async def do_login(_: int) -> bool:
+            return await login() is not None
+
+        async def do_refresh(worker_id: int) -> bool:
+            response = await client.post("/auth/refresh", json={"refreshToken": refresh_tokens[worker_id]})
+            if response.status_code != 200:
+                return False
+            refresh_tokens[worker_id] = response.json()["data"]["tokens"]["refreshToken"]
+            return True
+
+        def get(path: str):
+            async def call(_: int) -> bool:
+                response = await client.get(path, headers=headers)
+                return response.status_code == 200
+
+            return call
+
+        scenarios = [
+            ("POST /auth/login", do_login),
+            ("POST /auth/refresh", do_refresh),
+            ("GET /menus/routes", get("/menus/routes")),
+            ("GET /roles/list", get("/roles/list?layout=skeleton")),
+            ("GET /users/list", get("/users/list")),
+            ("GET /audit/list", get("/audit/list?page=1&page_size=20")),
+        ]
+        for name, call in scenarios:
+            results.append(await _drive(name, call, args.requests, args.concurrency))
+
+    if args.redis_url:
+        await redis.aclose()
+    await engine.dispose()
+    if scratch is not None:
+        scratch.cleanup()
+    return {
+        "dataset": {
+            "users": args.users,
+            "roles": args.roles,
+            "menus": args.menus,
+            "audit_rows": args.audit_rows,
+            "seed": args.seed,
+            "database": "sqlite" if not args.database_url else "external",
+            "redis": "in-process" if not args.redis_url else "external",
+        },
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark auth and listing endpoints in process")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--roles", type=int, default=20)
+    parser.add_argument("--menus", type=int, default=200)
+    parser.add_argument("--audit-rows", type=int, default=20000)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--redis-url", default=None)
+    parser.add_argument("--skip-seed", action="store_true", help="Use the existing dataset as-is")
+    parser.add_argument("--json", action="store_true", help="Emit results as JSON")
+    parser.add_argument("--output", type=pathlib.Path, default=None, help="Also write JSON results here")
+    args = parser.parse_args()
+    report = asyncio.run(run(args))
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2))
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"{'endpoint':<20} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'err':>5}")
+    for result in report["results"]:
+        print(
+            f"{result['endpoint']:<20} {result['throughput_rps']:8.1f} {result['p50_ms']:8.2f} "
+            f"{result['p95_ms']:8.2f} {result['p99_ms']:8.2f} {result['max_ms']:8.2f} {result['errors']:5d}"
+        )
+
+
+if __name__ == "__main__":
+    main()
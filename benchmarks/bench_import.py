@@ -0,0 +1,112 @@
+"""Cold-start cost: ``-X importtime`` profile of app.main plus create_app() time.
+
+Each run starts a fresh interpreter so nothing is shared with previously
+imported modules.
+
+Usage: python benchmarks/bench_import.py [--module app.main] [--top N] [--runs N]
+                                        [--budget-ms MS] [--json]
+"""
+
+import argparse
+import json
+import pathlib
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+_IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+# Executed in the child interpreter; prints how long create_app() takes once imported.
+_CHILD = """
+import time
+import {module} as target
+start = time.perf_counter()
+target.create_app()
+print("CREATE_APP_US", int((time.perf_counter() - start) * 1e6))
+"""
+
+
+def _profile_once(module: str) -> tuple[list[dict], int]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _CHILD.format(module=module)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    entries = []
+    for line in completed.stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append(
+                {
+                    "module": name,
+                    "self_us": int(self_us),
+                    "cumulative_us": int(cumulative_us),
+                    "depth": len(indent) // 2,
+                }
+            )
+    create_app_us = 0
+    for line in completed.stdout.splitlines():
+        if line.startswith("CREATE_APP_US"):
+            create_app_us = int(line.split()[1])
+    return entries, create_app_us
+
+
+def run(module: str, runs: int, top: int) -> dict:
+    totals_us: list[int] = []
+    create_app_us: list[int] = []
+    entries: list[dict] = []
+    for _ in range(runs):
+        entries, created = _profile_once(module)
+        target = next((entry for entry in entries if entry["module"] == module), None)
+        totals_us.append(target["cumulative_us"] if target else 0)
+        create_app_us.append(created)
+    app_modules = [entry for entry in entries if entry["module"].split(".")[0] == "app"]
+    return {
+        "module": module,
+        "runs": runs,
+        "import_ms_median": statistics.median(totals_us) / 1000,
+        "import_ms_min": min(totals_us) / 1000,
+        "create_app_ms_median": statistics.median(create_app_us) / 1000,
+        "modules_imported": len(entries),
+        "top_self": sorted(entries, key=lambda entry: entry["self_us"], reverse=True)[:top],
+        "top_app_cumulative": sorted(
+            app_modules, key=lambda entry: entry["cumulative_us"], reverse=True
+        )[:top],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Profile application import time")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument(
+        "--budget-ms", type=float, default=None, help="Exit non-zero if the median import exceeds this"
+    )
+    parser.add_argument("--json", action="store_true", help="Emit results as JSON")
+    args = parser.parse_args()
+    results = run(args.module, args.runs, args.top)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"import {results['module']:<24} {results['import_ms_median']:8.1f} ms (median of {args.runs})")
+        print(f"create_app()                  {results['create_app_ms_median']:8.1f} ms")
+        print(f"modules imported              {results['modules_imported']:8d}")
+        print("\nslowest modules (self time):")
+        for entry in results["top_self"]:
+            print(f"  {entry['self_us'] / 1000:8.2f} ms  {entry['module']}")
+        print("\napplication modules (cumulative):")
+        for entry in results["top_app_cumulative"]:
+            print(f"  {entry['cumulative_us'] / 1000:8.2f} ms  {entry['module']}")
+    if args.budget_ms is not None and results["import_ms_median"] > args.budget_ms:
+        sys.exit(f"import time {results['import_ms_median']:.1f} ms exceeds budget {args.budget_ms} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Per-call overhead of StructuredLogger at disabled and enabled levels.
+
+Usage: python benchmarks/bench_logging.py [--iterations N] [--json]
+"""
+
+import argparse
+import json
+import logging
+import pathlib
+import queue
+import sys
+import timeit
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.core.logging import BoundedQueueHandler, StructuredLogger  # noqa: E402
+
+
+class _DrainQueue(queue.Queue):
+    """Queue that discards records so the benchmark measures only the calling side."""
+
+    def put_nowait(self, item) -> None:  # type: ignore[override]
+        return None
+
+
+def _make_logger(level: int) -> StructuredLogger:
+    base = logging.getLogger(f"bench.logging.{logging.getLevelName(level).lower()}")
+    base.handlers[:] = [BoundedQueueHandler(_DrainQueue())]
+    base.propagate = False
+    base.setLevel(level)
+    return StructuredLogger(base).bind(component="bench", user_id=42)
+
+
+def _measure(stmt, iterations: int) -> float:
+    best = min(timeit.repeat(stmt, number=iterations, repeat=5))
+    return best / iterations * 1e9
+
+
+def run(iterations: int) -> dict[str, float]:
+    disabled = _make_logger(logging.WARNING)
+    enabled = _make_logger(logging.DEBUG)
+    results = {
+        "disabled_debug_ns": _measure(
+            lambda: disabled.debug("Checking permission: %s %s", "user", "list"), iterations
+        ),
+        "disabled_info_with_context_ns": _measure(
+            lambda: disabled.info("login", context={"username": "admin"}), iterations
+        ),
+        "enabled_info_ns": _measure(
+            lambda: enabled.info("Checking permission: %s %s", "user", "list"), iterations
+        ),
+        "enabled_info_with_context_ns": _measure(
+            lambda: enabled.info("login", context={"username": "admin"}), iterations
+        ),
+        "bind_ns": _measure(lambda: disabled.bind(request_id="r1"), iterations),
+    }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark StructuredLogger call overhead")
+    parser.add_argument("--iterations", type=int, default=100_000)
+    parser.add_argument("--json", action="store_true", help="Emit results as JSON")
+    args = parser.parse_args()
+    results = run(args.iterations)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for name, value in results.items():
+        print(f"{name:<32} {value:10.1f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Access token size, encode and decode cost: embedded permissions vs a permission-set reference.
+
+Usage: python benchmarks/bench_token_size.py [--permissions N] [--iterations N] [--json]
+"""
+
+import argparse
+import json
+import pathlib
+import sys
+import timeit
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.core.permsets import PERMISSION_SET_VERSION, permission_set_id  # noqa: E402
+from app.core.security import create_jwt_token, decode_jwt_token  # noqa: E402
+
+
+def _measure(stmt, iterations: int) -> float:
+    best = min(timeit.repeat(stmt, number=iterations, repeat=5))
+    return best / iterations * 1e6
+
+
+def run(permissions: int, iterations: int) -> dict[str, dict[str, float]]:
+    codes = [f"system:resource{index}:action{index % 7}" for index in range(permissions)]
+    variants = {
+        "embedded": {"permissions": codes},
+        "reference": {"pset": permission_set_id(codes), "psv": PERMISSION_SET_VERSION},
+    }
+    results = {}
+    for name, claims in variants.items():
+        common = {"username": "admin", "role": "admin", "role_id": "1", "sid": "sess_bench"}
+
+        def encode(claims=claims) -> str:
+            return create_jwt_token("1", 15, "access", **common, **claims)["token"]
+
+        token = encode()
+        results[name] = {
+            "header_bytes": len(f"Bearer {token}"),
+            "encode_us": _measure(encode, iterations),
+            "decode_us": _measure(lambda token=token: decode_jwt_token(token), iterations),
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare embedded and referenced permission claims")
+    parser.add_argument("--permissions", type=int, default=300)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--json", action="store_true", help="Emit results as JSON")
+    args = parser.parse_args()
+    results = run(args.permissions, args.iterations)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for name, result in results.items():
+        print(
+            f"{name:<10} {result['header_bytes']:7d} B  "
+            f"encode {result['encode_us']:8.1f} us  decode {result['decode_us']:8.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Redis memory per active session for each access_token_permissions mode.
+
+Issues ``--sessions`` token pairs plus session records through TokenAgent and
+SessionAgent against a real Redis server and reports the ``used_memory`` delta,
+scaled to 100k sessions. Only the refresh and session records are stored per
+session; ``reference`` adds one shared permission-set entry per distinct set.
+Users share ``--roles`` distinct permission sets, the way role-based grants do
+in practice.
+
+The target database must be empty; it is flushed after each mode.
+
+Usage: python benchmarks/bench_token_storage.py [--redis-url redis://localhost:6379/15]
+                                               [--sessions N] [--users N] [--roles N]
+                                               [--permissions N] [--json]
+"""
+
+import argparse
+import asyncio
+import json
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from redis.asyncio import Redis  # noqa: E402
+
+from app.agents.identity import AuthenticatedUser, RoleInfo  # noqa: E402
+from app.agents.session import SessionAgent  # noqa: E402
+from app.agents.token import TokenAgent  # noqa: E402
+
+MODES = ("embedded", "reference")
+
+
+def _users(count: int, roles: int, permissions: int) -> list[AuthenticatedUser]:
+    role_permissions = [
+        [f"system:resource{index}:action{role}" for index in range(permissions)] for role in range(roles)
+    ]
+    return [
+        AuthenticatedUser(
+            id=user_id,
+            username=f"bench{user_id}",
+            email=None,
+            full_name=None,
+            roles=[RoleInfo(id=user_id % roles, code=f"role{user_id % roles}", name="bench")],
+            permissions=role_permissions[user_id % roles],
+            attributes={},
+            is_superuser=False,
+        )
+        for user_id in range(1, count + 1)
+    ]
+
+
+async def _used_memory(redis: Redis) -> int:
+    info = await redis.info("memory")
+    return int(info["used_memory"])
+
+
+async def _measure_mode(
+    redis: Redis, mode: str, users: list[AuthenticatedUser], sessions: int, concurrency: int
+) -> dict:
+    token_agent = TokenAgent()
+    token_agent.settings = token_agent.settings.model_copy(update={"access_token_permissions": mode})
+    session_agent = SessionAgent()
+    session_agent.settings = session_agent.settings.model_copy(update={"session_max_per_user": 0})
+
+    async def issue(index: int) -> None:
+        user = users[index % len(users)]
+        sid = session_agent.new_sid()
+        tokens = await token_agent.issue_pair(redis, user, device_id="bench", sid=sid)
+        await session_agent.create_session(
+            redis, user.id, tokens.refresh_payload["jti"], "bench", sid=sid
+        )
+
+    before = await _used_memory(redis)
+    for start in range(0, sessions, concurrency):
+        await asyncio.gather(*(issue(index) for index in range(start, min(start + concurrency, sessions))))
+    after = await _used_memory(redis)
+    keys = await redis.dbsize()
+    await redis.flushdb()
+    used = after - before
+    return {
+        "mode": mode,
+        "sessions": sessions,
+        "keys": keys,
+        "used_bytes": used,
+        "bytes_per_session": used / sessions,
+        "mb_per_100k_sessions": used / sessions * 100_000 / (1024 * 1024),
+    }
+
+
+async def run(
+    redis_url: str, sessions: int, users: int, roles: int, permissions: int, concurrency: int
+) -> list[dict]:
+    redis = Redis.from_url(redis_url, decode_responses=True)
+    try:
+        if await redis.dbsize():
+            raise SystemExit(f"{redis_url} is not empty; point --redis-url at a scratch database")
+        population = _users(users, roles, permissions)
+        return [
+            await _measure_mode(redis, mode, population, sessions, concurrency) for mode in MODES
+        ]
+    finally:
+        await redis.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure Redis memory per session by access token permission mode"
+    )
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15")
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--roles", type=int, default=20)
+    parser.add_argument("--permissions", type=int, default=150, help="Permission codes per role")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--json", action="store_true", help="Emit results as JSON")
+    args = parser.parse_args()
+    results = asyncio.run(
+        run(args.redis_url, args.sessions, args.users, args.roles, args.permissions, args.concurrency)
+    )
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for result in results:
+        print(
+            f"{result['mode']:<9} {result['keys']:>9d} keys  "
+            f"{result['bytes_per_session']:10.1f} B/session  "
+            f"{result['mb_per_100k_sessions']:8.1f} MB per 100k sessions"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@
 -- ============================================================================
 DROP TABLE IF EXISTS audit_log CASCADE;
 DROP TABLE IF EXISTS role_menus CASCADE;
+DROP TABLE IF EXISTS menu_closure CASCADE;
 DROP TABLE IF EXISTS menus CASCADE;
 DROP TABLE IF EXISTS departments CASCADE;
 DROP TABLE IF EXISTS role_permissions CASCADE;
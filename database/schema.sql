@@ -6,6 +6,7 @@
 --   1. 如需重建，请运行 drop_all.sql（会清空所有对象）
 --   2. 执行此文件创建表结构
 --   3. 执行 seed.sql 插入测试数据
+-- 已有数据库无需重建：按编号顺序执行 upgrades/ 下的升级脚本即可
 -- ============================================================================
 
 -- ============================================================================
@@ -142,6 +143,12 @@ CREATE TABLE permissions (
     namespace   VARCHAR(64) NOT NULL DEFAULT 'system',
     resource    VARCHAR(64) NOT NULL,
     action      VARCHAR(64) NOT NULL,
+    code        VARCHAR(330) GENERATED ALWAYS AS (
+                    CASE WHEN trim(namespace) = '*' AND trim(resource) = '*' AND trim(action) = '*' THEN '*.*.*'
+                         WHEN trim(coalesce(namespace, '')) <> ''
+                         THEN trim(namespace) || ':' || trim(resource) || ':' || trim(action)
+                         ELSE trim(resource) || ':' || trim(action) END
+                ) STORED,
     label       VARCHAR(128),
     menu_id     BIGINT,
     effect      VARCHAR(10) NOT NULL DEFAULT 'allow' CHECK (effect IN ('allow', 'deny')),
@@ -156,6 +163,7 @@ COMMENT ON COLUMN permissions.id IS '权限ID，主键';
 COMMENT ON COLUMN permissions.namespace IS '命名空间，如：system, example，*表示所有';
 COMMENT ON COLUMN permissions.resource IS '资源，如：user, role, menu，*表示所有';
 COMMENT ON COLUMN permissions.action IS '操作，如：create, read, update, delete, list，*表示所有';
+COMMENT ON COLUMN permissions.code IS '权限编码（生成列），如：system:user:list，全部权限为 *.*.*';
 COMMENT ON COLUMN permissions.label IS '权限标签/描述';
 COMMENT ON COLUMN permissions.menu_id IS '所属菜单ID，NULL 表示独立权限';
 COMMENT ON COLUMN permissions.effect IS '权限效果：allow-允许, deny-拒绝';
@@ -165,6 +173,9 @@ COMMENT ON COLUMN permissions.updated_at IS '更新时间';
 
 CREATE INDEX idx_permissions_resource ON permissions(namespace, resource, action);
 CREATE INDEX idx_permissions_effect ON permissions(effect) WHERE effect = 'allow';
+CREATE UNIQUE INDEX uq_permissions_code ON permissions(code);
+-- 登录/令牌校验时按 id 聚合权限编码，覆盖索引使其走 index-only scan
+CREATE INDEX idx_permissions_principal ON permissions(id) INCLUDE (code);
 
 -- ============================================================================
 -- 角色权限关联表
@@ -249,6 +260,24 @@ ALTER TABLE permissions
     ADD CONSTRAINT fk_permissions_menu
     FOREIGN KEY (menu_id) REFERENCES menus(id) ON DELETE CASCADE;
 
+-- ============================================================================
+-- 菜单闭包表
+-- ============================================================================
+CREATE TABLE menu_closure (
+    ancestor_id   BIGINT NOT NULL REFERENCES menus(id) ON DELETE CASCADE,
+    descendant_id BIGINT NOT NULL REFERENCES menus(id) ON DELETE CASCADE,
+    depth         INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (ancestor_id, descendant_id)
+);
+
+COMMENT ON TABLE menu_closure IS '菜单闭包表：每对（祖先, 后代）一行，含深度为 0 的自身行，由菜单写入路径维护';
+COMMENT ON COLUMN menu_closure.ancestor_id IS '祖先菜单ID';
+COMMENT ON COLUMN menu_closure.descendant_id IS '后代菜单ID';
+COMMENT ON COLUMN menu_closure.depth IS '祖先到后代的层级距离';
+
+-- 主键覆盖按祖先查子树；此索引覆盖按后代查祖先（面包屑、成环检测）
+CREATE INDEX idx_menu_closure_descendant ON menu_closure(descendant_id, depth);
+
 -- ============================================================================
 -- 角色菜单关联表
 -- ============================================================================
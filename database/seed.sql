@@ -10,6 +10,7 @@
 -- ============================================================================
 TRUNCATE TABLE audit_log RESTART IDENTITY CASCADE;
 TRUNCATE TABLE role_menus RESTART IDENTITY CASCADE;
+TRUNCATE TABLE menu_closure CASCADE;
 TRUNCATE TABLE role_permissions RESTART IDENTITY CASCADE;
 TRUNCATE TABLE user_roles RESTART IDENTITY CASCADE;
 TRUNCATE TABLE menus RESTART IDENTITY CASCADE;
@@ -125,6 +126,18 @@ VALUES
     (21, 18, 'SystemRole', '角色管理', 'router.role', 'role', 'views/Authorization/Role/Role', NULL, 3, NULL, 'route', FALSE, FALSE, TRUE, FALSE, FALSE, TRUE, NULL, TRUE, FALSE, FALSE),
     (22, 18, 'SystemAudit', '审计日志', 'router.audit', 'audit', 'views/Authorization/Audit/Audit', NULL, 4, NULL, 'route', FALSE, FALSE, TRUE, FALSE, FALSE, TRUE, NULL, TRUE, FALSE, FALSE);
 
+-- ============================================================================
+-- 生成菜单闭包表（依赖菜单 parent_id）
+-- ============================================================================
+INSERT INTO menu_closure (ancestor_id, descendant_id, depth)
+WITH RECURSIVE menu_paths AS (
+    SELECT id AS ancestor_id, id AS descendant_id, 0 AS depth FROM menus
+    UNION ALL
+    SELECT p.ancestor_id, m.id, p.depth + 1
+    FROM menu_paths p JOIN menus m ON m.parent_id = p.descendant_id
+)
+SELECT ancestor_id, descendant_id, depth FROM menu_paths;
+
 -- ============================================================================
 -- 插入权限数据（依赖菜单 ID）
 -- ============================================================================
@@ -0,0 +1,48 @@
+-- ============================================================================
+-- 升级脚本：为已有数据库的 permissions 表添加生成列 code 及其索引
+-- ============================================================================
+-- 新库直接执行 schema.sql 即可，无需此脚本。
+-- 可重复执行；若已有多行规整（trim）后得到相同编码，脚本中止并列出冲突行，
+-- 请先合并或删除重复权限（含其 role_permissions 关联）后再执行。
+-- 用法：psql "$DATABASE_URL" -v ON_ERROR_STOP=1 -f database/upgrades/001_permission_code.sql
+-- ============================================================================
+
+BEGIN;
+
+DO $$
+DECLARE
+    conflicts TEXT;
+BEGIN
+    SELECT string_agg(format('%s (ids %s)', code, ids), '; ' ORDER BY code)
+      INTO conflicts
+      FROM (
+        SELECT CASE WHEN trim(namespace) = '*' AND trim(resource) = '*' AND trim(action) = '*' THEN '*.*.*'
+                    WHEN trim(coalesce(namespace, '')) <> ''
+                    THEN trim(namespace) || ':' || trim(resource) || ':' || trim(action)
+                    ELSE trim(resource) || ':' || trim(action) END AS code,
+               string_agg(id::TEXT, ',' ORDER BY id) AS ids
+          FROM permissions
+         GROUP BY 1
+        HAVING count(*) > 1
+      ) duplicates;
+    IF conflicts IS NOT NULL THEN
+        RAISE EXCEPTION 'permissions rows share a permission code: %', conflicts
+            USING HINT = 'Merge or delete the duplicate permissions (and their role_permissions rows), then re-run.';
+    END IF;
+END $$;
+
+ALTER TABLE permissions
+    ADD COLUMN IF NOT EXISTS code VARCHAR(330) GENERATED ALWAYS AS (
+        CASE WHEN trim(namespace) = '*' AND trim(resource) = '*' AND trim(action) = '*' THEN '*.*.*'
+             WHEN trim(coalesce(namespace, '')) <> ''
+             THEN trim(namespace) || ':' || trim(resource) || ':' || trim(action)
+             ELSE trim(resource) || ':' || trim(action) END
+    ) STORED;
+
+COMMENT ON COLUMN permissions.code IS '权限编码（生成列），如：system:user:list，全部权限为 *.*.*';
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_permissions_code ON permissions(code);
+-- 登录/令牌校验时按 id 聚合权限编码，覆盖索引使其走 index-only scan
+CREATE INDEX IF NOT EXISTS idx_permissions_principal ON permissions(id) INCLUDE (code);
+
+COMMIT;
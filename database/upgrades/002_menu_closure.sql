@@ -0,0 +1,40 @@
+-- ============================================================================
+-- 升级脚本：为已有数据库创建菜单闭包表 menu_closure 并按 parent_id 回填
+-- ============================================================================
+-- 新库直接执行 schema.sql + seed.sql 即可，无需此脚本。
+-- 可重复执行：每次都在锁住菜单表的事务中按 parent_id 全量重建闭包表。
+-- 菜单若由应用以外的途径写入，也可改用 python scripts/menu_tree.py closure 重建。
+-- 用法：psql "$DATABASE_URL" -v ON_ERROR_STOP=1 -f database/upgrades/002_menu_closure.sql
+-- ============================================================================
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS menu_closure (
+    ancestor_id   BIGINT NOT NULL REFERENCES menus(id) ON DELETE CASCADE,
+    descendant_id BIGINT NOT NULL REFERENCES menus(id) ON DELETE CASCADE,
+    depth         INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (ancestor_id, descendant_id)
+);
+
+COMMENT ON TABLE menu_closure IS '菜单闭包表：每对（祖先, 后代）一行，含深度为 0 的自身行，由菜单写入路径维护';
+COMMENT ON COLUMN menu_closure.ancestor_id IS '祖先菜单ID';
+COMMENT ON COLUMN menu_closure.descendant_id IS '后代菜单ID';
+COMMENT ON COLUMN menu_closure.depth IS '祖先到后代的层级距离';
+
+-- 主键覆盖按祖先查子树；此索引覆盖按后代查祖先（面包屑、成环检测）
+CREATE INDEX IF NOT EXISTS idx_menu_closure_descendant ON menu_closure(descendant_id, depth);
+
+-- 回填期间阻止菜单写入，避免与应用的增量维护交错
+LOCK TABLE menus, menu_closure IN SHARE ROW EXCLUSIVE MODE;
+
+DELETE FROM menu_closure;
+INSERT INTO menu_closure (ancestor_id, descendant_id, depth)
+WITH RECURSIVE menu_paths AS (
+    SELECT id AS ancestor_id, id AS descendant_id, 0 AS depth FROM menus
+    UNION ALL
+    SELECT p.ancestor_id, m.id, p.depth + 1
+    FROM menu_paths p JOIN menus m ON m.parent_id = p.descendant_id
+)
+SELECT ancestor_id, descendant_id, depth FROM menu_paths;
+
+COMMIT;
@@ -0,0 +1,32 @@
+import argparse
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.core.openapi import export_openapi  # noqa: E402
+from app.core.settings import get_settings  # noqa: E402
+from app.main import create_app  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Generate the OpenAPI schema at build time (served when OPENAPI_MODE=static)"
+    )
+    parser.add_argument(
+        "--output",
+        type=pathlib.Path,
+        default=None,
+        help="Target JSON file (defaults to settings.openapi_static_path)",
+    )
+    args = parser.parse_args()
+    output = args.output or pathlib.Path(get_settings().openapi_static_path)
+    schema_path, compressed_path = export_openapi(create_app(), output)
+    print(f"Wrote {schema_path} ({schema_path.stat().st_size} bytes)")
+    print(f"Wrote {compressed_path} ({compressed_path.stat().st_size} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Export or import the menu tree, e.g. to promote menus between environments.
+
+The file holds the tree exactly as GET /menus/export returns it. Import
+upserts menus by name and their actions by permission code in one transaction.
+``closure`` recomputes the menu_closure table from parent_id, for databases
+whose menus were written outside the application (the same rebuild as
+database/upgrades/002_menu_closure.sql). Run it once, not from every worker.
+
+Usage: python scripts/menu_tree.py export menus.json
+       python scripts/menu_tree.py import menus.json
+       python scripts/menu_tree.py closure
+"""
+
+import argparse
+import asyncio
+import json
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.core.database import get_engine, get_session_factory  # noqa: E402
+from app.repositories.menu_repository import MenuRepository  # noqa: E402
+
+
+async def export_tree(path: pathlib.Path) -> None:
+    count = 0
+    async with get_session_factory()() as session:
+        with path.open("w", encoding="utf-8") as handle:
+            handle.write("[")
+            async for node in MenuRepository(session).iter_admin_tree():
+                handle.write(("," if count else "") + json.dumps(node, ensure_ascii=False))
+                count += 1
+            handle.write("]")
+    print(f"Exported {count} top-level menus to {path}")
+
+
+async def import_tree(path: pathlib.Path) -> None:
+    nodes = json.loads(path.read_text(encoding="utf-8"))
+    async with get_session_factory()() as session:
+        summary = await MenuRepository(session).import_tree(nodes)
+    print(f"Imported {summary['menus']} menus and {summary['actions']} actions from {path}")
+
+
+async def rebuild_closure() -> None:
+    async with get_session_factory()() as session:
+        await MenuRepository(session).rebuild_closure()
+        await session.commit()
+    print("Rebuilt menu_closure")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Export or import the menu tree as JSON")
+    parser.add_argument("command", choices=("export", "import", "closure"))
+    parser.add_argument("path", type=pathlib.Path, nargs="?")
+    args = parser.parse_args()
+    if args.command != "closure" and args.path is None:
+        parser.error(f"{args.command} requires a path")
+    try:
+        if args.command == "export":
+            await export_tree(args.path)
+        elif args.command == "import":
+            await import_tree(args.path)
+        else:
+            await rebuild_closure()
+    finally:
+        await get_engine().dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,326 @@
+"""Bulk-load a synthetic dataset for scale testing.
+
+Generates departments in a deep tree, users with role assignments, menus with
+action permissions and audit rows spread over time, and streams them into
+PostgreSQL with COPY. Output is fully determined by ``--seed`` and the volume
+arguments; each table draws from its own generator, so changing one volume
+leaves the other tables unchanged.
+
+Run against a database created from database/schema.sql. ``--truncate`` empties
+the tables first (like seed.sql). All users share one password so the
+benchmarks can log in as any of them: ``bench_admin`` is a superuser, the rest
+are ``user<id>``.
+
+Usage: python scripts/seed_synthetic.py [--users 1000000] [--departments 2000] [--depth 8]
+                                        [--roles 50] [--menus 300] [--audit-rows 5000000]
+                                        [--seed 42] [--truncate] [--dsn DSN]
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import pathlib
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+import asyncpg
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.core.security import hash_password  # noqa: E402
+from app.core.settings import get_settings  # noqa: E402
+
+ADMIN_USERNAME = "bench_admin"
+DEFAULT_PASSWORD = "bench-password"
+ACTIONS = ("list", "create", "update", "delete", "export", "import")
+AUDIT_ACTIONS = ("AUTH_LOGIN", "AUTH_LOGOUT", "AUTH_REFRESH", "USER_UPDATE", "ROLE_UPDATE", "MENU_UPDATE")
+TABLES = (
+    "audit_log",
+    "menu_closure",
+    "role_menus",
+    "role_permissions",
+    "user_roles",
+    "permissions",
+    "menus",
+    "users",
+    "roles",
+    "departments",
+)
+# Closure rows are derived from menus.parent_id rather than generated.
+MENU_CLOSURE_SQL = """
+INSERT INTO menu_closure (ancestor_id, descendant_id, depth)
+WITH RECURSIVE menu_paths AS (
+    SELECT id AS ancestor_id, id AS descendant_id, 0 AS depth FROM menus
+    UNION ALL
+    SELECT p.ancestor_id, m.id, p.depth + 1
+    FROM menu_paths p JOIN menus m ON m.parent_id = p.descendant_id
+)
+SELECT ancestor_id, descendant_id, depth FROM menu_paths
+"""
+
+
+def _rng(seed: int, table: str) -> random.Random:
+    return random.Random(f"{seed}:{table}")
+
+
+async def _csv_chunks(rows, batch: int):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending == batch:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if pending:
+        yield buffer.getvalue().encode()
+
+
+async def _copy(conn: asyncpg.Connection, table: str, columns: list[str], rows, batch: int) -> None:
+    started = time.perf_counter()
+    # CSV text COPY lets the server parse every type (citext, enums, jsonb) itself.
+    status = await conn.copy_to_table(
+        table, source=_csv_chunks(rows, batch), columns=columns, format="csv"
+    )
+    print(f"  {table:<18} {status.split()[-1]:>10} rows  {time.perf_counter() - started:7.2f}s")
+
+
+def department_rows(count: int, depth: int, seed: int):
+    """Departments spread over ``depth`` levels, each parented to a random node one level up."""
+    rng = _rng(seed, "departments")
+    depth = max(1, min(depth, count))
+    per_level = [count // depth + (1 if level < count % depth else 0) for level in range(depth)]
+    previous: list[int] = []
+    next_id = 1
+    for level, size in enumerate(per_level):
+        current = list(range(next_id, next_id + size))
+        for dept_id in current:
+            parent = rng.choice(previous) if previous else None
+            yield (dept_id, parent, f"Dept {dept_id} L{level}", rng.random() > 0.05, dept_id)
+        previous, next_id = current, next_id + size
+
+
+def menu_rows(count: int, seed: int):
+    rng = _rng(seed, "menus")
+    directories = max(1, count // 10)
+    for menu_id in range(1, count + 1):
+        if menu_id <= directories:
+            yield (menu_id, None, f"Dir{menu_id}", f"Directory {menu_id}", f"/dir{menu_id}", "#", "directory", menu_id)
+        else:
+            parent = rng.randint(1, directories)
+            yield (
+                menu_id,
+                parent,
+                f"Page{menu_id}",
+                f"Page {menu_id}",
+                f"page{menu_id}",
+                f"views/Synthetic/Page{menu_id}",
+                "route",
+                menu_id,
+            )
+
+
+def permission_rows(menus: int, actions: int):
+    yield (1, "*", "*", "*", "All", None)
+    directories = max(1, menus // 10)
+    next_id = 2
+    for menu_id in range(directories + 1, menus + 1):
+        for action in ACTIONS[:actions]:
+            yield (next_id, "system", f"page{menu_id}", action, action, menu_id)
+            next_id += 1
+
+
+def role_rows(count: int):
+    yield (1, "bench_admin", "Bench administrator", "Synthetic superuser role")
+    for role_id in range(2, count + 2):
+        yield (role_id, f"role{role_id}", f"Role {role_id}", None)
+
+
+def role_menu_rows(roles: int, menus: int, seed: int):
+    rng = _rng(seed, "role_menus")
+    for menu_id in range(1, menus + 1):
+        yield (1, menu_id)
+    for role_id in range(2, roles + 2):
+        for menu_id in sorted(rng.sample(range(1, menus + 1), k=max(1, menus // 4))):
+            yield (role_id, menu_id)
+
+
+def role_permission_rows(roles: int, permissions: int, seed: int):
+    rng = _rng(seed, "role_permissions")
+    yield (1, 1)
+    if permissions <= 1:
+        return
+    for role_id in range(2, roles + 2):
+        for permission_id in sorted(rng.sample(range(2, permissions + 1), k=min(permissions - 1, 60))):
+            yield (role_id, permission_id)
+
+
+def user_rows(count: int, departments: int, password_hash: str, seed: int):
+    rng = _rng(seed, "users")
+    yield (1, ADMIN_USERNAME, "bench_admin@example.com", "Bench administrator", password_hash, True, True, None)
+    for user_id in range(2, count + 2):
+        department = rng.randint(1, departments) if departments else None
+        yield (
+            user_id,
+            f"user{user_id}",
+            f"user{user_id}@example.com",
+            f"User {user_id}",
+            password_hash,
+            rng.random() > 0.02,
+            False,
+            department,
+        )
+
+
+def user_role_rows(users: int, roles: int, per_user: int, seed: int):
+    rng = _rng(seed, "user_roles")
+    yield (1, 1)
+    role_ids = range(2, roles + 2)
+    per_user = min(per_user, roles)
+    for user_id in range(2, users + 2):
+        for role_id in rng.sample(role_ids, k=per_user):
+            yield (user_id, role_id)
+
+
+def audit_rows(count: int, users: int, days: int, seed: int):
+    rng = _rng(seed, "audit_log")
+    end = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    span = days * 24 * 3600
+    for audit_id in range(1, count + 1):
+        operator = rng.randint(1, users + 1)
+        created_at = end - timedelta(seconds=rng.randrange(span))
+        yield (
+            audit_id,
+            f"{audit_id:032x}",
+            operator,
+            f"user{operator}",
+            rng.choice(AUDIT_ACTIONS),
+            "USER",
+            str(rng.randint(1, users + 1)),
+            f"10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(256)}",
+            1 if rng.random() > 0.03 else 0,
+            created_at.isoformat(),
+        )
+
+
+async def seed(args: argparse.Namespace) -> None:
+    dsn = args.dsn or get_settings().database_url.replace("+asyncpg", "")
+    password_hash = hash_password(args.password)
+    permissions = 1 + (args.menus - max(1, args.menus // 10)) * args.actions_per_menu
+    conn = await asyncpg.connect(dsn)
+    started = time.perf_counter()
+    try:
+        if args.truncate:
+            await conn.execute(f"TRUNCATE TABLE {', '.join(TABLES)} RESTART IDENTITY CASCADE")
+        batch = args.batch
+        print(f"Seeding with seed={args.seed}")
+        async with conn.transaction():
+            await _copy(
+                conn,
+                "departments",
+                ["id", "parent_id", "name", "is_active", "order"],
+                department_rows(args.departments, args.depth, args.seed),
+                batch,
+            )
+            await _copy(conn, "roles", ["id", "code", "name", "description"], role_rows(args.roles), batch)
+            await _copy(
+                conn,
+                "menus",
+                ["id", "parent_id", "name", "title", "path", "component", "type", "order"],
+                menu_rows(args.menus, args.seed),
+                batch,
+            )
+            await conn.execute(MENU_CLOSURE_SQL)
+            await _copy(
+                conn,
+                "permissions",
+                ["id", "namespace", "resource", "action", "label", "menu_id"],
+                permission_rows(args.menus, args.actions_per_menu),
+                batch,
+            )
+            await _copy(
+                conn, "role_menus", ["role_id", "menu_id"], role_menu_rows(args.roles, args.menus, args.seed), batch
+            )
+            await _copy(
+                conn,
+                "role_permissions",
+                ["role_id", "permission_id"],
+                role_permission_rows(args.roles, permissions, args.seed),
+                batch,
+            )
+            await _copy(
+                conn,
+                "users",
+                ["id", "username", "email", "full_name", "password_hash", "is_active", "is_superuser", "department_id"],
+                user_rows(args.users, args.departments, password_hash, args.seed),
+                batch,
+            )
+            await _copy(
+                conn,
+                "user_roles",
+                ["user_id", "role_id"],
+                user_role_rows(args.users, args.roles, args.roles_per_user, args.seed),
+                batch,
+            )
+            await _copy(
+                conn,
+                "audit_log",
+                [
+                    "id",
+                    "trace_id",
+                    "operator_id",
+                    "operator_name",
+                    "action",
+                    "resource_type",
+                    "resource_id",
+                    "request_ip",
+                    "result_status",
+                    "created_at",
+                ],
+                audit_rows(args.audit_rows, args.users, args.audit_days, args.seed),
+                batch,
+            )
+            # Rows carry explicit ids; move every sequence past them for later inserts.
+            for table in TABLES:
+                if table == "menu_closure":
+                    continue
+                await conn.execute(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                    f"COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)"
+                )
+        await conn.execute("ANALYZE")
+    finally:
+        await conn.close()
+    print(f"Done in {time.perf_counter() - started:.1f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk-load a deterministic synthetic dataset with COPY")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--departments", type=int, default=2_000)
+    parser.add_argument("--depth", type=int, default=8, help="Levels in the department tree")
+    parser.add_argument("--roles", type=int, default=50)
+    parser.add_argument("--roles-per-user", type=int, default=2)
+    parser.add_argument("--menus", type=int, default=300)
+    parser.add_argument("--actions-per-menu", type=int, default=4, choices=range(1, len(ACTIONS) + 1))
+    parser.add_argument("--audit-rows", type=int, default=1_000_000)
+    parser.add_argument("--audit-days", type=int, default=365)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--password", default=DEFAULT_PASSWORD, help="Password shared by every user")
+    parser.add_argument("--batch", type=int, default=50_000, help="Rows per COPY data chunk")
+    parser.add_argument("--truncate", action="store_true", help="Empty the tables before loading")
+    parser.add_argument("--dsn", default=None, help="Defaults to the configured database_url")
+    args = parser.parse_args()
+    asyncio.run(seed(args))
+
+
+if __name__ == "__main__":
+    main()
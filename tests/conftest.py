@@ -1,5 +1,5 @@
 import asyncio
-from collections import defaultdict
+from contextlib import contextmanager
 from pathlib import Path
 import sys
 
@@ -13,7 +13,9 @@ if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
 from app.agents.audit import get_audit_agent  # noqa: E402
-from app.core.database import get_db  # noqa: E402
+from app.core.database import get_db, get_read_db  # noqa: E402
+from app.core.metrics import instrument_engine  # noqa: E402
+from app.core.querylog import count_queries  # noqa: E402
 from app.core.redis import get_redis  # noqa: E402
 from app.core.security import hash_password  # noqa: E402
 from app.main import create_app  # noqa: E402
@@ -21,29 +23,8 @@ from app.models.base import Base  # noqa: E402
 from app.models.menu import Menu, MenuType  # noqa: E402
 from app.models.role import Permission, Role, RoleMenu  # noqa: E402
 from app.models.user import User  # noqa: E402
-
-
-class FakeRedis:
-    def __init__(self) -> None:
-        self.counters = defaultdict(int)
-        self.hashes: dict[str, dict] = {}
-
-    async def incr(self, key: str) -> int:
-        self.counters[key] += 1
-        return self.counters[key]
-
-    async def expire(self, key: str, seconds: int) -> None:  # pragma: no cover - noop
-        _ = (key, seconds)
-
-    async def expireat(self, key: str, timestamp: int) -> None:  # pragma: no cover - noop
-        _ = (key, timestamp)
-
-    async def hset(self, key: str, mapping: dict) -> None:
-        self.hashes[key] = mapping
-
-    async def delete(self, key: str) -> None:
-        self.hashes.pop(key, None)
-        self.counters.pop(key, None)
+from app.repositories.menu_repository import MenuRepository  # noqa: E402
+from tests.support.fake_redis import FakeRedis  # noqa: E402
 
 
 @pytest.fixture(scope="session")
@@ -56,6 +37,7 @@ def event_loop():
 @pytest_asyncio.fixture(scope="session")
 async def async_engine():
     engine = create_async_engine("sqlite+aiosqlite:///:memory:", future=True)
+    instrument_engine(engine)
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     yield engine
@@ -133,15 +115,21 @@ async def session_factory(async_engine):
                 RoleMenu(id=2, role_id=1, menu_id=2),
             ]
         )
+        await session.flush()
+        await MenuRepository(session).rebuild_closure()
         await session.commit()
 
     return factory
 
 
+@pytest.fixture
+def fake_redis():
+    return FakeRedis()
+
+
 @pytest_asyncio.fixture
-async def test_app(session_factory):
+async def test_app(session_factory, fake_redis):
     app = create_app()
-    fake_redis = FakeRedis()
     get_audit_agent().configure_session_factory(session_factory)
 
     async def _override_get_db():
@@ -152,11 +140,34 @@ async def test_app(session_factory):
         yield fake_redis
 
     app.dependency_overrides[get_db] = _override_get_db
+    app.dependency_overrides[get_read_db] = _override_get_db
     app.dependency_overrides[get_redis] = _override_get_redis
     yield app
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def query_budget():
+    """Assert the statements executed inside a block stay within ``limit``.
+
+    Usage::
+
+        with query_budget(5):
+            await client.get("/menus/routes", headers=headers)
+    """
+
+    @contextmanager
+    def _budget(limit: int):
+        with count_queries() as counter:
+            yield counter
+        assert counter.count <= limit, (
+            f"expected at most {limit} statements, got {counter.count}:\n"
+            + "\n".join(counter.statements)
+        )
+
+    return _budget
+
+
 @pytest_asyncio.fixture
 async def client(test_app):
     transport = ASGITransport(app=test_app)
@@ -0,0 +1,143 @@
+"""In-memory Redis stand-in shared by the test suite and the in-process benchmarks."""
+
+from collections import defaultdict
+
+from redis.exceptions import NoScriptError
+
+from app.agents.session import (
+    CREATE_SESSION_SCRIPT,
+    LIST_SESSIONS_SCRIPT,
+    REVOKE_ALL_SESSIONS_SCRIPT,
+    REVOKE_SESSION_SCRIPT,
+)
+from app.core.revocation import REVOKE_TOKEN_SCRIPT
+
+
+class FakeRedis:
+    """In-memory stand-in for the Redis commands and server-side scripts the app uses."""
+
+    def __init__(self) -> None:
+        self.counters = defaultdict(int)
+        self.hashes: dict[str, dict] = {}
+        self.strings: dict[str, str] = {}
+        self.zsets: dict[str, dict[str, float]] = {}
+        self.scripts = {
+            CREATE_SESSION_SCRIPT.sha: self._create_session_script,
+            LIST_SESSIONS_SCRIPT.sha: self._list_sessions_script,
+            REVOKE_SESSION_SCRIPT.sha: self._revoke_session_script,
+            REVOKE_ALL_SESSIONS_SCRIPT.sha: self._revoke_all_sessions_script,
+            REVOKE_TOKEN_SCRIPT.sha: self._revoke_token_script,
+        }
+        self.published: list[tuple[str, str]] = []
+
+    async def ping(self) -> bool:
+        return True
+
+    async def incr(self, key: str) -> int:
+        self.counters[key] += 1
+        return self.counters[key]
+
+    async def expire(self, key: str, seconds: int) -> None:  # pragma: no cover - noop
+        _ = (key, seconds)
+
+    async def expireat(self, key: str, timestamp: int) -> None:  # pragma: no cover - noop
+        _ = (key, timestamp)
+
+    async def hset(self, key: str, mapping: dict) -> None:
+        self.hashes.setdefault(key, {}).update({k: str(v) for k, v in mapping.items()})
+
+    async def hget(self, key: str, field: str) -> str | None:
+        return self.hashes.get(key, {}).get(field)
+
+    async def hgetall(self, key: str) -> dict:
+        return dict(self.hashes.get(key, {}))
+
+    async def set(self, key: str, value: str, ex: int | None = None, exat: int | None = None) -> None:
+        _ = (ex, exat)
+        self.strings[key] = str(value)
+
+    async def get(self, key: str) -> str | None:
+        return self.strings.get(key)
+
+    async def exists(self, *keys: str) -> int:
+        return sum(
+            1 for key in keys if key in self.hashes or key in self.strings or key in self.zsets
+        )
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.hashes.pop(key, None)
+            self.counters.pop(key, None)
+            self.strings.pop(key, None)
+            self.zsets.pop(key, None)
+
+    async def zscore(self, key: str, member: str) -> float | None:
+        return self.zsets.get(key, {}).get(member)
+
+    async def zrangebyscore(self, key: str, min, max, withscores: bool = False) -> list:
+        low = float(min)
+        high = float("inf") if max == "+inf" else float(max)
+        members = self.zsets.get(key, {})
+        selected = [m for m in self._zrange(key) if low <= members[m] <= high]
+        if withscores:
+            return [(m, members[m]) for m in selected]
+        return selected
+
+    async def evalsha(self, sha: str, numkeys: int, *keys_and_args):
+        handler = self.scripts.get(sha)
+        if handler is None:
+            raise NoScriptError("No matching script")
+        return handler(list(keys_and_args[:numkeys]), [str(arg) for arg in keys_and_args[numkeys:]])
+
+    def _zrange(self, key: str) -> list[str]:
+        members = self.zsets.get(key, {})
+        return sorted(members, key=lambda member: (members[member], member))
+
+    def _prune(self, key: str, now: str) -> None:
+        members = self.zsets.get(key, {})
+        for member in [m for m, score in members.items() if score <= float(now)]:
+            members.pop(member)
+
+    def _create_session_script(self, keys: list[str], args: list[str]) -> list[str]:
+        session_key, user_key = keys
+        now, expires_at, limit, sid, *fields = args
+        self._prune(user_key, now)
+        self.hashes.setdefault(session_key, {}).update(dict(zip(fields[::2], fields[1::2])))
+        self.zsets.setdefault(user_key, {})[sid] = float(expires_at)
+        evicted: list[str] = []
+        excess = len(self.zsets[user_key]) - int(limit)
+        if int(limit) > 0 and excess > 0:
+            evicted = self._zrange(user_key)[:excess]
+            for member in evicted:
+                self.zsets[user_key].pop(member)
+        return evicted
+
+    def _list_sessions_script(self, keys: list[str], args: list[str]) -> list[str]:
+        (user_key,) = keys
+        (now,) = args
+        self._prune(user_key, now)
+        result: list[str] = []
+        for member in self._zrange(user_key):
+            result.extend((member, str(self.zsets[user_key][member])))
+        return result
+
+    def _revoke_session_script(self, keys: list[str], args: list[str]) -> int:
+        user_key, session_key = keys
+        if self.zsets.get(user_key, {}).pop(args[0], None) is None:
+            return 0
+        self.hashes.pop(session_key, None)
+        return 1
+
+    def _revoke_all_sessions_script(self, keys: list[str], args: list[str]) -> list[str]:
+        (user_key,) = keys
+        sids = self._zrange(user_key)
+        self.zsets.pop(user_key, None)
+        return sids
+
+    def _revoke_token_script(self, keys: list[str], args: list[str]) -> int:
+        (index_key,) = keys
+        jti, exp, now, channel = args
+        self.zsets.setdefault(index_key, {})[jti] = float(exp)
+        self._prune(index_key, now)
+        self.published.append((channel, f"{jti}|{exp}"))
+        return 1
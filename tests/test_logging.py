@@ -0,0 +1,79 @@
+import json
+import logging
+import queue
+
+from app.core.logging import BoundedQueueHandler, InfoSamplingFilter, JsonFormatter
+
+
+def _record(name: str = "app.test", level: int = logging.INFO, **extra) -> logging.LogRecord:
+    record = logging.LogRecord(name, level, __file__, 1, "hello %s", ("world",), None)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+def test_json_formatter_emits_context_as_fields():
+    record = _record(trace_id="abc", context={"user_id": 7, "level": "ignored"})
+    payload = json.loads(JsonFormatter().format(record))
+    assert payload["message"] == "hello world"
+    assert payload["trace_id"] == "abc"
+    assert payload["user_id"] == 7
+    assert payload["level"] == "INFO"
+
+
+def test_bounded_queue_handler_counts_drops():
+    handler = BoundedQueueHandler(queue.Queue(maxsize=1))
+    handler.handle(_record(trace_id="t1"))
+    handler.handle(_record(trace_id="t2"))
+    assert handler.enqueued == 1
+    assert handler.dropped == 1
+
+
+def test_info_sampling_only_applies_to_hot_loggers():
+    sampler = InfoSamplingFilter(0.0, ["app.core.auth"])
+    assert sampler.filter(_record("app.core.auth")) is False
+    assert sampler.filter(_record("app.core.auth", level=logging.WARNING)) is True
+    assert sampler.filter(_record("app.routers.menu")) is True
+    assert sampler.sampled_out == 1
+
+
+
+def test_listener_runs_only_between_start_and_shutdown(monkeypatch):
+    from app.core import logging as app_logging
+
+    root = logging.getLogger()
+    monkeypatch.setattr(root, "handlers", [])
+    monkeypatch.setattr(app_logging, "_stream_handler", None)
+    app_logging.configure_logging()
+    stream_handler = app_logging._stream_handler
+    assert root.handlers == [stream_handler]
+    assert app_logging._listener is None
+
+    app_logging.start_logging()
+    try:
+        assert app_logging._listener is not None
+        assert root.handlers == [app_logging._queue_handler]
+    finally:
+        app_logging.shutdown_logging()
+    assert app_logging._listener is None
+    assert root.handlers == [stream_handler]
+
+
+def test_importing_the_app_reads_no_settings_and_starts_no_threads():
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    probe = (
+        "import logging, threading, app.main\n"
+        "from app.core.settings import get_settings\n"
+        "print(get_settings.cache_info().currsize, len(logging.getLogger().handlers), threading.active_count())\n"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", probe],
+        cwd=Path(__file__).resolve().parents[1],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert completed.stdout.split() == ["0", "0", "1"]
@@ -0,0 +1,201 @@
+import pytest
+from sqlalchemy import select
+
+from app.models.menu import Menu, MenuClosure, MenuType
+from app.models.role import Permission
+from app.repositories.menu_repository import MenuRepository
+from app.schemas.menu import MenuCreate, MenuUpdate
+
+
+def _menu(menu_id: int, parent_id: int | None = None) -> Menu:
+    return Menu(
+        id=menu_id,
+        parent_id=parent_id,
+        name=f"Menu{menu_id}",
+        title=f"Menu {menu_id}",
+        path=f"menu{menu_id}",
+        component="#",
+        order=menu_id,
+        type=MenuType.DIRECTORY,
+    )
+
+
+async def _assert_closure_matches_rebuild(repo: MenuRepository) -> None:
+    query = select(MenuClosure.ancestor_id, MenuClosure.descendant_id, MenuClosure.depth)
+    incremental = sorted(tuple(row) for row in await repo.session.execute(query))
+    await repo.rebuild_closure()
+    assert incremental == sorted(tuple(row) for row in await repo.session.execute(query))
+
+
+@pytest.mark.asyncio
+async def test_delete_menus_checks_children_once_and_removes_subtrees(session_factory, query_budget):
+    async with session_factory() as session:
+        session.add_all([_menu(100), _menu(101, 100), _menu(102, 101), _menu(110)])
+        repo = MenuRepository(session)
+        await session.flush()
+        await repo.rebuild_closure()
+        await session.commit()
+
+        with pytest.raises(ValueError, match="MENU_HAS_CHILDREN"):
+            await repo.delete_menus([100, 110])
+        # A child listed together with its parent does not block the delete.
+        assert await repo.delete_menus([102, 110]) == [102, 110]
+
+        with query_budget(1):
+            deleted = await repo.delete_menus([101, 100], force=True)
+        assert deleted == [100, 101]
+        # SQLite test database has no foreign-key cascade, so drop the stale closure rows.
+        await repo.rebuild_closure()
+        assert await repo.delete_menus([100]) == []
+
+
+@pytest.mark.asyncio
+async def test_reorder_menus_moves_in_one_statement_and_rejects_cycles(session_factory, query_budget):
+    async with session_factory() as session:
+        session.add_all([_menu(200), _menu(201, 200), _menu(202, 201), _menu(210)])
+        repo = MenuRepository(session)
+        await session.flush()
+        await repo.rebuild_closure()
+        await session.commit()
+
+        with pytest.raises(ValueError, match="MENU_CYCLE"):
+            await repo.reorder_menus([(200, 202, 1)])
+        with pytest.raises(ValueError, match="MENU_PARENT_NOT_FOUND"):
+            await repo.reorder_menus([(200, 9999, 1)])
+
+        # 读取父级 + 一条批量 UPDATE + 每个改挂的子树一次断开，挂到非根父级的再一次连接
+        with query_budget(7):
+            updated = await repo.reorder_menus([(202, 210, 5), (201, None, 7), (200, 201, 9)])
+        assert updated == 3
+        rows = await session.execute(
+            select(Menu.id, Menu.parent_id, Menu.order).where(Menu.id.in_([200, 201, 202]))
+        )
+        assert sorted(tuple(row) for row in rows) == [(200, 201, 9), (201, None, 7), (202, 210, 5)]
+        assert [row["id"] for row in await repo.ancestors(200)] == [201]
+        assert await repo.descendants(201) == [200]
+        assert await repo.descendants(210) == [202]
+        await _assert_closure_matches_rebuild(repo)
+        await repo.delete_menus([201, 210], force=True)
+
+
+def _payload(name: str, parent_id: int | None = None, schema=MenuCreate):
+    return schema(name=name, path=name.lower(), component="#", parentId=parent_id, meta={"title": name})
+
+
+@pytest.mark.asyncio
+async def test_closure_tracks_creates_moves_and_rejects_cycles(session_factory, query_budget):
+    async with session_factory() as session:
+        repo = MenuRepository(session)
+        root = await repo.create_menu(_payload("ClosureRoot"))
+        child = await repo.create_menu(_payload("ClosureChild", root.id))
+        leaf = await repo.create_menu(_payload("ClosureLeaf", child.id))
+        root_id, child_id, leaf_id = root.id, child.id, leaf.id
+
+        with query_budget(1):
+            breadcrumb = await repo.ancestors(leaf_id)
+        assert [row["name"] for row in breadcrumb] == ["ClosureRoot", "ClosureChild"]
+        assert await repo.descendants(root_id) == [child_id, leaf_id]
+        assert await repo.descendants(root_id, max_depth=1) == [child_id]
+        subtree = await repo.fetch_subtree(root_id, max_depth=1)
+        assert subtree[0]["children"][0]["name"] == "ClosureChild"
+        assert subtree[0]["children"][0]["children"] == []
+
+        with pytest.raises(ValueError, match="MENU_CYCLE"):
+            await repo.update_menu(root, _payload("ClosureRoot", leaf_id, MenuUpdate))
+        await session.rollback()
+
+        await repo.update_menu(await repo.get_menu(child_id), _payload("ClosureChild", None, MenuUpdate))
+        assert await repo.descendants(root_id) == []
+        serialized = await repo.serialize_menu(await repo.get_menu(leaf_id))
+        assert serialized["parentName"] == "ClosureChild"
+        assert [row["id"] for row in serialized["breadcrumb"]] == [child_id]
+
+        await repo.rebuild_closure()
+        assert await repo.descendants(child_id) == [leaf_id]
+        depths = await session.execute(
+            select(MenuClosure.ancestor_id, MenuClosure.depth).where(MenuClosure.descendant_id == leaf_id)
+        )
+        assert sorted(tuple(row) for row in depths) == [(child_id, 1), (leaf_id, 0)]
+        await repo.delete_menus([root_id, child_id], force=True)
+        await repo.rebuild_closure()
+        await session.commit()
+
+
+def _node(name: str, *children: dict, actions: tuple[str, ...] = ()) -> dict:
+    return {
+        "name": name,
+        "path": name.lower(),
+        "component": "#",
+        "title": name,
+        "type": 0,
+        "status": 1,
+        "meta": {"title": name, "icon": "vi-icon"},
+        "permissionList": [{"label": action, "value": f"imp:{name.lower()}:{action}"} for action in actions],
+        "children": list(children),
+    }
+
+
+@pytest.mark.asyncio
+async def test_import_tree_upserts_by_name_parents_first(session_factory):
+    tree = [_node("ImpRoot", _node("ImpChild", _node("ImpLeaf", actions=("list", "create"))))]
+    async with session_factory() as session:
+        repo = MenuRepository(session)
+        assert await repo.import_tree(tree) == {"menus": 3, "actions": 2}
+
+        tree[0]["children"][0]["title"] = "Renamed"
+        tree[0]["children"][0]["children"][0]["permissionList"][0]["label"] = "Browse"
+        assert await repo.import_tree(tree) == {"menus": 3, "actions": 2}
+
+        rows = dict(
+            (row.name, row)
+            for row in await session.execute(
+                select(Menu.id, Menu.name, Menu.parent_id, Menu.title).where(Menu.name.like("Imp%"))
+            )
+        )
+        assert len(rows) == 3
+        assert rows["ImpChild"].title == "Renamed"
+        assert rows["ImpLeaf"].parent_id == rows["ImpChild"].id
+        assert rows["ImpChild"].parent_id == rows["ImpRoot"].id
+        labels = await session.execute(
+            select(Permission.code, Permission.label, Permission.menu_id).where(Permission.namespace == "imp")
+        )
+        assert sorted(tuple(row) for row in labels) == [
+            ("imp:impleaf:create", "create", rows["ImpLeaf"].id),
+            ("imp:impleaf:list", "Browse", rows["ImpLeaf"].id),
+        ]
+
+        tree[0]["order"] = 0
+        await repo.import_tree(tree)
+        assert await session.scalar(select(Menu.order).where(Menu.id == rows["ImpRoot"].id)) == 0
+        await _assert_closure_matches_rebuild(repo)
+
+        # ImpChild becomes a root and ImpLeaf moves up, taking a new child with it.
+        moved = [_node("ImpRoot", _node("ImpLeaf", _node("ImpNew"))), _node("ImpChild")]
+        assert await repo.import_tree(moved) == {"menus": 4, "actions": 0}
+        new_id = await session.scalar(select(Menu.id).where(Menu.name == "ImpNew"))
+        assert [row["name"] for row in await repo.ancestors(new_id)] == ["ImpRoot", "ImpLeaf"]
+        assert await repo.descendants(rows["ImpChild"].id) == []
+        await _assert_closure_matches_rebuild(repo)
+
+        with pytest.raises(ValueError, match="MENU_DUPLICATE_NAME"):
+            await repo.import_tree([_node("Dup"), _node("Dup")])
+        await session.rollback()
+        await repo.delete_menus([rows["ImpRoot"].id, rows["ImpChild"].id], force=True)
+
+
+@pytest.mark.asyncio
+async def test_export_streams_importable_tree(client):
+    login = await client.post("/auth/login", json={"username": "admin", "password": "admin"})
+    headers = {"Authorization": f"Bearer {login.json()['data']['tokens']['accessToken']}"}
+    response = await client.get("/menus/export", headers=headers)
+    assert response.status_code == 200
+    exported = response.json()
+    listed = (await client.get("/menus/list", headers=headers)).json()["data"]["list"]
+    assert exported == listed
+    assert exported[0]["name"] == "Dashboard"
+    assert exported[0]["children"][0]["name"] == "Analysis"
+
+    reimport = await client.post("/menus/import", json=exported, headers=headers)
+    assert reimport.status_code == 200
+    assert reimport.json()["data"]["menus"] >= 2
+
@@ -0,0 +1,41 @@
+import pytest
+
+from app.core.metrics import Histogram
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("demo_seconds", "Demo", ("op",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, "read")
+    histogram.observe(0.5, "read")
+    histogram.observe(5.0, "read")
+    lines = histogram.render()
+    assert 'demo_seconds_bucket{op="read",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{op="read",le="1.0"} 2' in lines
+    assert 'demo_seconds_bucket{op="read",le="+Inf"} 3' in lines
+    assert 'demo_seconds_count{op="read"} 3' in lines
+
+
+@pytest.mark.asyncio
+async def test_login_emits_server_timing_and_metrics(client):
+    response = await client.post("/auth/login", json={"username": "admin", "password": "admin"})
+    server_timing = response.headers["Server-Timing"]
+    assert "bcrypt;dur=" in server_timing
+    assert "jwt;dur=" in server_timing
+    assert "total;dur=" in server_timing
+
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    body = response.text
+    assert 'http_request_duration_seconds_count{method="POST",route="/auth/login"' in body
+    assert 'bcrypt_duration_seconds_count{operation="verify"}' in body
+
+
+@pytest.mark.asyncio
+async def test_prefixed_route_with_path_param_is_labelled_by_template(client):
+    login = await client.post("/auth/login", json={"username": "admin", "password": "admin"})
+    headers = {"Authorization": f"Bearer {login.json()['data']['tokens']['accessToken']}"}
+    await client.get("/menus/1", headers=headers)
+
+    body = (await client.get("/metrics")).text
+    assert 'http_request_duration_seconds_count{method="GET",route="/menus/{menu_id}"' in body
+    assert 'route="/menus/1"' not in body
@@ -0,0 +1,58 @@
+import gzip
+import json
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.core.openapi import export_openapi
+from app.core.settings import get_settings
+from app.main import create_app
+
+
+@pytest.fixture
+def static_openapi_settings(tmp_path, monkeypatch):
+    schema_path = tmp_path / "openapi.json"
+    monkeypatch.setenv("OPENAPI_MODE", "static")
+    monkeypatch.setenv("OPENAPI_STATIC_PATH", str(schema_path))
+    get_settings.cache_clear()
+    yield schema_path
+    get_settings.cache_clear()
+
+
+@pytest.mark.asyncio
+async def test_static_openapi_is_served_precompressed(static_openapi_settings):
+    app = create_app()
+    schema_path, compressed_path = export_openapi(app, static_openapi_settings)
+    assert gzip.decompress(compressed_path.read_bytes()) == schema_path.read_bytes()
+
+    # Runtime generation is replaced by the file contents.
+    assert app.openapi() == json.loads(schema_path.read_bytes())
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        response = await client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "/auth/login" in response.json()["paths"]
+
+        etag = response.headers["ETag"]
+        response = await client.get("/openapi.json", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+        response = await client.get("/docs")
+        assert response.status_code == 200
+        assert "/openapi.json" in response.text
+
+
+@pytest.mark.asyncio
+async def test_disabled_openapi_exposes_no_docs(monkeypatch):
+    monkeypatch.setenv("OPENAPI_MODE", "disabled")
+    get_settings.cache_clear()
+    try:
+        app = create_app()
+    finally:
+        get_settings.cache_clear()
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        assert (await client.get("/openapi.json")).status_code == 404
+        assert (await client.get("/docs")).status_code == 404
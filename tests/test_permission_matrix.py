@@ -0,0 +1,36 @@
+import base64
+
+import pytest
+
+from app.core.permission_matrix import PermissionEntry, PermissionMatrix
+
+
+def _decode(value: str) -> int:
+    return int.from_bytes(base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)), "little")
+
+
+def test_role_masks_follow_permission_id_order():
+    entries = [
+        PermissionEntry(id=pid, code=f"system:page:{action}", label=None, menu_id=1)
+        for pid, action in [(30, "delete"), (10, "list"), (20, "create"), (200, "export")]
+    ]
+    matrix = PermissionMatrix(entries, [(1, 10), (1, 20), (2, 20), (2, 200), (3, 999)])
+    assert [entry.id for entry in matrix.entries] == [10, 20, 30, 200]
+    assert matrix.role_mask(1) == 0b0011
+    assert matrix.role_mask(2) == 0b1010
+    assert matrix.role_mask(3) == 0
+    assert _decode(matrix.encode(matrix.role_mask(2))) == 0b1010
+    assert matrix.encode(0) == ""
+
+
+@pytest.mark.asyncio
+async def test_role_matrix_endpoint(client):
+    login = await client.post("/auth/login", json={"username": "admin", "password": "admin"})
+    headers = {"Authorization": f"Bearer {login.json()['data']['tokens']['accessToken']}"}
+    response = await client.get("/roles/matrix", headers=headers)
+    assert response.status_code == 200
+    data = response.json()["data"]
+    bits = {entry["id"]: index for index, entry in enumerate(data["permissions"])}
+    tester = next(role for role in data["roles"] if role["role"] == "test")
+    mask = _decode(tester["grants"])
+    assert mask == (1 << bits[2]) | (1 << bits[3])
@@ -0,0 +1,87 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import InvalidRequestError
+
+from app.agents.identity import IdentityAgent
+from app.core.querylog import normalize_statement
+from app.models.role import Permission, format_permission_code
+from app.models.user import User
+
+
+def test_normalize_statement_folds_in_lists():
+    first = normalize_statement("SELECT * FROM menus WHERE id IN (?, ?, ?)")
+    second = normalize_statement("SELECT *\n  FROM menus WHERE id IN (?, ?)")
+    assert first == second
+
+
+async def _admin_headers(client) -> dict:
+    response = await client.post("/auth/login", json={"username": "admin", "password": "admin"})
+    token = response.json()["data"]["tokens"]["accessToken"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("path", "budget"),
+    [
+        ("/menus/routes", 3),
+        ("/menus/list", 3),
+        ("/menus/1", 3),
+        ("/menus/1/subtree?depth=1", 3),
+        ("/users/list", 2),
+        ("/roles/list", 5),
+        ("/roles/list?layout=skeleton", 5),
+        ("/departments/users", 3),
+    ],
+)
+async def test_endpoint_query_budget(client, query_budget, path, budget):
+    headers = await _admin_headers(client)
+    with query_budget(budget) as counter:
+        response = await client.get(path, headers=headers)
+    assert response.status_code == 200
+    assert counter.count > 0
+
+
+@pytest.mark.asyncio
+async def test_login_query_budget(client, query_budget):
+    # 一次联表读取用户主体 + 一条审计写入
+    with query_budget(2):
+        response = await client.post("/auth/login", json={"username": "admin", "password": "admin"})
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_unloaded_relationship_raises(session_factory):
+    async with session_factory() as session:
+        user = (await session.execute(select(User).where(User.username == "admin"))).scalar_one()
+        with pytest.raises(InvalidRequestError):
+            _ = user.roles
+
+
+@pytest.mark.asyncio
+async def test_principal_loads_in_one_statement(session_factory, query_budget):
+    agent = IdentityAgent()
+    async with session_factory() as session:
+        with query_budget(1):
+            tester = await agent.load_user(session, 2)
+    assert [role.code for role in tester.roles] == ["test"]
+    assert tester.permissions == ["example:dialog:create", "example:dialog:delete"]
+    assert tester.attributes == {}
+
+
+@pytest.mark.asyncio
+async def test_permission_code_is_generated_and_returned(session_factory):
+    async with session_factory() as session:
+        permission = Permission(namespace=" system", resource="report", action="export")
+        session.add(permission)
+        await session.flush()
+        assert permission.code == "system:report:export"
+
+        permission.action = "print"
+        await session.flush()
+        assert permission.code == "system:report:print"
+        assert permission.code == format_permission_code(" system", "report", "print")
+
+        found = await session.scalar(select(Permission.id).where(Permission.code == "*.*.*"))
+        assert found == 1
+        await session.rollback()
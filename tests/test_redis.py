@@ -0,0 +1,57 @@
+import pytest
+from redis.asyncio import BlockingConnectionPool
+
+from app.core.redis import InstrumentedRedis, RedisManager
+from app.core.settings import Settings
+
+
+def test_manager_builds_bounded_blocking_pool():
+    settings = Settings(
+        redis_url="redis://localhost:6379/2",
+        redis_max_connections=7,
+        redis_pool_timeout_seconds=0.25,
+        redis_socket_timeout_seconds=0.3,
+    )
+    manager = RedisManager(settings)
+    client = manager.client
+
+    assert isinstance(client, InstrumentedRedis)
+    pool = client.connection_pool
+    assert isinstance(pool, BlockingConnectionPool)
+    assert pool.max_connections == 7
+    assert pool.timeout == 0.25
+    assert pool.connection_kwargs["socket_timeout"] == 0.3
+    assert pool.connection_kwargs["retry"] is not None
+    assert manager.pool_stats() == {"max": 7, "in_use": 0, "idle": 0}
+
+
+def test_manager_parses_sentinel_url():
+    settings = Settings(redis_url="redis+sentinel://:secret@s1:26379,s2/mymaster/3")
+    manager = RedisManager(settings)
+    client = manager.client
+
+    assert isinstance(client, InstrumentedRedis)
+    pool = client.connection_pool
+    assert pool.service_name == "mymaster"
+    assert pool.connection_kwargs["db"] == 3
+    assert pool.connection_kwargs["password"] == "secret"
+    sentinel_hosts = [
+        (sentinel.connection_pool.connection_kwargs["host"], sentinel.connection_pool.connection_kwargs["port"])
+        for sentinel in pool.sentinel_manager.sentinels
+    ]
+    assert sentinel_hosts == [("s1", 26379), ("s2", 26379)]
+
+
+@pytest.mark.asyncio
+async def test_health_fails_fast_when_unreachable():
+    settings = Settings(
+        redis_url="redis://127.0.0.1:1/0",
+        redis_socket_timeout_seconds=0.2,
+        redis_socket_connect_timeout_seconds=0.1,
+        redis_retry_attempts=0,
+    )
+    manager = RedisManager(settings)
+    try:
+        assert await manager.health() is False
+    finally:
+        await manager.shutdown()
@@ -0,0 +1,71 @@
+"""Run the real Lua scripts against fakeredis' embedded interpreter.
+
+tests/support/fake_redis.py re-implements each script in Python; these tests
+execute the script sources themselves so the two cannot drift apart silently.
+"""
+
+import time
+
+import pytest
+from redis.crc import key_slot
+
+from app.agents.session import SessionAgent
+from app.core.revocation import BLACKLIST_INDEX_KEY, RevocationChecker
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")
+
+
+@pytest.fixture
+def lua_redis():
+    return fakeredis.FakeAsyncRedis(decode_responses=True)
+
+
+def _slot(key: str) -> int:
+    return key_slot(key.encode())
+
+
+@pytest.mark.asyncio
+async def test_session_scripts_run_on_a_real_lua_interpreter(lua_redis):
+    agent = SessionAgent()
+    agent.settings = agent.settings.model_copy(update={"session_max_per_user": 2})
+
+    created = [
+        await agent.create_session(lua_redis, user_id=7, refresh_jti=f"jti-{i}", device_id=f"dev-{i}")
+        for i in range(3)
+    ]
+    assert created[2]["evicted"] == [created[0]["sid"]]
+    assert not await lua_redis.exists(agent._session_key(7, created[0]["sid"]))
+    assert not await agent.is_session_active(lua_redis, 7, created[0]["sid"])
+    assert await agent.is_session_active(lua_redis, 7, created[1]["sid"])
+
+    listed = await agent.list_sessions(lua_redis, 7)
+    assert [(item["sid"], item["device_id"]) for item in listed] == [
+        (created[1]["sid"], "dev-1"),
+        (created[2]["sid"], "dev-2"),
+    ]
+
+    assert await agent.invalidate_session(lua_redis, created[1]["sid"], user_id=8) is False
+    assert await agent.invalidate_session(lua_redis, created[1]["sid"], user_id=7) is True
+    assert not await lua_redis.exists(agent._session_key(7, created[1]["sid"]))
+
+    assert await agent.invalidate_all_sessions(lua_redis, 7) == [created[2]["sid"]]
+    assert await lua_redis.keys("sess:*") == []
+
+
+def test_session_keys_of_one_user_share_a_cluster_slot():
+    sid = SessionAgent.new_sid()
+    assert _slot(SessionAgent._session_key(7, sid)) == _slot(SessionAgent._user_key(7))
+
+
+@pytest.mark.asyncio
+async def test_revoke_token_script_runs_on_a_real_lua_interpreter(lua_redis):
+    checker = RevocationChecker()
+    exp = int(time.time()) + 600
+    await lua_redis.zadd(BLACKLIST_INDEX_KEY, {"expired-jti": 1})
+
+    await checker.revoke(lua_redis, "revoked-jti", exp)
+
+    assert await checker.is_revoked(lua_redis, "revoked-jti", exp) is True
+    assert await lua_redis.zrange(BLACKLIST_INDEX_KEY, 0, -1, withscores=True) == [("revoked-jti", exp)]
+    assert await RevocationChecker().load_snapshot(lua_redis) == 1
@@ -0,0 +1,88 @@
+from time import time
+
+import pytest
+
+from app.core.revocation import BloomFilter, RevocationChecker, TimeBucketedBloom
+
+
+class CountingRedis:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def exists(self, *keys: str) -> int:
+        self.calls += 1
+        return 0
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [f"jti-{index}" for index in range(1000)]
+    for item in items:
+        bloom.add(item)
+    assert all(item in bloom for item in items)
+    false_positives = sum(f"other-{index}" in bloom for index in range(10000))
+    assert false_positives < 300
+
+
+def test_rotation_drops_expired_buckets():
+    bloom = TimeBucketedBloom(bucket_seconds=60, capacity=100, error_rate=0.01)
+    bloom.add("old", 30)
+    bloom.add("new", 150)
+    bloom.rotate(now=125)
+    assert not bloom.might_contain("old")
+    assert bloom.might_contain("new", 150)
+
+
+@pytest.mark.asyncio
+async def test_synced_checker_answers_negatives_locally(fake_redis):
+    checker = RevocationChecker()
+    exp = int(time()) + 600
+    await checker.revoke(fake_redis, "revoked-jti", exp)
+    assert fake_redis.published[-1][1] == f"revoked-jti|{exp}"
+
+    fresh = RevocationChecker()
+    assert await fresh.load_snapshot(fake_redis) == 1
+    fresh.synced = True
+    counting = CountingRedis()
+    assert await fresh.is_revoked(counting, "unknown-jti", exp) is False
+    assert counting.calls == 0
+    assert await fresh.is_revoked(fake_redis, "revoked-jti", exp) is True
+
+
+@pytest.mark.asyncio
+async def test_revocation_is_filed_under_the_tokens_own_exp(fake_redis):
+    checker = RevocationChecker()
+    checker.synced = True
+    # Short-lived access token: its bucket is nowhere near now + refresh TTL.
+    exp = int(time()) + 30
+    await checker.revoke(fake_redis, "access-jti", exp)
+
+    fresh = RevocationChecker()
+    await fresh.load_snapshot(fake_redis)
+    fresh.synced = True
+    assert await checker.is_revoked(fake_redis, "access-jti", exp) is True
+    assert await fresh.is_revoked(fake_redis, "access-jti", exp) is True
+
+
+@pytest.mark.asyncio
+async def test_token_without_exp_is_checked_in_redis(fake_redis):
+    checker = RevocationChecker()
+    checker.synced = True
+    await checker.revoke(fake_redis, "no-exp-jti", None)
+    assert fake_redis.published == []
+    assert await checker.is_revoked(fake_redis, "no-exp-jti", None) is True
+
+    counting = CountingRedis()
+    assert await checker.is_revoked(counting, "other-jti", None) is False
+    assert counting.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_logged_out_access_token_is_rejected(client):
+    response = await client.post("/auth/login", json={"username": "admin", "password": "admin"})
+    headers = {"Authorization": f"Bearer {response.json()['data']['tokens']['accessToken']}"}
+    assert (await client.get("/auth/sessions", headers=headers)).status_code == 200
+
+    response = await client.post("/auth/logout", json={}, headers=headers)
+    assert response.status_code == 200
+    assert (await client.get("/auth/sessions", headers=headers)).status_code == 401
@@ -0,0 +1,53 @@
+import pytest
+
+from app.repositories.role_repository import RoleRepository
+from app.schemas.role import RoleCreate, RoleUpdate
+
+
+async def _admin_headers(client) -> dict:
+    response = await client.post("/auth/login", json={"username": "admin", "password": "admin"})
+    return {"Authorization": f"Bearer {response.json()['data']['tokens']['accessToken']}"}
+
+
+@pytest.mark.asyncio
+async def test_role_list_shares_one_menu_tree(client):
+    headers = await _admin_headers(client)
+    data = (await client.get("/roles/list?layout=skeleton", headers=headers)).json()["data"]
+    assert data["layout"] == "skeleton"
+    assert [menu["id"] for menu in data["menus"]] == [1]
+    assert [child["id"] for child in data["menus"][0]["children"]] == [2]
+    tester = next(role for role in data["list"] if role["role"] == "test")
+    assert tester["menuIds"] == []
+    assert tester["permissionIds"] == [2, 3]
+    assert "menu" not in tester
+
+
+@pytest.mark.asyncio
+async def test_role_list_keeps_the_nested_layout_by_default(client):
+    headers = await _admin_headers(client)
+    data = (await client.get("/roles/list", headers=headers)).json()["data"]
+    assert "menus" not in data
+    tester = next(role for role in data["list"] if role["role"] == "test")
+    assert tester["menu"] == []
+    assert tester["permissionIds"] == [2, 3]
+
+
+@pytest.mark.asyncio
+async def test_role_save_touches_only_changed_links(session_factory, query_budget):
+    async with session_factory() as session:
+        repo = RoleRepository(session)
+        role = await repo.create_role(
+            RoleCreate(role="auditor", roleName="Auditor", menuIds=[1, 999], permissionIds=[2])
+        )
+        assert [menu.id for menu in role.menus] == [1]
+
+        with query_budget(20) as counter:
+            role = await repo.update_role(
+                role, RoleUpdate(role="auditor", roleName="Auditor", menuIds=[1, 2], permissionIds=[3])
+            )
+        writes = [sql for sql in counter.statements if not sql.lstrip().upper().startswith("SELECT")]
+        assert not any("role_menus" in sql and sql.lstrip().upper().startswith("DELETE") for sql in writes)
+        assert sorted(menu.id for menu in role.menus) == [1, 2]
+        assert [perm.id for perm in role.permissions] == [3]
+
+        await repo.delete_role(role)
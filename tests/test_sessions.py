@@ -0,0 +1,71 @@
+import pytest
+
+from app.agents.session import SessionAgent
+
+
+async def _login(client) -> dict:
+    response = await client.post("/auth/login", json={"username": "admin", "password": "admin"})
+    assert response.status_code == 200
+    return response.json()["data"]
+
+
+def _auth(data: dict) -> dict:
+    return {"Authorization": f"Bearer {data['tokens']['accessToken']}"}
+
+
+@pytest.mark.asyncio
+async def test_sessions_are_listed_and_logout_revokes_current(client):
+    first = await _login(client)
+    second = await _login(client)
+
+    response = await client.get("/auth/sessions", headers=_auth(second))
+    sessions = {item["sid"]: item for item in response.json()["data"]}
+    assert set(sessions) == {first["session"]["sid"], second["session"]["sid"]}
+    assert sessions[second["session"]["sid"]]["current"] is True
+
+    response = await client.post("/auth/logout", json={}, headers=_auth(first))
+    assert response.status_code == 200
+
+    response = await client.post(
+        "/auth/refresh", json={"refreshToken": first["tokens"]["refreshToken"]}
+    )
+    assert response.status_code == 401
+
+    response = await client.get("/auth/sessions", headers=_auth(second))
+    assert [item["sid"] for item in response.json()["data"]] == [second["session"]["sid"]]
+
+
+@pytest.mark.asyncio
+async def test_refresh_keeps_sid_and_revoke_all_clears_index(client):
+    data = await _login(client)
+    response = await client.post(
+        "/auth/refresh", json={"refreshToken": data["tokens"]["refreshToken"]}
+    )
+    assert response.status_code == 200
+    refreshed = response.json()["data"]
+    assert refreshed["session"]["sid"] == data["session"]["sid"]
+
+    response = await client.post("/auth/sessions/revoke", json={}, headers=_auth(refreshed))
+    assert response.json()["data"]["revoked"] == [data["session"]["sid"]]
+
+    response = await client.post(
+        "/auth/refresh", json={"refreshToken": refreshed["tokens"]["refreshToken"]}
+    )
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_session_cap_evicts_oldest(fake_redis):
+    agent = SessionAgent()
+    agent.settings = agent.settings.model_copy(update={"session_max_per_user": 2})
+
+    created = [
+        await agent.create_session(fake_redis, user_id=7, refresh_jti=f"jti-{i}", device_id=None)
+        for i in range(3)
+    ]
+
+    assert created[2]["evicted"] == [created[0]["sid"]]
+    assert not await agent.is_session_active(fake_redis, 7, created[0]["sid"])
+    assert f"sess:{{7}}:{created[0]['sid']}" not in fake_redis.hashes
+    listed = [item["sid"] for item in await agent.list_sessions(fake_redis, 7)]
+    assert sorted(listed) == sorted([created[1]["sid"], created[2]["sid"]])
@@ -0,0 +1,87 @@
+import pytest
+
+from app.agents.identity import AuthenticatedUser, RoleInfo
+from app.agents.token import TokenAgent
+from app.core.auth import resolve_token_permissions
+from app.core.security import create_jwt_token
+from app.core.permsets import (
+    PermissionSetCache,
+    get_permission_set_cache,
+    permission_set_id,
+    permission_set_key,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_permission_set_cache():
+    get_permission_set_cache.cache_clear()
+    yield
+    get_permission_set_cache.cache_clear()
+
+
+def _user(user_id: int) -> AuthenticatedUser:
+    return AuthenticatedUser(
+        id=user_id,
+        username=f"user{user_id}",
+        email=None,
+        full_name=None,
+        roles=[RoleInfo(id=1, code="ops", name="Ops")],
+        permissions=["system:user:list", "system:user:update"],
+        attributes={},
+        is_superuser=False,
+    )
+
+
+def _agent(mode: str) -> TokenAgent:
+    agent = TokenAgent()
+    agent.settings = agent.settings.model_copy(update={"access_token_permissions": mode})
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_tokens_share_one_permission_set_and_keep_only_refresh_record(fake_redis):
+    agent = _agent("reference")
+    first = await agent.issue_pair(fake_redis, _user(1))
+    await agent.issue_pair(fake_redis, _user(2))
+
+    set_id = permission_set_id(["system:user:update", "system:user:list"])
+    assert fake_redis.strings[permission_set_key(set_id)] == "system:user:list,system:user:update"
+    assert first.access_payload["pset"] == set_id
+    assert not any(key.startswith("token:access:") for key in [*fake_redis.strings, *fake_redis.hashes])
+    assert await agent.verify_refresh_token(fake_redis, first.refresh_token)
+
+
+@pytest.mark.asyncio
+async def test_reference_tokens_resolve_permission_set(fake_redis):
+    user = _user(1)
+    user.permissions = [f"system:resource{index}:list" for index in range(200)]
+    full = await TokenAgent().issue_pair(fake_redis, user)
+    referenced = await _agent("reference").issue_pair(fake_redis, user)
+
+    assert "permissions" not in referenced.access_payload
+    assert len(referenced.access_token) * 10 < len(full.access_token)
+
+    cache = PermissionSetCache(max_entries=4)
+    claims = referenced.access_payload
+    assert await cache.resolve(fake_redis, claims["pset"], claims["psv"]) == sorted(user.permissions)
+    assert cache.get(claims["pset"]) is not None
+    assert await cache.resolve(fake_redis, claims["pset"], claims["psv"] + 1) is None
+    assert await resolve_token_permissions(fake_redis, full.access_payload) == user.permissions
+
+
+@pytest.mark.asyncio
+async def test_permission_set_is_written_once_per_token_lifetime(fake_redis):
+    agent = _agent("reference")
+    await agent.issue_pair(fake_redis, _user(1))
+    fake_redis.strings.clear()
+
+    await agent.issue_pair(fake_redis, _user(2))
+    assert not fake_redis.strings
+
+
+@pytest.mark.asyncio
+async def test_requests_are_authorized_from_the_database_not_the_token(client):
+    # user 2 only holds example:dialog:* in the database
+    token = create_jwt_token(sub="2", expires_minutes=5, token_type="access", permissions=["*.*.*"])
+    response = await client.get("/roles/matrix", headers={"Authorization": f"Bearer {token['token']}"})
+    assert response.status_code == 403
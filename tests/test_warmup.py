@@ -0,0 +1,59 @@
+import pytest
+
+from app.core.warmup import get_warmup_state, warm_up
+
+
+class PingRedis:
+    async def ping(self):
+        return True
+
+
+@pytest.mark.asyncio
+async def test_readiness_reports_green_only_after_warmup(client, async_engine, session_factory):
+    state = get_warmup_state()
+    state.reset()
+
+    response = await client.get("/health/ready")
+    assert response.status_code == 503
+
+    await warm_up(async_engine, session_factory, PingRedis())
+    assert state.errors == {}
+    assert set(state.steps) == {"jwt_keys", "mappers", "db_pool", "statements", "redis_pool"}
+
+    response = await client.get("/health/ready")
+    assert response.status_code == 200
+    assert response.json()["data"]["ready"] is True
+
+
+@pytest.mark.asyncio
+async def test_failed_warmup_step_keeps_service_unready(async_engine, session_factory):
+    class BrokenRedis:
+        async def ping(self):
+            raise ConnectionError("redis down")
+
+    state = await warm_up(async_engine, session_factory, BrokenRedis())
+    assert state.finished is True
+    assert state.ready is False
+    assert "redis_pool" in state.errors
+
+
+@pytest.mark.asyncio
+async def test_failed_steps_are_retried_until_ready(async_engine, session_factory, monkeypatch):
+    from app.core.settings import get_settings
+    from app.core.warmup import warm_up_until_ready
+
+    monkeypatch.setattr(get_settings(), "warmup_retry_initial_seconds", 0.001)
+
+    class FlakyRedis:
+        calls = 0
+
+        async def ping(self):
+            FlakyRedis.calls += 1
+            if FlakyRedis.calls <= 5:
+                raise ConnectionError("redis starting")
+            return True
+
+    state = await warm_up_until_ready(async_engine, session_factory, FlakyRedis())
+    assert state.ready is True
+    assert state.errors == {}
+    assert state.attempts == 2
@@ -27,6 +27,10 @@ export const getMenuDetailApi = (id: number) => {
   return request.get({ url: `/menus/${id}` })
 }
 
+export const getMenuSubtreeApi = (id: number, depth?: number) => {
+  return request.get({ url: `/menus/${id}/subtree`, params: { depth } })
+}
+
 export const createMenuPermissionApi = (menuId: number, data: { label: string; value: string }) => {
   return request.post({ url: `/menus/${menuId}/actions`, data })
 }
@@ -42,3 +46,15 @@ export const updateMenuPermissionApi = (
 export const deleteMenuPermissionApi = (menuId: number, actionId: number) => {
   return request.delete({ url: `/menus/${menuId}/actions/${actionId}` })
 }
+
+export const reorderMenusApi = (items: { id: number; parentId: number | null; order: number }[]) => {
+  return request.post({ url: '/menus/reorder', data: { items } })
+}
+
+export const exportMenusApi = () => {
+  return request.get({ url: '/menus/export' })
+}
+
+export const importMenusApi = (nodes: any[]) => {
+  return request.post({ url: '/menus/import', data: nodes })
+}
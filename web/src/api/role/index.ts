@@ -1,7 +1,7 @@
 import request from '@/axios'
 
-export const getRoleListApi = () => {
-  return request.get({ url: '/roles/list' })
+export const getRoleListApi = (params?: { layout?: 'nested' | 'skeleton' }) => {
+  return request.get({ url: '/roles/list', params })
 }
 
 export const createRoleApi = (data: any) => {
@@ -15,3 +15,7 @@ export const updateRoleApi = (id: number, data: any) => {
 export const deleteRoleApi = (id: number) => {
   return request.post({ url: '/roles/del', data: { ids: [id] } })
 }
+
+export const getRoleMatrixApi = () => {
+  return request.get({ url: '/roles/matrix' })
+}